@@ -2,21 +2,113 @@
 CA Manager - Core functionality for creating and managing CA certificates
 """
 
+import datetime
+import functools
 import os
-import subprocess
-import tempfile
+import shutil
+import sys
+import warnings
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509.oid import NameOID
+
+from .cert_cache import get_cert_info
+from .key_pool import KEY_ALGORITHMS, KeyPool, generate_private_key, signature_hash
+from .pem_io import write_pem
+
+# AES-NI capability bit in the first word of OPENSSL_ia32cap
+_IA32CAP_AESNI = 1 << 57
+
+
+def _aesni_masked(ia32cap: Optional[str]) -> bool:
+    """Check whether an OPENSSL_ia32cap value switches off AES-NI"""
+    if not ia32cap:
+        return False
+    word = ia32cap.split(":", 1)[0].strip()
+    invert = word.startswith("~")
+    try:
+        value = int(word.lstrip("~"), 0)
+    except ValueError:
+        return False
+    if invert:
+        return bool(value & _IA32CAP_AESNI)
+    return not value & _IA32CAP_AESNI
+
+
+@functools.lru_cache(maxsize=None)
+def _linked_openssl_build() -> str:
+    """Version and compiler flags of the OpenSSL library linked into cryptography"""
+    try:
+        from cryptography.hazmat.backends.openssl import backend
+        from cryptography.hazmat.bindings.openssl.binding import Binding
+
+        info = backend.openssl_version_text()
+        lib, ffi = Binding.lib, Binding.ffi
+        if hasattr(lib, "OPENSSL_CFLAGS"):
+            info += "\n" + ffi.string(lib.OpenSSL_version(lib.OPENSSL_CFLAGS)).decode()
+        return info
+    except Exception:
+        # Internal cryptography API; not worth failing over
+        return ""
 
 
 class CAManager:
     """Manages CA certificate creation and operations"""
 
-    def __init__(self, base_dir: str = "output"):
+    # Extensions shared by every root CA; these objects are immutable
+    _BASIC_CONSTRAINTS = x509.BasicConstraints(ca=True, path_length=None)
+    _KEY_USAGE = x509.KeyUsage(
+        digital_signature=False,
+        content_commitment=False,
+        key_encipherment=False,
+        data_encipherment=False,
+        key_agreement=False,
+        key_cert_sign=True,
+        crl_sign=True,
+        encipher_only=False,
+        decipher_only=False,
+    )
+
+    # Whether the linked OpenSSL has been checked in this process
+    _openssl_checked = False
+
+    def __init__(self, base_dir: str = "output", key_pool: Optional[KeyPool] = None):
         self.base_dir = Path(base_dir).resolve()
+        self.key_pool = key_pool
         self.ca_dir = self.base_dir / "ca"
         self.certs_dir = self.base_dir / "certs"
+        # (ca_dir mtime_ns, cas) from the last list_cas() walk
+        self._ca_list_cache: Optional[Tuple[int, List[Dict[str, str]]]] = None
+        # ca_name -> (certs/{ca_name} mtime_ns, certs) from the last get_certs_by_ca() walk
+        self._certs_by_ca_cache: Dict[str, Tuple[int, List[Dict[str, str]]]] = {}
         self._ensure_dirs()
+        self._check_openssl_caps()
+
+    @classmethod
+    def _check_openssl_caps(cls):
+        """Warn once if the OpenSSL used for keys and signing has its assembly code disabled"""
+        if cls._openssl_checked:
+            return
+        cls._openssl_checked = True
+
+        build = _linked_openssl_build()
+        if "no-asm" in build or "OPENSSL_NO_ASM" in build:
+            warnings.warn(
+                "The OpenSSL library used by cryptography was built without assembly "
+                "(no-asm); RSA key generation and signing will be several times slower",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+        elif _aesni_masked(os.environ.get("OPENSSL_ia32cap")):
+            warnings.warn(
+                "OPENSSL_ia32cap disables AES-NI for the OpenSSL library used by "
+                "cryptography; unset it to let OpenSSL use its hardware-accelerated code paths",
+                RuntimeWarning,
+                stacklevel=3,
+            )
 
     def _ensure_dirs(self):
         """Ensure all necessary directories exist"""
@@ -32,13 +124,20 @@ class CAManager:
         city: str = "Beijing",
         validity_days: int = 3650,
         key_size: int = 2048,
+        key_algorithm: str = "rsa",
     ) -> Dict[str, str]:
         """
         Create a root CA certificate
 
+        key_algorithm is one of "rsa", "ecdsa-p256" or "ed25519"; key_size
+        only applies to RSA.
+
         Returns:
             Dict with paths to ca_key and ca_cert
         """
+        if key_algorithm not in KEY_ALGORITHMS:
+            raise ValueError(f"Unsupported key algorithm: {key_algorithm}")
+
         # Store CA in its own directory: ca/{ca_name}/
         ca_subdir = self.ca_dir / ca_name
         ca_subdir.mkdir(parents=True, exist_ok=True)
@@ -63,67 +162,58 @@ class CAManager:
         # Ensure directory exists (it might have been removed during cleanup)
         ca_subdir.mkdir(parents=True, exist_ok=True)
 
-        # Create temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".cnf", delete=False) as f:
-            config_path = f.name
-            f.write(
-                f"""[req]
-distinguished_name = req_distinguished_name
-x509_extensions = v3_ca
-prompt = no
-
-[req_distinguished_name]
-C = {country}
-ST = {state}
-L = {city}
-O = {organization}
-CN = {organization} Root CA
-
-[v3_ca]
-basicConstraints = critical,CA:TRUE
-keyUsage = critical, keyCertSign, cRLSign
-subjectKeyIdentifier = hash
-authorityKeyIdentifier = keyid:always,issuer:always
-"""
-            )
-
         try:
             # Generate private key
-            subprocess.run(
-                ["openssl", "genrsa", "-out", str(ca_key_path), str(key_size)],
-                check=True,
-                capture_output=True,
+            key = generate_private_key(key_algorithm, key_size, self.key_pool)
+            write_pem(
+                ca_key_path,
+                key.private_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PrivateFormat.PKCS8,
+                    encryption_algorithm=serialization.NoEncryption(),
+                ),
+                0o600,
             )
 
             # Generate self-signed certificate
-            subprocess.run(
-                [
-                    "openssl",
-                    "req",
-                    "-new",
-                    "-x509",
-                    "-key",
-                    str(ca_key_path),
-                    "-out",
-                    str(ca_cert_path),
-                    "-days",
-                    str(validity_days),
-                    "-config",
-                    config_path,
-                ],
-                check=True,
-                capture_output=True,
+            attributes = [
+                (NameOID.COUNTRY_NAME, country),
+                (NameOID.STATE_OR_PROVINCE_NAME, state),
+                (NameOID.LOCALITY_NAME, city),
+                (NameOID.ORGANIZATION_NAME, organization),
+                (NameOID.COMMON_NAME, f"{organization} Root CA"),
+            ]
+            # Skip empty fields, as OpenSSL does for an empty config value
+            name = x509.Name([x509.NameAttribute(oid, value) for oid, value in attributes if value])
+            public_key = key.public_key()
+            now = datetime.datetime.now(datetime.timezone.utc)
+            cert = (
+                x509.CertificateBuilder()
+                .subject_name(name)
+                .issuer_name(name)
+                .public_key(public_key)
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now)
+                .not_valid_after(now + datetime.timedelta(days=validity_days))
+                .add_extension(self._BASIC_CONSTRAINTS, critical=True)
+                .add_extension(self._KEY_USAGE, critical=True)
+                .add_extension(
+                    x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False
+                )
+                .add_extension(
+                    x509.AuthorityKeyIdentifier.from_issuer_public_key(public_key), critical=False
+                )
+                .sign(key, signature_hash(key))
             )
-
-            # Set permissions
-            os.chmod(ca_key_path, 0o600)
-            os.chmod(ca_cert_path, 0o644)
+            write_pem(ca_cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644)
+            self._ca_list_cache = None
 
             return {
                 "ca_name": ca_name,
                 "ca_key": str(ca_key_path),
                 "ca_cert": str(ca_cert_path),
                 "key_size": key_size,
+                "key_algorithm": key_algorithm,
                 "validity_days": validity_days,
             }
         except (KeyboardInterrupt, Exception):
@@ -136,21 +226,37 @@ authorityKeyIdentifier = keyid:always,issuer:always
             if ca_subdir.exists() and not any(ca_subdir.iterdir()):
                 ca_subdir.rmdir()
             raise
-        finally:
-            os.unlink(config_path)
 
     def list_cas(self) -> List[Dict[str, str]]:
         """List all available CA certificates"""
+        mtime_ns = os.stat(self.ca_dir).st_mtime_ns
+        if self._ca_list_cache is not None and self._ca_list_cache[0] == mtime_ns:
+            return [dict(ca) for ca in self._ca_list_cache[1]]
+
         cas = []
+        complete = True
         # Look for CA directories: ca/{ca_name}/
-        for ca_subdir in self.ca_dir.iterdir():
-            if ca_subdir.is_dir():
-                ca_name = ca_subdir.name
-                key_file = ca_subdir / f"{ca_name}.key.pem"
-                cert_file = ca_subdir / f"{ca_name}.cert.pem"
-                if key_file.exists() and cert_file.exists():
-                    cas.append({"name": ca_name, "key": str(key_file), "cert": str(cert_file)})
-        return cas
+        with os.scandir(self.ca_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                # Interned so rescans, choices and cache keys share one string
+                ca_name = sys.intern(entry.name)
+                # Plain concatenation; entry.path is already a clean directory path
+                prefix = entry.path + os.sep + ca_name
+                key_file = prefix + ".key.pem"
+                cert_file = prefix + ".cert.pem"
+                try:
+                    os.stat(key_file)
+                    os.stat(cert_file)
+                except OSError:
+                    # Files written into it later would not change the parent's mtime
+                    complete = False
+                    continue
+                cas.append({"name": ca_name, "key": key_file, "cert": cert_file})
+
+        self._ca_list_cache = (mtime_ns, cas) if complete else None
+        return [dict(ca) for ca in cas]
 
     def get_ca(self, ca_name: str) -> Optional[Dict[str, str]]:
         """Get CA information by name"""
@@ -166,41 +272,62 @@ authorityKeyIdentifier = keyid:always,issuer:always
         """Get all certificates signed by a specific CA"""
         # Certificates are now organized by CA: certs/{ca_name}/{cert_name}/
         certs = []
-        ca_certs_dir = self.certs_dir / ca_name
+        ca_certs_dir = os.path.join(self.certs_dir, ca_name)
 
-        if not ca_certs_dir.exists():
+        try:
+            mtime_ns = os.stat(ca_certs_dir).st_mtime_ns
+            cached = self._certs_by_ca_cache.get(ca_name)
+            if cached is not None and cached[0] == mtime_ns:
+                return [dict(cert) for cert in cached[1]]
+            entries = os.scandir(ca_certs_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            self._certs_by_ca_cache.pop(ca_name, None)
             return certs
 
         # List all certificate directories under this CA
-        for cert_dir in ca_certs_dir.iterdir():
-            if cert_dir.is_dir():
-                key_path = cert_dir / "key.pem"
-                cert_path = cert_dir / "cert.pem"
-                if key_path.exists() and cert_path.exists():
-                    certs.append(
-                        {"name": cert_dir.name, "key": str(key_path), "cert": str(cert_path)}
-                    )
-
-        return certs
+        complete = True
+        with entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                prefix = entry.path + os.sep
+                key_path = prefix + "key.pem"
+                cert_path = prefix + "cert.pem"
+                try:
+                    os.stat(key_path)
+                    os.stat(cert_path)
+                except OSError:
+                    # Files written into it later would not change the parent's mtime
+                    complete = False
+                    continue
+                certs.append({"name": entry.name, "key": key_path, "cert": cert_path})
+
+        if complete:
+            self._certs_by_ca_cache[ca_name] = (mtime_ns, certs)
+        else:
+            self._certs_by_ca_cache.pop(ca_name, None)
+        return [dict(cert) for cert in certs]
 
     def delete_ca(self, ca_name: str) -> bool:
         """Delete a CA certificate and all its issued certificates"""
         ca_subdir = self.ca_dir / ca_name
         ca_certs_dir = self.certs_dir / ca_name
 
-        if not ca_subdir.exists():
-            return False
-
+        self._ca_list_cache = None
+        self._certs_by_ca_cache.pop(ca_name, None)
         try:
-            # Delete CA directory (contains key and cert)
-            import shutil
-
-            if ca_subdir.exists():
+            # Delete CA directory (contains key and cert); shutil.rmtree walks it
+            # with dir_fd-relative unlinkat() where the platform supports it
+            try:
                 shutil.rmtree(ca_subdir)
+            except FileNotFoundError:
+                return False
 
             # Delete all certificates issued by this CA
-            if ca_certs_dir.exists():
+            try:
                 shutil.rmtree(ca_certs_dir)
+            except FileNotFoundError:
+                pass
 
             return True
         except Exception:
@@ -209,12 +336,6 @@ authorityKeyIdentifier = keyid:always,issuer:always
     def get_ca_info(self, ca_cert_path: str) -> Dict[str, str]:
         """Get information about a CA certificate"""
         try:
-            result = subprocess.run(
-                ["openssl", "x509", "-in", ca_cert_path, "-text", "-noout"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return {"info": result.stdout}
-        except subprocess.CalledProcessError:
+            return {"info": get_cert_info(ca_cert_path).text_dump}
+        except (OSError, ValueError):
             return {"info": "Failed to read certificate"}
@@ -0,0 +1,220 @@
+"""
+Process-wide cache of parsed certificates
+
+Entries are keyed by (path, mtime_ns, size), so a rewritten file is re-parsed
+transparently on its next access.
+"""
+
+import functools
+import os
+from collections import namedtuple
+from typing import List
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.x509.oid import (
+    ExtendedKeyUsageOID,
+    ExtensionOID,
+    NameOID,
+    SignatureAlgorithmOID,
+)
+
+CertInfo = namedtuple(
+    "CertInfo", ["subject", "issuer", "not_after", "text_dump", "extended_key_usages"]
+)
+
+# Display names matching `openssl x509 -text`
+_NAME_LABELS = {
+    NameOID.COUNTRY_NAME: "C",
+    NameOID.STATE_OR_PROVINCE_NAME: "ST",
+    NameOID.LOCALITY_NAME: "L",
+    NameOID.ORGANIZATION_NAME: "O",
+    NameOID.ORGANIZATIONAL_UNIT_NAME: "OU",
+    NameOID.COMMON_NAME: "CN",
+    NameOID.EMAIL_ADDRESS: "emailAddress",
+}
+
+_SIGNATURE_ALGORITHMS = {
+    SignatureAlgorithmOID.RSA_WITH_SHA256: "sha256WithRSAEncryption",
+    SignatureAlgorithmOID.RSA_WITH_SHA384: "sha384WithRSAEncryption",
+    SignatureAlgorithmOID.RSA_WITH_SHA512: "sha512WithRSAEncryption",
+    SignatureAlgorithmOID.ECDSA_WITH_SHA256: "ecdsa-with-SHA256",
+    SignatureAlgorithmOID.ECDSA_WITH_SHA384: "ecdsa-with-SHA384",
+    SignatureAlgorithmOID.ECDSA_WITH_SHA512: "ecdsa-with-SHA512",
+    SignatureAlgorithmOID.ED25519: "ED25519",
+}
+
+_EXTENSION_NAMES = {
+    ExtensionOID.BASIC_CONSTRAINTS: "X509v3 Basic Constraints",
+    ExtensionOID.KEY_USAGE: "X509v3 Key Usage",
+    ExtensionOID.EXTENDED_KEY_USAGE: "X509v3 Extended Key Usage",
+    ExtensionOID.SUBJECT_ALTERNATIVE_NAME: "X509v3 Subject Alternative Name",
+    ExtensionOID.SUBJECT_KEY_IDENTIFIER: "X509v3 Subject Key Identifier",
+    ExtensionOID.AUTHORITY_KEY_IDENTIFIER: "X509v3 Authority Key Identifier",
+}
+
+_EXTENDED_KEY_USAGES = {
+    ExtendedKeyUsageOID.SERVER_AUTH: "TLS Web Server Authentication",
+    ExtendedKeyUsageOID.CLIENT_AUTH: "TLS Web Client Authentication",
+    ExtendedKeyUsageOID.CODE_SIGNING: "Code Signing",
+    ExtendedKeyUsageOID.EMAIL_PROTECTION: "E-mail Protection",
+    ExtendedKeyUsageOID.TIME_STAMPING: "Time Stamping",
+    ExtendedKeyUsageOID.OCSP_SIGNING: "OCSP Signing",
+}
+
+_KEY_USAGES = [
+    ("digital_signature", "Digital Signature"),
+    ("content_commitment", "Non Repudiation"),
+    ("key_encipherment", "Key Encipherment"),
+    ("data_encipherment", "Data Encipherment"),
+    ("key_agreement", "Key Agreement"),
+    ("key_cert_sign", "Certificate Sign"),
+    ("crl_sign", "CRL Sign"),
+]
+
+
+def _not_before(cert: x509.Certificate):
+    """Start date, preferring the timezone-aware accessor where available"""
+    if hasattr(cert, "not_valid_before_utc"):
+        return cert.not_valid_before_utc
+    return cert.not_valid_before
+
+
+def _not_after(cert: x509.Certificate):
+    """Expiry date, preferring the timezone-aware accessor where available"""
+    if hasattr(cert, "not_valid_after_utc"):
+        return cert.not_valid_after_utc
+    return cert.not_valid_after
+
+
+def _hex(data: bytes) -> str:
+    """Colon-separated hex, as OpenSSL prints key identifiers and fingerprints"""
+    return ":".join(f"{b:02X}" for b in data)
+
+
+def _format_name(name: x509.Name) -> str:
+    return ", ".join(
+        f"{_NAME_LABELS.get(attr.oid, attr.oid.dotted_string)} = {attr.value}" for attr in name
+    )
+
+
+def _format_date(value) -> str:
+    return f"{value:%b} {value.day:2d} {value:%H:%M:%S %Y} GMT"
+
+
+def _format_public_key(public_key) -> List[str]:
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return ["rsaEncryption", f"    Public-Key: ({public_key.key_size} bit)"]
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return [
+            "id-ecPublicKey",
+            f"    Public-Key: ({public_key.curve.key_size} bit)",
+            f"    Curve: {public_key.curve.name}",
+        ]
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return ["ED25519"]
+    return [type(public_key).__name__]
+
+
+def _format_extension_value(value) -> str:
+    if isinstance(value, x509.BasicConstraints):
+        text = "CA:TRUE" if value.ca else "CA:FALSE"
+        if value.path_length is not None:
+            text += f", pathlen:{value.path_length}"
+        return text
+    if isinstance(value, x509.KeyUsage):
+        usages = [label for attr, label in _KEY_USAGES if getattr(value, attr)]
+        if value.key_agreement:
+            if value.encipher_only:
+                usages.append("Encipher Only")
+            if value.decipher_only:
+                usages.append("Decipher Only")
+        return ", ".join(usages)
+    if isinstance(value, x509.ExtendedKeyUsage):
+        return ", ".join(_EXTENDED_KEY_USAGES.get(oid, oid.dotted_string) for oid in value)
+    if isinstance(value, x509.SubjectAlternativeName):
+        names = [f"DNS:{name}" for name in value.get_values_for_type(x509.DNSName)]
+        names.extend(f"IP Address:{ip}" for ip in value.get_values_for_type(x509.IPAddress))
+        return ", ".join(names)
+    if isinstance(value, x509.SubjectKeyIdentifier):
+        return _hex(value.digest)
+    if isinstance(value, x509.AuthorityKeyIdentifier) and value.key_identifier:
+        return _hex(value.key_identifier)
+    return str(value)
+
+
+def _render_text(cert: x509.Certificate) -> str:
+    """Render a certificate in the layout of `openssl x509 -text -noout`"""
+    serial = cert.serial_number
+    serial_bytes = serial.to_bytes(serial.bit_length() // 8 + 1, "big")
+    signature_algorithm = _SIGNATURE_ALGORITHMS.get(
+        cert.signature_algorithm_oid, cert.signature_algorithm_oid.dotted_string
+    )
+
+    lines = [
+        "Certificate:",
+        "    Data:",
+        f"        Version: {cert.version.value + 1} ({hex(cert.version.value)})",
+        "        Serial Number:",
+        "            " + ":".join(f"{b:02x}" for b in serial_bytes),
+        f"        Signature Algorithm: {signature_algorithm}",
+        f"        Issuer: {_format_name(cert.issuer)}",
+        "        Validity",
+        f"            Not Before: {_format_date(_not_before(cert))}",
+        f"            Not After : {_format_date(_not_after(cert))}",
+        f"        Subject: {_format_name(cert.subject)}",
+        "        Subject Public Key Info:",
+    ]
+    key_lines = _format_public_key(cert.public_key())
+    lines.append(f"            Public Key Algorithm: {key_lines[0]}")
+    lines.extend(f"            {line}" for line in key_lines[1:])
+
+    if len(cert.extensions):
+        lines.append("        X509v3 extensions:")
+        for ext in cert.extensions:
+            name = _EXTENSION_NAMES.get(ext.oid, ext.oid.dotted_string)
+            lines.append(f"            {name}:{' critical' if ext.critical else ''}")
+            lines.append(f"                {_format_extension_value(ext.value)}")
+
+    lines.append(f"    Signature Algorithm: {signature_algorithm}")
+    lines.append(f"    SHA256 Fingerprint: {_hex(cert.fingerprint(hashes.SHA256()))}")
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_cert(path: str, mtime_ns: int, size: int) -> CertInfo:
+    """Parse a PEM certificate (cached; mtime_ns and size only serve as the key)"""
+    with open(path, "rb") as f:
+        cert = x509.load_pem_x509_certificate(f.read())
+
+    try:
+        eku = cert.extensions.get_extension_for_class(x509.ExtendedKeyUsage).value
+        extended_key_usages = frozenset(eku)
+    except x509.ExtensionNotFound:
+        extended_key_usages = frozenset()
+
+    return CertInfo(
+        subject=cert.subject.rfc4514_string(),
+        issuer=cert.issuer.rfc4514_string(),
+        not_after=_not_after(cert),
+        text_dump=_render_text(cert),
+        extended_key_usages=extended_key_usages,
+    )
+
+
+def get_cert_info(path: str) -> CertInfo:
+    """
+    Get parsed information about a certificate file
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid PEM certificate
+    """
+    st = os.stat(path)
+    return _parse_cert(os.fspath(path), st.st_mtime_ns, st.st_size)
+
+
+def clear_cache():
+    """Drop all cached certificates"""
+    _parse_cert.cache_clear()
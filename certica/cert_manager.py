@@ -2,18 +2,95 @@
 Certificate Manager - Handles certificate signing operations
 """
 
+import datetime
+import functools
+import inspect
+import ipaddress
 import os
-import subprocess
-import tempfile
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+from .cert_cache import get_cert_info
+from .key_pool import KEY_ALGORITHMS, KeyPool, generate_private_key, signature_hash
+from .pem_io import write_pem
+
+
+@functools.lru_cache(maxsize=8)
+def _load_signing_ca(ca_key: str, ca_cert: str, key_mtime_ns: int, cert_mtime_ns: int):
+    """Load a CA certificate and private key (cached; mtimes only serve as the key)"""
+    ca_cert_obj = x509.load_pem_x509_certificate(Path(ca_cert).read_bytes())
+    ca_key_obj = serialization.load_pem_private_key(Path(ca_key).read_bytes(), password=None)
+    return ca_cert_obj, ca_key_obj
+
+
+def _load_ca(ca_key: str, ca_cert: str):
+    """Load the signing CA, reusing it while neither file has changed"""
+    return _load_signing_ca(
+        str(ca_key), str(ca_cert), os.stat(ca_key).st_mtime_ns, os.stat(ca_cert).st_mtime_ns
+    )
+
+
+# Per-process CertManager used by sign_certificates_batch workers
+_batch_manager: Optional["CertManager"] = None
+
+
+def _init_batch_worker(base_dir: str, ca_key: str, ca_cert: str):
+    """Set up a batch worker process and load the signing CA once"""
+    global _batch_manager
+    _batch_manager = CertManager(base_dir)
+    _load_ca(ca_key, ca_cert)
+
+
+def _sign_batch_spec(job: Tuple[str, str, str, Dict]) -> Dict[str, str]:
+    """Sign one certificate of a batch inside a worker process"""
+    ca_key, ca_cert, ca_name, spec = job
+    return _batch_manager.sign_certificate(ca_key=ca_key, ca_cert=ca_cert, ca_name=ca_name, **spec)
 
 
 class CertManager:
     """Manages certificate signing operations"""
 
-    def __init__(self, base_dir: str = "output"):
+    # Extensions shared by every leaf certificate; these objects are immutable
+    _BASIC_CONSTRAINTS = x509.BasicConstraints(ca=False, path_length=None)
+    _KEY_USAGE = x509.KeyUsage(
+        digital_signature=True,
+        content_commitment=False,
+        key_encipherment=True,
+        data_encipherment=False,
+        key_agreement=False,
+        key_cert_sign=False,
+        crl_sign=False,
+        encipher_only=False,
+        decipher_only=False,
+    )
+    # EC and Ed25519 keys cannot encipher, so they only get digitalSignature
+    _KEY_USAGE_SIGNATURE_ONLY = x509.KeyUsage(
+        digital_signature=True,
+        content_commitment=False,
+        key_encipherment=False,
+        data_encipherment=False,
+        key_agreement=False,
+        key_cert_sign=False,
+        crl_sign=False,
+        encipher_only=False,
+        decipher_only=False,
+    )
+    _EXTENDED_KEY_USAGE = {
+        "server": x509.ExtendedKeyUsage(
+            [ExtendedKeyUsageOID.SERVER_AUTH, ExtendedKeyUsageOID.CLIENT_AUTH]
+        ),
+        "client": x509.ExtendedKeyUsage([ExtendedKeyUsageOID.CLIENT_AUTH]),
+    }
+
+    def __init__(self, base_dir: str = "output", key_pool: Optional[KeyPool] = None):
         self.base_dir = Path(base_dir).resolve()
+        self.key_pool = key_pool
         self.certs_dir = self.base_dir / "certs"
         self.certs_dir.mkdir(parents=True, exist_ok=True)
 
@@ -33,6 +110,7 @@ class CertManager:
         city: str = "Beijing",
         validity_days: int = 365,
         key_size: int = 2048,
+        key_algorithm: str = "rsa",
     ) -> Dict[str, str]:
         """
         Sign a certificate using the specified CA
@@ -51,11 +129,15 @@ class CertManager:
             state: State/Province
             city: City
             validity_days: Certificate validity in days
-            key_size: Key size in bits
+            key_size: Key size in bits (RSA only)
+            key_algorithm: "rsa", "ecdsa-p256" or "ed25519"
 
         Returns:
             Dict with paths to generated files
         """
+        if key_algorithm not in KEY_ALGORITHMS:
+            raise ValueError(f"Unsupported key algorithm: {key_algorithm}")
+
         if dns_names is None:
             dns_names = []
         if ip_addresses is None:
@@ -77,79 +159,49 @@ class CertManager:
         key_path = cert_output_dir / "key.pem"
         cert_path = cert_output_dir / "cert.pem"
 
-        # Create temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".cnf", delete=False) as f:
-            config_path = f.name
-            self._write_cert_config(
-                f,
-                cert_type,
-                common_name,
-                dns_names,
-                ip_addresses,
-                organization,
-                country,
-                state,
-                city,
-            )
-
         try:
-            # Generate private key
-            subprocess.run(
-                ["openssl", "genrsa", "-out", str(key_path), str(key_size)],
-                check=True,
-                capture_output=True,
-            )
+            # Load the signing CA
+            ca_cert_obj, ca_key_obj = _load_ca(ca_key, ca_cert)
 
-            # Generate certificate signing request
-            csr_path = cert_output_dir / "csr.pem"
-            subprocess.run(
-                [
-                    "openssl",
-                    "req",
-                    "-new",
-                    "-key",
-                    str(key_path),
-                    "-out",
-                    str(csr_path),
-                    "-config",
-                    config_path,
-                ],
-                check=True,
-                capture_output=True,
+            # Generate private key
+            key = generate_private_key(key_algorithm, key_size, self.key_pool)
+            write_pem(
+                key_path,
+                key.private_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PrivateFormat.PKCS8,
+                    encryption_algorithm=serialization.NoEncryption(),
+                ),
+                0o600,
             )
 
             # Sign certificate
-            subprocess.run(
-                [
-                    "openssl",
-                    "x509",
-                    "-req",
-                    "-in",
-                    str(csr_path),
-                    "-CA",
-                    ca_cert,
-                    "-CAkey",
-                    ca_key,
-                    "-CAcreateserial",
-                    "-out",
-                    str(cert_path),
-                    "-days",
-                    str(validity_days),
-                    "-extensions",
-                    "v3_req",
-                    "-extfile",
-                    config_path,
-                ],
-                check=True,
-                capture_output=True,
+            public_key = key.public_key()
+            now = datetime.datetime.now(datetime.timezone.utc)
+            builder = (
+                x509.CertificateBuilder()
+                .subject_name(self._build_subject(common_name, organization, country, state, city))
+                .issuer_name(ca_cert_obj.subject)
+                .public_key(public_key)
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now)
+                .not_valid_after(now + datetime.timedelta(days=validity_days))
             )
-
-            # Set permissions
-            os.chmod(key_path, 0o600)
-            os.chmod(cert_path, 0o644)
-
-            # Clean up CSR
-            csr_path.unlink()
+            for extension, critical in self._build_extensions(
+                cert_type, dns_names, ip_addresses, key_algorithm
+            ):
+                builder = builder.add_extension(extension, critical=critical)
+            cert = (
+                builder.add_extension(
+                    x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False
+                )
+                .add_extension(
+                    x509.AuthorityKeyIdentifier.from_issuer_public_key(ca_key_obj.public_key()),
+                    critical=False,
+                )
+                .sign(ca_key_obj, signature_hash(ca_key_obj))
+            )
+            write_pem(cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644)
 
             return {
                 "cert_name": cert_name,
@@ -164,114 +216,232 @@ class CertManager:
                 key_path.unlink()
             if cert_path.exists():
                 cert_path.unlink()
-            if csr_path.exists():
-                csr_path.unlink()
             # Remove empty directories if all files are gone
             if cert_output_dir.exists() and not any(cert_output_dir.iterdir()):
                 cert_output_dir.rmdir()
             if ca_certs_dir.exists() and not any(ca_certs_dir.iterdir()):
                 ca_certs_dir.rmdir()
             raise
-        finally:
-            os.unlink(config_path)
 
-    def _write_cert_config(
+    def sign_certificates_batch(
+        self,
+        ca_key: str,
+        ca_cert: str,
+        ca_name: str,
+        specs: List[Dict],
+        max_workers: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Sign several certificates in parallel worker processes
+
+        Args:
+            ca_key: Path to CA private key
+            ca_cert: Path to CA certificate
+            ca_name: Name of the CA (for directory organization)
+            specs: Keyword arguments for sign_certificate, one dict per certificate
+                (each must contain cert_name)
+            max_workers: Number of worker processes (defaults to the CPU count)
+
+        Every spec is checked, and the CA loaded, before anything is signed. A
+        certificate that still fails while signing does not stop the others.
+
+        Returns:
+            One entry per spec, in the order of specs: the sign_certificate result,
+            or {"cert_name": ..., "error": message} if that certificate failed
+
+        Raises:
+            ValueError: If a spec is invalid or the CA cannot be loaded
+        """
+        names = [spec.get("cert_name") for spec in specs]
+        if not all(names):
+            raise ValueError("Every certificate spec needs a cert_name")
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate cert_name in batch")
+        if not specs:
+            return []
+
+        for spec in specs:
+            self._check_batch_spec(ca_name, spec)
+        try:
+            _load_ca(ca_key, ca_cert)
+        except (OSError, ValueError, TypeError) as e:
+            raise ValueError(f"Cannot load CA '{ca_name}': {e}") from e
+
+        results: List[Optional[Dict[str, str]]] = [None] * len(specs)
+        workers = min(max_workers or os.cpu_count() or 1, len(specs))
+        if workers == 1:
+            for i, spec in enumerate(specs):
+                try:
+                    results[i] = self.sign_certificate(
+                        ca_key=ca_key, ca_cert=ca_cert, ca_name=ca_name, **spec
+                    )
+                except Exception as e:
+                    results[i] = {"cert_name": names[i], "error": str(e)}
+            return results
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(str(self.base_dir), ca_key, ca_cert),
+        ) as executor:
+            futures = {
+                executor.submit(_sign_batch_spec, (ca_key, ca_cert, ca_name, spec)): i
+                for i, spec in enumerate(specs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = {"cert_name": names[i], "error": str(e) or type(e).__name__}
+        return results
+
+    def _check_batch_spec(self, ca_name: str, spec: Dict):
+        """Reject a batch spec that sign_certificate would fail on"""
+        cert_name = spec["cert_name"]
+        unknown = set(spec) - _BATCH_SPEC_KEYS
+        if unknown:
+            raise ValueError(f"{cert_name}: unknown field(s) {', '.join(sorted(unknown))}")
+        if (
+            not isinstance(cert_name, str)
+            or cert_name in (".", "..")
+            or "/" in cert_name
+            or (os.altsep and os.altsep in cert_name)
+            or os.sep in cert_name
+        ):
+            raise ValueError(f"Invalid cert_name: {cert_name!r}")
+        if spec.get("cert_type", "server") not in ("server", "client"):
+            raise ValueError(f"{cert_name}: cert_type must be 'server' or 'client'")
+        if spec.get("key_algorithm", "rsa") not in KEY_ALGORITHMS:
+            raise ValueError(f"{cert_name}: unsupported key algorithm {spec['key_algorithm']}")
+        for field in ("validity_days", "key_size"):
+            value = spec.get(field, 1)
+            if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"{cert_name}: {field} must be a positive integer")
+        for field in ("dns_names", "ip_addresses"):
+            values = spec.get(field) or []
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"{cert_name}: {field} must be a list of strings")
+        for ip in spec.get("ip_addresses") or []:
+            try:
+                ipaddress.ip_address(ip)
+            except ValueError:
+                raise ValueError(f"{cert_name}: invalid IP address {ip!r}") from None
+        cert_output_dir = self.certs_dir / ca_name / cert_name
+        for path in (cert_output_dir.parent, cert_output_dir):
+            if path.exists() and not path.is_dir():
+                raise ValueError(f"{cert_name}: {path} exists and is not a directory")
+
+    def _build_subject(
+        self, common_name: str, organization: str, country: str, state: str, city: str
+    ) -> x509.Name:
+        """Build the subject name for a certificate"""
+        attributes = [
+            (NameOID.COUNTRY_NAME, country),
+            (NameOID.STATE_OR_PROVINCE_NAME, state),
+            (NameOID.LOCALITY_NAME, city),
+            (NameOID.ORGANIZATION_NAME, organization),
+            (NameOID.COMMON_NAME, common_name),
+        ]
+        # Skip empty fields, as OpenSSL does for an empty config value
+        return x509.Name([x509.NameAttribute(oid, value) for oid, value in attributes if value])
+
+    def _build_extensions(
         self,
-        f,
         cert_type: str,
-        common_name: str,
         dns_names: List[str],
         ip_addresses: List[str],
-        organization: str,
-        country: str,
-        state: str,
-        city: str,
-    ):
-        """Write OpenSSL configuration for certificate"""
-        f.write(
-            f"""[req]
-req_extensions = v3_req
-distinguished_name = req_distinguished_name
-prompt = no
-
-[req_distinguished_name]
-C = {country}
-ST = {state}
-L = {city}
-O = {organization}
-CN = {common_name}
-
-[v3_req]
-basicConstraints = CA:FALSE
-keyUsage = digitalSignature, keyEncipherment
-"""
-        )
-
-        if cert_type == "server":
-            f.write("extendedKeyUsage = serverAuth, clientAuth\n")
-        else:
-            f.write("extendedKeyUsage = clientAuth\n")
+        key_algorithm: str = "rsa",
+    ) -> List[Tuple[x509.ExtensionType, bool]]:
+        """Build the X.509 v3 extensions for a certificate"""
+        key_usage = self._KEY_USAGE if key_algorithm == "rsa" else self._KEY_USAGE_SIGNATURE_ONLY
+        extensions = [
+            (self._BASIC_CONSTRAINTS, False),
+            (key_usage, False),
+            (self._EXTENDED_KEY_USAGE["server" if cert_type == "server" else "client"], False),
+        ]
 
         # Add Subject Alternative Names
         if dns_names or ip_addresses:
-            f.write("subjectAltName = @alt_names\n\n")
-            f.write("[alt_names]\n")
+            alt_names = [x509.DNSName(dns) for dns in dns_names]
+            alt_names.extend(x509.IPAddress(ipaddress.ip_address(ip)) for ip in ip_addresses)
+            extensions.append((x509.SubjectAlternativeName(alt_names), False))
 
-            dns_count = 1
-            for dns in dns_names:
-                f.write(f"DNS.{dns_count} = {dns}\n")
-                dns_count += 1
-
-            ip_count = 1
-            for ip in ip_addresses:
-                f.write(f"IP.{ip_count} = {ip}\n")
-                ip_count += 1
+        return extensions
 
     def list_certificates(self) -> List[Dict[str, str]]:
         """List all signed certificates"""
         certs = []
         # Certificates are organized by CA: certs/{ca_name}/{cert_name}/
-        for ca_dir in self.certs_dir.iterdir():
-            if ca_dir.is_dir():
-                ca_name = ca_dir.name
-                for cert_dir in ca_dir.iterdir():
-                    if cert_dir.is_dir():
-                        key_path = cert_dir / "key.pem"
-                        cert_path = cert_dir / "cert.pem"
-                        if key_path.exists() and cert_path.exists():
-                            certs.append(
-                                {
-                                    "name": cert_dir.name,
-                                    "ca_name": ca_name,
-                                    "key": str(key_path),
-                                    "cert": str(cert_path),
-                                }
-                            )
+        with os.scandir(self.certs_dir) as ca_entries:
+            for ca_entry in ca_entries:
+                if not ca_entry.is_dir():
+                    continue
+                with os.scandir(ca_entry.path) as cert_entries:
+                    for entry in cert_entries:
+                        if not entry.is_dir():
+                            continue
+                        # Plain concatenation; entry.path is already a clean directory path
+                        prefix = entry.path + os.sep
+                        key_path = prefix + "key.pem"
+                        cert_path = prefix + "cert.pem"
+                        try:
+                            os.stat(key_path)
+                            os.stat(cert_path)
+                        except OSError:
+                            continue
+                        certs.append(
+                            {
+                                "name": entry.name,
+                                "ca_name": ca_entry.name,
+                                "key": key_path,
+                                "cert": cert_path,
+                            }
+                        )
         return certs
 
     def get_certificate_info(self, cert_path: str) -> Dict[str, str]:
         """Get information about a certificate"""
         try:
-            result = subprocess.run(
-                ["openssl", "x509", "-in", cert_path, "-text", "-noout"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return {"info": result.stdout}
-        except subprocess.CalledProcessError:
+            return {"info": get_cert_info(cert_path).text_dump}
+        except (OSError, ValueError):
             return {"info": "Failed to read certificate"}
 
+    def get_certificate_type(self, cert_path: str) -> Optional[str]:
+        """
+        Get the usage of a certificate from its extended key usage
+
+        Returns:
+            "server", "client", "both", or None if unknown or unreadable
+        """
+        try:
+            usages = get_cert_info(cert_path).extended_key_usages
+        except (OSError, ValueError):
+            return None
+        server = ExtendedKeyUsageOID.SERVER_AUTH in usages
+        client = ExtendedKeyUsageOID.CLIENT_AUTH in usages
+        if server and client:
+            return "both"
+        if server:
+            return "server"
+        if client:
+            return "client"
+        return None
+
     def delete_certificate(self, ca_name: str, cert_name: str) -> bool:
         """Delete a certificate"""
         cert_dir = self.certs_dir / ca_name / cert_name
-        if not cert_dir.exists():
-            return False
-
         try:
-            import shutil
-
             shutil.rmtree(cert_dir)
             return True
         except Exception:
             return False
+
+
+# Fields a sign_certificates_batch spec may set
+_BATCH_SPEC_KEYS = frozenset(inspect.signature(CertManager.sign_certificate).parameters) - {
+    "self",
+    "ca_key",
+    "ca_cert",
+    "ca_name",
+}
@@ -2,36 +2,47 @@
 Command-line interface for CA certificate tool
 """
 
+import json
+import os
 import sys
 import click
 from pathlib import Path
+from typing import Optional, Tuple
 from .i18n import set_language, t
-from .system_check import check_system_requirements
+from .system_check import check_system_requirements, is_system_check_cached, save_system_check
 from .ca_manager import CAManager
 from .cert_manager import CertManager
+from .key_pool import KEY_ALGORITHMS
 from .template_manager import TemplateManager
 from .system_cert import SystemCertManager
 
 
-def _format_path(path: str, base_dir: str = "output") -> str:
-    """Format path by removing base_dir prefix for display"""
+def _format_path(path: str, base_dir: str = "output", resolved_base: Optional[str] = None) -> str:
+    """
+    Format path by removing base_dir prefix for display
+
+    resolved_base is base_dir already resolved to an absolute path; paths
+    under it are stripped without touching the filesystem.
+    """
     try:
         path_str = str(path)
+        if resolved_base and path_str.startswith(resolved_base + os.sep):
+            return path_str[len(resolved_base) + 1 :]
         # Remove base_dir prefix if present
         if path_str.startswith(base_dir + "/") or path_str.startswith(base_dir + "\\"):
             return path_str[len(base_dir) + 1 :]
         # Try with resolved absolute paths
         path_obj = Path(path).resolve()
-        base_path = Path(base_dir).resolve()
+        base_path = Path(resolved_base) if resolved_base else Path(base_dir).resolve()
         try:
             if base_path in path_obj.parents or path_obj == base_path:
                 return str(path_obj.relative_to(base_path))
         except ValueError:
             pass
-        # If path contains base_dir as substring, try to extract relative part
-        path_parts = path_str.split(base_dir)
-        if len(path_parts) > 1:
-            remaining = path_parts[1].lstrip("/\\")
+        # If path contains base_dir as substring, keep what follows its last occurrence
+        idx = path_str.rfind(base_dir) if base_dir else -1
+        if idx >= 0:
+            remaining = path_str[idx + len(base_dir) :].lstrip("/\\")
             return remaining if remaining else path_str
         return path_str
     except Exception:
@@ -39,6 +50,28 @@ def _format_path(path: str, base_dir: str = "output") -> str:
         return str(path)
 
 
+def _key_options(alg: Optional[str], key_size: Optional[int]) -> Tuple[str, int]:
+    """
+    Pick the key algorithm and size for create-ca and sign
+
+    Without --alg, a key size from --key-size or a template means RSA; otherwise
+    ECDSA P-256 is used.
+    """
+    if alg is None:
+        alg = "rsa" if key_size is not None else "ecdsa-p256"
+    return alg, 2048 if key_size is None else key_size
+
+
+def _cached_system_check() -> bool:
+    """Run check_system_requirements unless it already passed with the same openssl"""
+    if is_system_check_cached():
+        return True
+    if not check_system_requirements():
+        return False
+    save_system_check()
+    return True
+
+
 @click.group()
 @click.option("--base-dir", default="output", help="Base directory for output files")
 @click.option("--skip-check", is_flag=True, help="Skip system requirements check")
@@ -48,18 +81,19 @@ def cli(ctx, base_dir, skip_check, check_only):
     """CA Certificate Generation Tool - Command Line Interface"""
     # If check-only flag is set, just run check and exit
     if check_only:
-        success = check_system_requirements()
+        success = check_system_requirements(deep=True)
         sys.exit(0 if success else 1)
 
     # Check system requirements unless skipped
     if not skip_check:
-        if not check_system_requirements():
+        if not _cached_system_check():
             click.echo(f"\n{t('cli.error.system_check_failed')}", err=True)
             click.echo(t("cli.error.system_check_hint"), err=True)
             sys.exit(1)
 
     ctx.ensure_object(dict)
     ctx.obj["base_dir"] = base_dir
+    ctx.obj["resolved_base"] = str(Path(base_dir).resolve())
     ctx.obj["ca_manager"] = CAManager(base_dir)
     ctx.obj["cert_manager"] = CertManager(base_dir)
     ctx.obj["template_manager"] = TemplateManager(base_dir)
@@ -73,14 +107,24 @@ def cli(ctx, base_dir, skip_check, check_only):
 @click.option("--state", default="Beijing", help="State/Province")
 @click.option("--city", default="Beijing", help="City")
 @click.option("--validity", default=3650, type=int, help="Validity in days")
-@click.option("--key-size", default=2048, type=int, help="Key size in bits")
+@click.option(
+    "--key-size", type=int, help="RSA key size in bits (default: 2048); implies --alg rsa"
+)
+@click.option(
+    "--alg",
+    type=click.Choice(list(KEY_ALGORITHMS)),
+    help="Key algorithm (default: ecdsa-p256, or rsa when a key size is given)",
+)
 @click.option("--template", help="Template file to use for defaults")
 @click.pass_context
-def create_ca(ctx, name, org, country, state, city, validity, key_size, template):
+def create_ca(ctx, name, org, country, state, city, validity, key_size, alg, template):
     """Create a root CA certificate"""
     template_manager = ctx.obj["template_manager"]
     ca_manager = ctx.obj["ca_manager"]
 
+    if alg not in (None, "rsa") and key_size is not None:
+        click.echo(t("cli.key_size_ignored", alg=alg), err=True)
+
     # Load template if provided
     if template:
         template_data = template_manager.load_template(template)
@@ -91,6 +135,8 @@ def create_ca(ctx, name, org, country, state, city, validity, key_size, template
         validity = template_data.get("default_validity_days", validity)
         key_size = template_data.get("default_key_size", key_size)
 
+    alg, key_size = _key_options(alg, key_size)
+
     try:
         result = ca_manager.create_root_ca(
             ca_name=name,
@@ -100,11 +146,17 @@ def create_ca(ctx, name, org, country, state, city, validity, key_size, template
             city=city,
             validity_days=validity,
             key_size=key_size,
+            key_algorithm=alg,
         )
         base_dir = ctx.obj["base_dir"]
+        resolved_base = ctx.obj["resolved_base"]
         click.echo(t("cli.create_ca.success"))
-        click.echo(t("cli.create_ca.key", path=_format_path(result["ca_key"], base_dir)))
-        click.echo(t("cli.create_ca.cert", path=_format_path(result["ca_cert"], base_dir)))
+        click.echo(
+            t("cli.create_ca.key", path=_format_path(result["ca_key"], base_dir, resolved_base))
+        )
+        click.echo(
+            t("cli.create_ca.cert", path=_format_path(result["ca_cert"], base_dir, resolved_base))
+        )
     except FileExistsError as e:
         click.echo(t("cli.create_ca.error", error=str(e)), err=True)
     except Exception as e:
@@ -113,7 +165,7 @@ def create_ca(ctx, name, org, country, state, city, validity, key_size, template
 
 @cli.command()
 @click.option("--ca", required=True, help="CA name to use for signing")
-@click.option("--name", required=True, help="Certificate name")
+@click.option("--name", help="Certificate name")
 @click.option(
     "--type", type=click.Choice(["server", "client"]), default="server", help="Certificate type"
 )
@@ -125,21 +177,57 @@ def create_ca(ctx, name, org, country, state, city, validity, key_size, template
 @click.option("--state", default="Beijing", help="State/Province")
 @click.option("--city", default="Beijing", help="City")
 @click.option("--validity", default=365, type=int, help="Validity in days")
-@click.option("--key-size", default=2048, type=int, help="Key size in bits")
+@click.option(
+    "--key-size", type=int, help="RSA key size in bits (default: 2048); implies --alg rsa"
+)
+@click.option(
+    "--alg",
+    type=click.Choice(list(KEY_ALGORITHMS)),
+    help="Key algorithm (default: ecdsa-p256, or rsa when a key size is given)",
+)
 @click.option("--template", help="Template file to use for defaults")
+@click.option(
+    "--batch-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON list of sign_certificate arguments to sign in parallel",
+)
 @click.pass_context
-def sign(ctx, ca, name, type, cn, dns, ip, org, country, state, city, validity, key_size, template):
+def sign(
+    ctx,
+    ca,
+    name,
+    type,
+    cn,
+    dns,
+    ip,
+    org,
+    country,
+    state,
+    city,
+    validity,
+    key_size,
+    alg,
+    template,
+    batch_file,
+):
     """Sign a certificate using the specified CA"""
     template_manager = ctx.obj["template_manager"]
     ca_manager = ctx.obj["ca_manager"]
     cert_manager = ctx.obj["cert_manager"]
 
+    if not name and not batch_file:
+        click.echo(t("cli.sign.error_name_required"), err=True)
+        return
+
     # Get CA
     ca_info = ca_manager.get_ca(ca)
     if not ca_info:
         click.echo(t("cli.sign.error", ca=ca), err=True)
         return
 
+    if alg not in (None, "rsa") and key_size is not None:
+        click.echo(t("cli.key_size_ignored", alg=alg), err=True)
+
     # Load template if provided
     if template:
         template_data = template_manager.load_template(template)
@@ -150,6 +238,73 @@ def sign(ctx, ca, name, type, cn, dns, ip, org, country, state, city, validity,
         validity = template_data.get("default_validity_days", validity)
         key_size = template_data.get("default_key_size", key_size)
 
+    if batch_file:
+        try:
+            with open(batch_file, encoding="utf-8") as f:
+                entries = json.load(f)
+            if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+                raise ValueError("expected a JSON list of objects")
+        except (OSError, ValueError) as e:
+            click.echo(t("cli.sign.error_batch_file", error=str(e)), err=True)
+            return
+
+        # Command-line options act as defaults for every entry
+        defaults = {
+            "cert_type": type,
+            "organization": org,
+            "country": country,
+            "state": state,
+            "city": city,
+            "validity_days": validity,
+        }
+        # Left out unless given, so an entry's own key_size can still imply RSA
+        if alg is not None:
+            defaults["key_algorithm"] = alg
+        if key_size is not None:
+            defaults["key_size"] = key_size
+        specs = []
+        for entry in entries:
+            spec = {**defaults, **entry}
+            spec["key_algorithm"], spec["key_size"] = _key_options(
+                spec.get("key_algorithm"), spec.get("key_size")
+            )
+            specs.append(spec)
+        try:
+            results = cert_manager.sign_certificates_batch(
+                ca_key=ca_info["key"],
+                ca_cert=ca_info["cert"],
+                ca_name=ca_info["name"],
+                specs=specs,
+            )
+        except Exception as e:
+            click.echo(t("cli.sign.error_failed", error=str(e)), err=True)
+            sys.exit(1)
+
+        base_dir = ctx.obj["base_dir"]
+        resolved_base = ctx.obj["resolved_base"]
+        signed = [result for result in results if "error" not in result]
+        failed = [result for result in results if "error" in result]
+        if signed:
+            click.echo(t("cli.sign.batch_success", count=len(signed)))
+            for result in signed:
+                click.echo(
+                    t(
+                        "cli.sign.batch_item",
+                        name=result["cert_name"],
+                        path=_format_path(result["cert"], base_dir, resolved_base),
+                    )
+                )
+        if failed:
+            click.echo(t("cli.sign.batch_failed", count=len(failed)), err=True)
+            for result in failed:
+                click.echo(
+                    t("cli.sign.batch_item", name=result["cert_name"], path=result["error"]),
+                    err=True,
+                )
+            sys.exit(1)
+        return
+
+    alg, key_size = _key_options(alg, key_size)
     try:
         result = cert_manager.sign_certificate(
             ca_key=ca_info["key"],
@@ -166,11 +321,17 @@ def sign(ctx, ca, name, type, cn, dns, ip, org, country, state, city, validity,
             city=city,
             validity_days=validity,
             key_size=key_size,
+            key_algorithm=alg,
         )
         base_dir = ctx.obj["base_dir"]
+        resolved_base = ctx.obj["resolved_base"]
         click.echo(t("cli.sign.success"))
-        click.echo(t("cli.create_ca.key", path=_format_path(result["key"], base_dir)))
-        click.echo(t("cli.create_ca.cert", path=_format_path(result["cert"], base_dir)))
+        click.echo(
+            t("cli.create_ca.key", path=_format_path(result["key"], base_dir, resolved_base))
+        )
+        click.echo(
+            t("cli.create_ca.cert", path=_format_path(result["cert"], base_dir, resolved_base))
+        )
     except Exception as e:
         click.echo(t("cli.sign.error_failed", error=str(e)), err=True)
 
@@ -187,11 +348,12 @@ def list_cas(ctx):
         return
 
     base_dir = ctx.obj["base_dir"]
+    resolved_base = ctx.obj["resolved_base"]
     click.echo(f"\n{t('cli.list_cas.title')}")
     for i, ca in enumerate(cas):
         click.echo(f"  {i}. 🔑 {ca['name']}")
-        click.echo(f"     Key: {_format_path(ca['key'], base_dir)}")
-        click.echo(f"     Cert: {_format_path(ca['cert'], base_dir)}")
+        click.echo(f"     Key: {_format_path(ca['key'], base_dir, resolved_base)}")
+        click.echo(f"     Cert: {_format_path(ca['cert'], base_dir, resolved_base)}")
 
 
 @cli.command()
@@ -215,11 +377,12 @@ def list_certs(ctx, ca):
             return
 
         base_dir = ctx.obj["base_dir"]
+        resolved_base = ctx.obj["resolved_base"]
         click.echo(f"\n{t('cli.list_certs.title', ca=ca)}")
         for cert in certs:
             click.echo(f"  📜 {cert['name']}")
-            click.echo(f"     Key: {_format_path(cert['key'], base_dir)}")
-            click.echo(f"     Cert: {_format_path(cert['cert'], base_dir)}")
+            click.echo(f"     Key: {_format_path(cert['key'], base_dir, resolved_base)}")
+            click.echo(f"     Cert: {_format_path(cert['cert'], base_dir, resolved_base)}")
     else:
         # List all certificates
         certs = cert_manager.list_certificates()
@@ -228,12 +391,13 @@ def list_certs(ctx, ca):
             return
 
         base_dir = ctx.obj["base_dir"]
+        resolved_base = ctx.obj["resolved_base"]
         click.echo(f"\n{t('cli.list_certs.title_all')}")
         for cert in certs:
             ca_name = cert.get("ca_name", t("cli.list_certs.ca_unknown"))
             click.echo(f"  📜 {cert['name']} (CA: {ca_name})")
-            click.echo(f"     Key: {_format_path(cert['key'], base_dir)}")
-            click.echo(f"     Cert: {_format_path(cert['cert'], base_dir)}")
+            click.echo(f"     Key: {_format_path(cert['key'], base_dir, resolved_base)}")
+            click.echo(f"     Cert: {_format_path(cert['cert'], base_dir, resolved_base)}")
 
 
 @cli.command()
@@ -249,8 +413,9 @@ def create_template(ctx, name, org, country, state, city, validity, key_size):
     """Create a template file"""
     template_manager = ctx.obj["template_manager"]
     base_dir = ctx.obj["base_dir"]
+    resolved_base = ctx.obj["resolved_base"]
     path = template_manager.create_template(name, org, country, state, city, validity, key_size)
-    click.echo(t("cli.create_template.success", path=_format_path(path, base_dir)))
+    click.echo(t("cli.create_template.success", path=_format_path(path, base_dir, resolved_base)))
 
 
 @cli.command()
@@ -340,7 +505,7 @@ def ui(ctx, lang):
         set_language("en")
 
     # Check system requirements
-    if not check_system_requirements():
+    if not _cached_system_check():
         click.echo(f"\n{t('main.error.system_check')}", err=True)
         click.echo(t("main.error.system_check_hint"), err=True)
         sys.exit(1)
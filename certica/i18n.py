@@ -4,8 +4,9 @@ Supports multiple languages with fallback to English
 """
 
 import json
+import string
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 # Supported languages
 SUPPORTED_LANGUAGES = {
@@ -22,8 +23,26 @@ DEFAULT_LANGUAGE = "en"
 
 # Current language
 _current_language = DEFAULT_LANGUAGE
+# Locale files are loaded on first use
 _translations: Dict[str, Dict[str, str]] = {}
 
+_formatter = string.Formatter()
+
+# (lang, key) -> (template, needs_format), or None if the key is not translated
+_resolve_cache: Dict[Tuple[str, str], Optional[Tuple[str, bool]]] = {}
+
+
+def _flatten(data: Dict, prefix: str = "") -> Dict[str, str]:
+    """Flatten nested translation dicts into dotted keys"""
+    flat = {}
+    for key, value in data.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{dotted}."))
+        else:
+            flat[dotted] = value
+    return flat
+
 
 def _load_translations(lang: str) -> Dict[str, str]:
     """Load translations for a specific language"""
@@ -35,13 +54,22 @@ def _load_translations(lang: str) -> Dict[str, str]:
     if lang_file.exists():
         try:
             with open(lang_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                return _flatten(json.load(f))
         except Exception:
             pass
 
     return {}
 
 
+def _get_translations(lang: str) -> Dict[str, str]:
+    """Get translations for a language, loading them on first use"""
+    try:
+        return _translations[lang]
+    except KeyError:
+        translations = _translations[lang] = _load_translations(lang)
+        return translations
+
+
 def set_language(lang: str) -> bool:
     """
     Set the current language
@@ -50,9 +78,9 @@ def set_language(lang: str) -> bool:
         lang: Language code (e.g., 'en', 'zh', 'fr')
 
     Returns:
-        True if language is supported and loaded, False otherwise
+        True if language is supported, False otherwise
     """
-    global _current_language, _translations  # noqa: F824
+    global _current_language
 
     # Normalize language code (e.g., 'zh-CN' -> 'zh')
     lang = lang.lower().split("-")[0]
@@ -61,12 +89,7 @@ def set_language(lang: str) -> bool:
         return False
 
     _current_language = lang
-    _translations[lang] = _load_translations(lang)
-
-    # Always load English as fallback
-    if lang != DEFAULT_LANGUAGE:
-        _translations[DEFAULT_LANGUAGE] = _load_translations(DEFAULT_LANGUAGE)
-
+    _resolve_cache.clear()
     return True
 
 
@@ -86,34 +109,55 @@ def t(key: str, **kwargs) -> str:
     Returns:
         Translated string, or key if translation not found
     """
-    # Try current language first
-    if _current_language in _translations:
-        translation = _translations[_current_language].get(key)
-        if translation:
-            try:
-                return translation.format(**kwargs) if kwargs else translation
-            except Exception:
-                return translation
-
-    # Fallback to English
-    if DEFAULT_LANGUAGE in _translations:
-        translation = _translations[DEFAULT_LANGUAGE].get(key)
-        if translation:
+    cache_key = (_current_language, key)
+    try:
+        resolved = _resolve_cache[cache_key]
+    except KeyError:
+        resolved = _resolve_cache[cache_key] = _resolve(key)
+
+    if resolved is not None:
+        translation, needs_format = resolved
+        if kwargs and needs_format:
             try:
-                return translation.format(**kwargs) if kwargs else translation
+                return translation.format_map(kwargs)
             except Exception:
                 return translation
+        return translation
 
-    # If still not found, return key (or formatted key if kwargs provided)
+    # If not found, return key (or formatted key if kwargs provided)
     if kwargs:
         try:
-            return key.format(**kwargs)
+            return key.format_map(kwargs)
         except Exception:
             return key
 
     return key
 
 
+def _resolve(key: str) -> Optional[Tuple[str, bool]]:
+    """Look up a key in the current language, falling back to English"""
+    for lang in (_current_language, DEFAULT_LANGUAGE):
+        # English is only loaded once a key is missing from the current language
+        translation = _get_translations(lang).get(key)
+        if translation:
+            return translation, _needs_format(translation)
+    return None
+
+
+def _needs_format(template: str) -> bool:
+    """Check whether a template has replacement fields or escaped braces"""
+    if "{" not in template and "}" not in template:
+        return False
+    try:
+        parsed = list(_formatter.parse(template))
+    except ValueError:
+        # Malformed; let str.format raise so the raw template is returned
+        return True
+    return (
+        any(field is not None for _, field, _, _ in parsed) or "{{" in template or "}}" in template
+    )
+
+
 def get_supported_languages() -> Dict[str, str]:
     """Get dictionary of supported language codes and names"""
     return SUPPORTED_LANGUAGES.copy()
@@ -0,0 +1,76 @@
+"""
+Key generation - private keys for the supported algorithms, and a pool of
+RSA keys generated ahead of time in a background thread
+"""
+
+import queue
+import threading
+from typing import Optional
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+# Supported key algorithms; key_size only applies to "rsa"
+KEY_ALGORITHMS = ("rsa", "ecdsa-p256", "ed25519")
+
+
+class KeyPool:
+    """Bounded pool of pre-generated RSA keys, filled by a daemon thread"""
+
+    def __init__(self, size: int = 4, key_size: int = 2048):
+        self.key_size = key_size
+        self._queue: queue.Queue[rsa.RSAPrivateKey] = queue.Queue(maxsize=size)
+        self._thread = threading.Thread(target=self._worker, name="certica-key-pool", daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        """Keep the pool topped up; put() blocks while it is full"""
+        while True:
+            key = rsa.generate_private_key(public_exponent=65537, key_size=self.key_size)
+            self._queue.put(key)
+
+    def get(self, key_size: int) -> rsa.RSAPrivateKey:
+        """
+        Take a key of the given size
+
+        Falls back to generating one inline if the size differs from the pool's
+        or no key is ready yet.
+        """
+        if key_size == self.key_size:
+            try:
+                return self._queue.get_nowait()
+            except queue.Empty:
+                pass
+        return rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+
+
+def generate_private_key(
+    key_algorithm: str = "rsa", key_size: int = 2048, key_pool: Optional[KeyPool] = None
+):
+    """
+    Generate a private key
+
+    Args:
+        key_algorithm: One of KEY_ALGORITHMS
+        key_size: RSA key size in bits (ignored for other algorithms)
+        key_pool: Optional pool to take pre-generated RSA keys from
+
+    Raises:
+        ValueError: If the algorithm is not supported
+    """
+    if key_algorithm == "rsa":
+        if key_pool is not None:
+            return key_pool.get(key_size)
+        return rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    if key_algorithm == "ecdsa-p256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if key_algorithm == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported key algorithm: {key_algorithm}")
+
+
+def signature_hash(private_key) -> Optional[hashes.HashAlgorithm]:
+    """Hash to sign with; Ed25519 signs without a separate digest"""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return None
+    return hashes.SHA256()
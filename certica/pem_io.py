@@ -0,0 +1,39 @@
+"""
+PEM file output helpers
+"""
+
+import os
+import tempfile
+
+
+def write_pem(path, data: bytes, mode: int):
+    """
+    Write a PEM file with its final permissions, replacing it atomically
+
+    The data goes to a new temporary file in the same directory (created
+    exclusively, owner-only) whose mode is set exactly before anything is
+    written, and which is then renamed over `path`. A private key is therefore
+    never readable by others, even when it replaces an existing world-readable
+    file, and readers never see a partially written file.
+    """
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory or ".")
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        if not hasattr(os, "fchmod"):
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
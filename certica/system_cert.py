@@ -2,14 +2,124 @@
 System Certificate Manager - Handles installation/removal of certificates from system
 """
 
+import filecmp
+import functools
 import subprocess
 import platform
+import re
+import shlex
+import shutil
 import os
 import getpass
 from pathlib import Path
-from typing import Optional, List, Tuple
+from types import MappingProxyType
+from typing import Mapping, Optional, List, Tuple
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
 from .i18n import t
 
+# (family, matching IDs, ID_LIKE substrings), checked in order
+_DISTRO_FAMILIES = (
+    ("debian", frozenset({"ubuntu", "debian"}), ("debian",)),
+    ("fedora", frozenset({"fedora", "rhel", "centos", "rocky", "almalinux"}), ("fedora", "rhel")),
+    ("arch", frozenset({"arch", "manjaro"}), ("arch",)),
+    ("suse", frozenset({"opensuse", "sles", "suse"}), ("suse",)),
+)
+
+
+# KEY=value, KEY="value" (backslash escapes allowed) or KEY='value', per os-release(5)
+_OS_RELEASE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z0-9_]+)=(?:"((?:[^"\\]|\\.)*)"|'([^']*)'|([^\s#]*))""", re.MULTILINE
+)
+_OS_RELEASE_ESCAPE_RE = re.compile(r"\\(.)")
+
+
+@functools.lru_cache(maxsize=1)
+def _read_os_release() -> Optional[Mapping[str, str]]:
+    """Parse /etc/os-release once per process"""
+    distro_info = {}
+
+    if os.path.exists("/etc/os-release"):
+        with open("/etc/os-release", "r", encoding="utf-8") as f:
+            data = f.read()
+        for key, double_quoted, single_quoted, bare in _OS_RELEASE_RE.findall(data):
+            if double_quoted:
+                distro_info[key] = _OS_RELEASE_ESCAPE_RE.sub(r"\1", double_quoted)
+            else:
+                distro_info[key] = single_quoted or bare
+
+    return MappingProxyType(distro_info) if distro_info else None
+
+
+@functools.lru_cache(maxsize=None)
+def _distro_family(distro_id: str, id_like: str) -> Optional[str]:
+    """Map os-release ID/ID_LIKE values to a known distribution family"""
+    for family, ids, like_markers in _DISTRO_FAMILIES:
+        if distro_id in ids or any(marker in id_like for marker in like_markers):
+            return family
+
+    return distro_id if distro_id else None
+
+
+# Linux trust store locations per distribution family: (cert_dir, update_cmd, name)
+_LINUX_METHODS = {
+    "debian": (("/usr/local/share/ca-certificates", ("update-ca-certificates",), "Debian/Ubuntu"),),
+    "fedora": (
+        ("/etc/pki/ca-trust/source/anchors", ("update-ca-trust", "extract"), "Fedora/RHEL/CentOS"),
+    ),
+    "arch": (
+        (
+            "/etc/ca-certificates/trust-source/anchors",
+            ("trust", "extract-compat"),
+            "Arch/Manjaro (trust)",
+        ),
+        (
+            "/usr/local/share/ca-certificates",
+            ("update-ca-certificates",),
+            "Arch/Manjaro (ca-certificates)",
+        ),
+    ),
+    "suse": (("/etc/pki/trust/anchors", ("update-ca-certificates",), "openSUSE/SLES"),),
+}
+
+# Unknown distribution - try all common locations
+_LINUX_FALLBACK_METHODS = (
+    ("/usr/local/share/ca-certificates", ("update-ca-certificates",), "Debian/Ubuntu (fallback)"),
+    ("/etc/pki/ca-trust/source/anchors", ("update-ca-trust", "extract"), "Fedora/RHEL (fallback)"),
+    ("/etc/ca-certificates/trust-source/anchors", ("trust", "extract-compat"), "Arch (fallback)"),
+    ("/etc/pki/trust/anchors", ("update-ca-certificates",), "openSUSE (fallback)"),
+)
+
+# Results of _dir_status()
+_DIR_MISSING = 0
+_DIR_PARENT_ONLY = 1
+_DIR_EXISTS = 2
+
+
+def _dir_status(path: str) -> int:
+    """Check a directory and, only if it is missing, its parent"""
+    try:
+        os.stat(path)
+        return _DIR_EXISTS
+    except OSError:
+        pass
+    try:
+        os.stat(os.path.dirname(path))
+        return _DIR_PARENT_ONLY
+    except OSError:
+        return _DIR_MISSING
+
+
+@functools.lru_cache(maxsize=1)
+def _certutil() -> str:
+    """Resolve certutil once; it is run directly, without a cmd.exe wrapper"""
+    return shutil.which("certutil") or "certutil"
+
+
+def _running_as_root() -> bool:
+    """Check whether the process already has root privileges"""
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
 
 class SystemCertManager:
     """Manages system certificate installation and removal"""
@@ -18,49 +128,24 @@ class SystemCertManager:
         self.system = platform.system()
         self.distro_info = self._detect_linux_distro() if self.system == "Linux" else None
         self.sudo_password: Optional[str] = None
+        # Set once sudo has cached our credentials, so later commands can use sudo -n
+        self._sudo_primed = False
+        # (password, error) of the last password sudo rejected; it is not sent again
+        self._sudo_rejected: Optional[Tuple[str, str]] = None
 
-    def _detect_linux_distro(self) -> Optional[dict]:
+    def _detect_linux_distro(self) -> Optional[Mapping[str, str]]:
         """Detect Linux distribution from /etc/os-release"""
-        distro_info = {}
-
-        if os.path.exists("/etc/os-release"):
-            with open("/etc/os-release", "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        # Remove quotes
-                        value = value.strip('"').strip("'")
-                        distro_info[key] = value
-
-        return distro_info if distro_info else None
+        return _read_os_release()
 
     def _get_linux_distro_id(self) -> Optional[str]:
         """Get Linux distribution ID"""
         if not self.distro_info:
             return None
 
-        # Check ID first (e.g., ubuntu, debian, fedora, arch)
-        distro_id = self.distro_info.get("ID", "").lower()
-
-        # Check ID_LIKE for similar distributions
-        id_like = self.distro_info.get("ID_LIKE", "").lower()
-
-        # Map to known distributions
-        if distro_id in ["ubuntu", "debian"] or "debian" in id_like:
-            return "debian"
-        elif (
-            distro_id in ["fedora", "rhel", "centos", "rocky", "almalinux"]
-            or "fedora" in id_like
-            or "rhel" in id_like
-        ):
-            return "fedora"
-        elif distro_id in ["arch", "manjaro"] or "arch" in id_like:
-            return "arch"
-        elif distro_id in ["opensuse", "sles", "suse"] or "suse" in id_like:
-            return "suse"
-
-        return distro_id if distro_id else None
+        # Check ID first (e.g., ubuntu, debian, fedora, arch), then ID_LIKE
+        return _distro_family(
+            self.distro_info.get("ID", "").lower(), self.distro_info.get("ID_LIKE", "").lower()
+        )
 
     def _get_sudo_password(self, prompt: str = None) -> Optional[str]:
         """Get sudo password from user"""
@@ -85,33 +170,62 @@ class SystemCertManager:
         Returns:
             (success, error_message)
         """
+        # Callers only need the exit status and error text, so stdout is discarded
         if password:
-            # Use sudo -S to read password from stdin
             try:
-                process = subprocess.Popen(
-                    ["sudo", "-S"] + command,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
+                # Authenticate once, then reuse sudo's cached credentials. A rejected
+                # password is not retried, by this call or by later ones (e.g. the next
+                # install method): each retry would count towards a pam_faillock lockout
+                if not self._sudo_primed:
+                    if self._sudo_rejected and self._sudo_rejected[0] == password:
+                        return False, self._sudo_rejected[1]
+                    result = subprocess.run(
+                        ["sudo", "-S", "-v"],
+                        input=password + "\n",
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                    )
+                    if result.returncode != 0:
+                        self._sudo_rejected = (password, self._sudo_error(result))
+                        return False, self._sudo_rejected[1]
+                    self._sudo_primed = True
+                    self._sudo_rejected = None
+
+                result = subprocess.run(
+                    ["sudo", "-n"] + command,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                     text=True,
                 )
-                stdout, stderr = process.communicate(input=password + "\n")
-
-                if process.returncode == 0:
-                    return True, ""
-                else:
-                    error_msg = (
-                        stderr.strip()
-                        if stderr
-                        else f"Command failed with return code {process.returncode}"
+                if result.returncode != 0 and not self._sudo_credentials_cached():
+                    # Cached credentials expired, or sudo does not cache them; the
+                    # command never ran, so run it once with the password instead
+                    self._sudo_primed = False
+                    result = subprocess.run(
+                        ["sudo", "-S"] + command,
+                        input=password + "\n",
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        text=True,
                     )
-                    return False, error_msg
+                if result.returncode == 0:
+                    return True, ""
+                return False, self._sudo_error(result)
             except Exception as e:
                 return False, str(e)
         else:
             # Try without password (might work if user has passwordless sudo)
             try:
-                subprocess.run(["sudo"] + command, check=True, capture_output=True, text=True)
+                subprocess.run(
+                    ["sudo"] + command,
+                    check=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
                 return True, ""
             except subprocess.CalledProcessError as e:
                 error_msg = e.stderr.strip() if e.stderr else str(e)
@@ -119,25 +233,45 @@ class SystemCertManager:
             except Exception as e:
                 return False, str(e)
 
+    def _sudo_credentials_cached(self) -> bool:
+        """Check whether sudo would run a command now without asking for a password"""
+        # Exit status rather than the (localized) message tells the cases apart
+        result = subprocess.run(
+            ["sudo", "-n", "true"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return result.returncode == 0
+
+    def _sudo_error(self, result: subprocess.CompletedProcess) -> str:
+        """Error text for a failed sudo run"""
+        if result.stderr:
+            return result.stderr.strip()
+        return f"Command failed with return code {result.returncode}"
+
+    def _load_certificate(self, cert_path: str) -> x509.Certificate:
+        """Load a PEM certificate from disk"""
+        with open(cert_path, "rb") as f:
+            return x509.load_pem_x509_certificate(f.read())
+
+    def _fingerprint(self, cert: x509.Certificate) -> str:
+        """SHA256 fingerprint as uppercase hex without separators"""
+        return cert.fingerprint(hashes.SHA256()).hex().upper()
+
     def _get_certificate_fingerprint(self, cert_path: str) -> Optional[str]:
         """Get SHA256 fingerprint of a certificate"""
         try:
-            result = subprocess.run(
-                ["openssl", "x509", "-in", cert_path, "-fingerprint", "-noout", "-sha256"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            # Extract fingerprint from output like "SHA256 Fingerprint=AA:BB:CC:..."
-            fingerprint_line = result.stdout.strip()
-            if "=" in fingerprint_line:
-                return fingerprint_line.split("=", 1)[1].replace(":", "").upper()
-            return None
+            return self._fingerprint(self._load_certificate(cert_path))
         except Exception:
             return None
 
     def _verify_installation(
-        self, source_cert_path: str, installed_cert_path: str, ca_name: str
+        self,
+        source_cert_path: str,
+        installed_cert_path: str,
+        ca_name: str,
+        copy_verified: bool = False,
     ) -> bool:
         """
         Verify that certificate was installed correctly
@@ -146,6 +280,8 @@ class SystemCertManager:
             source_cert_path: Original certificate path
             installed_cert_path: Installed certificate path
             ca_name: CA name
+            copy_verified: The installed file was just copied from the source,
+                so the fingerprint comparison can be skipped
 
         Returns:
             True if verification passes, False otherwise
@@ -157,11 +293,27 @@ class SystemCertManager:
             print(t("system.verify.file_not_exists", path=installed_cert_path))
             return False
 
-        # 2. Compare fingerprints
-        source_fp = self._get_certificate_fingerprint(source_cert_path)
-        installed_fp = self._get_certificate_fingerprint(installed_cert_path)
+        # Parse the installed certificate once for both remaining checks
+        installed_cert = None
+        load_error = None
+        try:
+            installed_cert = self._load_certificate(installed_cert_path)
+        except Exception as e:
+            load_error = e
+
+        # 2. Compare fingerprints (a byte-identical copy needs no second parse)
+        installed_fp = self._fingerprint(installed_cert) if installed_cert is not None else None
+        if installed_fp and copy_verified:
+            source_fp = None
+        elif installed_fp and filecmp.cmp(source_cert_path, installed_cert_path, shallow=False):
+            source_fp = installed_fp
+        else:
+            source_fp = self._get_certificate_fingerprint(source_cert_path)
 
-        if not source_fp or not installed_fp:
+        if installed_fp and copy_verified:
+            # Nothing was compared; the caller copied the file from the source itself
+            print(t("system.verify.fingerprint_copied", fp=installed_fp[:16]))
+        elif not source_fp or not installed_fp:
             print(t("system.verify.fingerprint_skip"))
             # Continue with other checks
         elif source_fp != installed_fp:
@@ -172,17 +324,11 @@ class SystemCertManager:
         else:
             print(t("system.verify.fingerprint_match", fp=source_fp[:16]))
 
-        # 3. Try to verify certificate is readable
-        try:
-            result = subprocess.run(
-                ["openssl", "x509", "-in", installed_cert_path, "-noout", "-subject"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            print(t("system.verify.cert_readable", subject=result.stdout.strip()))
-        except Exception as e:
-            print(t("system.verify.cert_readable_error", error=str(e)))
+        # 3. Check the certificate is readable
+        if installed_cert is not None:
+            print(t("system.verify.cert_readable", subject=installed_cert.subject.rfc4514_string()))
+        else:
+            print(t("system.verify.cert_readable_error", error=str(load_error)))
             # Don't fail verification for this
 
         return True
@@ -202,34 +348,11 @@ class SystemCertManager:
         distro_id = self._get_linux_distro_id()
 
         # Check all possible certificate locations
-        check_paths = []
-
-        if distro_id == "debian":
-            check_paths.append(Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"))
-        elif distro_id == "fedora":
-            check_paths.append(Path(f"/etc/pki/ca-trust/source/anchors/{ca_name}.crt"))
-        elif distro_id == "arch":
-            check_paths.extend(
-                [
-                    Path(f"/etc/ca-certificates/trust-source/anchors/{ca_name}.crt"),
-                    Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"),
-                ]
-            )
-        elif distro_id == "suse":
-            check_paths.append(Path(f"/etc/pki/trust/anchors/{ca_name}.crt"))
-        else:
-            # Check all common paths
-            check_paths.extend(
-                [
-                    Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"),
-                    Path(f"/etc/pki/ca-trust/source/anchors/{ca_name}.crt"),
-                    Path(f"/etc/ca-certificates/trust-source/anchors/{ca_name}.crt"),
-                    Path(f"/etc/pki/trust/anchors/{ca_name}.crt"),
-                ]
-            )
+        methods = _LINUX_METHODS.get(distro_id, _LINUX_FALLBACK_METHODS)
+        check_paths = [cert_dir + "/" + ca_name + ".crt" for cert_dir, _, _ in methods]
 
         # Check if any certificate file still exists
-        found_paths = [p for p in check_paths if p.exists()]
+        found_paths = [p for p in check_paths if os.path.exists(p)]
 
         if found_paths:
             print(t("system.verify.removal_failed"))
@@ -240,6 +363,15 @@ class SystemCertManager:
         print(t("system.verify.removal_success"))
         return True
 
+    def needs_password(self) -> bool:
+        """Check whether installing or removing a CA would need a sudo password"""
+        if self.system not in ("Linux", "Darwin") or _running_as_root():
+            return False
+        try:
+            return not self._sudo_credentials_cached()
+        except OSError:
+            return True
+
     def install_ca_cert(
         self, ca_cert_path: str, ca_name: str, password: Optional[str] = None
     ) -> bool:
@@ -299,137 +431,76 @@ class SystemCertManager:
         """Install certificate on Linux - supports multiple distributions"""
         distro_id = self._get_linux_distro_id()
 
+        # Already root (e.g. in a container): copy in-process and skip sudo entirely
+        as_root = _running_as_root()
+
         # Try to get password if not provided
-        if password is None:
+        if password is None and not as_root:
             password = self._get_sudo_password()
             if password is None:
                 print(t("system.install.linux.password_required"))
                 return False
 
-        # Define installation methods for different distributions
-        install_methods = []
-
-        if distro_id == "debian":
-            # Debian/Ubuntu
-            install_methods.append(
-                {
-                    "cert_dir": Path("/usr/local/share/ca-certificates"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "Debian/Ubuntu",
-                }
-            )
-        elif distro_id == "fedora":
-            # Fedora/RHEL/CentOS
-            install_methods.append(
-                {
-                    "cert_dir": Path("/etc/pki/ca-trust/source/anchors"),
-                    "update_cmd": ["update-ca-trust", "extract"],
-                    "name": "Fedora/RHEL/CentOS",
-                }
-            )
-        elif distro_id == "arch":
-            # Arch/Manjaro - try both methods
-            install_methods.append(
-                {
-                    "cert_dir": Path("/etc/ca-certificates/trust-source/anchors"),
-                    "update_cmd": ["trust", "extract-compat"],
-                    "name": "Arch/Manjaro (trust)",
-                }
-            )
-            install_methods.append(
-                {
-                    "cert_dir": Path("/usr/local/share/ca-certificates"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "Arch/Manjaro (ca-certificates)",
-                }
-            )
-        elif distro_id == "suse":
-            # openSUSE/SLES
-            install_methods.append(
-                {
-                    "cert_dir": Path("/etc/pki/trust/anchors"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "openSUSE/SLES",
-                }
-            )
-        else:
-            # Unknown distribution - try common methods
-            install_methods.extend(
-                [
-                    {
-                        "cert_dir": Path("/usr/local/share/ca-certificates"),
-                        "update_cmd": ["update-ca-certificates"],
-                        "name": "Debian/Ubuntu (fallback)",
-                    },
-                    {
-                        "cert_dir": Path("/etc/pki/ca-trust/source/anchors"),
-                        "update_cmd": ["update-ca-trust", "extract"],
-                        "name": "Fedora/RHEL (fallback)",
-                    },
-                    {
-                        "cert_dir": Path("/etc/ca-certificates/trust-source/anchors"),
-                        "update_cmd": ["trust", "extract-compat"],
-                        "name": "Arch (fallback)",
-                    },
-                    {
-                        "cert_dir": Path("/etc/pki/trust/anchors"),
-                        "update_cmd": ["update-ca-certificates"],
-                        "name": "openSUSE (fallback)",
-                    },
-                ]
-            )
-
-        # Try each installation method
-        for method in install_methods:
-            cert_dir = method["cert_dir"]
-            update_cmd = method["update_cmd"]
-            method_name = method["name"]
-
-            # Check if parent directory exists
-            if not cert_dir.parent.exists():
+        # Try each installation method for this distribution
+        for cert_dir, update_cmd, method_name in _LINUX_METHODS.get(
+            distro_id, _LINUX_FALLBACK_METHODS
+        ):
+            # Check if the directory or at least its parent exists
+            dir_status = _dir_status(cert_dir)
+            if dir_status == _DIR_MISSING:
                 continue
 
-            target_path = cert_dir / f"{ca_name}.crt"
+            target_path = cert_dir + "/" + ca_name + ".crt"
 
-            try:
-                # Create directory if it doesn't exist
-                if not cert_dir.exists():
-                    success, error = self._run_sudo_command(
-                        ["mkdir", "-p", str(cert_dir)], password
-                    )
-                    if not success:
-                        continue
-
-                    # Set proper permissions
-                    self._run_sudo_command(["chmod", "755", str(cert_dir)], password)
+            quoted_dir = shlex.quote(cert_dir)
+            quoted_target = shlex.quote(target_path)
 
-                # Copy certificate
-                success, error = self._run_sudo_command(
-                    ["cp", ca_cert_path, str(target_path)], password
+            try:
+                # Create the directory if needed and copy the certificate in one sudo call;
+                # chmod failures are not fatal
+                copy_script = ""
+                if dir_status == _DIR_PARENT_ONLY:
+                    copy_script += f"mkdir -p {quoted_dir} || exit 1; chmod 755 {quoted_dir}; "
+                copy_script += (
+                    f"cp {shlex.quote(ca_cert_path)} {quoted_target} || exit 1; "
+                    f"chmod 644 {quoted_target}; exit 0"
                 )
+                if as_root:
+                    success, error = self._copy_certificate_as_root(
+                        ca_cert_path, cert_dir, target_path
+                    )
+                else:
+                    success, error = self._run_sudo_command(["sh", "-c", copy_script], password)
                 if not success:
                     print(t("system.install.linux.copy_failed", method=method_name, error=error))
                     continue
 
-                # Set proper permissions
-                self._run_sudo_command(["chmod", "644", str(target_path)], password)
-
-                # Update CA certificates
-                success, error = self._run_sudo_command(update_cmd, password)
+                # Update CA certificates, removing the copied file if that fails
+                update_script = (
+                    f"{shlex.join(update_cmd)} || {{ rc=$?; rm -f {quoted_target}; exit $rc; }}"
+                )
+                if as_root:
+                    success, error = self._update_trust_store_as_root(update_cmd, target_path)
+                else:
+                    success, error = self._run_sudo_command(["sh", "-c", update_script], password)
                 if not success:
                     print(t("system.install.linux.update_failed", method=method_name, error=error))
-                    # Remove the copied file
-                    self._run_sudo_command(["rm", str(target_path)], password)
                     continue
 
                 # Verify installation
-                if self._verify_installation(ca_cert_path, target_path, ca_name):
+                # The copy step succeeded, so the installed file matches the source
+                if self._verify_installation(
+                    ca_cert_path, target_path, ca_name, copy_verified=True
+                ):
                     print(t("system.install.linux.success", method=method_name))
                     return True
                 else:
                     print(t("system.install.linux.verification_failed", method=method_name))
                     # Verification failed - clean up the installed file and return False
-                    self._run_sudo_command(["rm", str(target_path)], password)
+                    if as_root:
+                        os.remove(target_path)
+                    else:
+                        self._run_sudo_command(["rm", target_path], password)
                     return False
 
             except Exception as e:
@@ -439,105 +510,90 @@ class SystemCertManager:
         print(t("system.install.linux.no_method"))
         return False
 
+    def _copy_certificate_as_root(
+        self, ca_cert_path: str, cert_dir: str, target_path: str
+    ) -> Tuple[bool, str]:
+        """Copy a certificate into a trust store directory without sudo"""
+        try:
+            if not os.path.isdir(cert_dir):
+                os.makedirs(cert_dir, exist_ok=True)
+                os.chmod(cert_dir, 0o755)
+            shutil.copyfile(ca_cert_path, target_path)
+            os.chmod(target_path, 0o644)
+            return True, ""
+        except OSError as e:
+            return False, str(e)
+
+    def _update_trust_store_as_root(
+        self, update_cmd: Tuple[str, ...], target_path: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        """Run the trust store update without sudo, removing target_path (if given) on failure"""
+        try:
+            result = subprocess.run(
+                list(update_cmd),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if result.returncode == 0:
+                return True, ""
+            error = (
+                result.stderr.strip()
+                if result.stderr
+                else f"Command failed with return code {result.returncode}"
+            )
+        except OSError as e:
+            error = str(e)
+
+        if target_path is not None:
+            try:
+                os.remove(target_path)
+            except OSError:
+                pass
+        return False, error
+
     def _remove_linux(self, ca_name: str, password: Optional[str] = None) -> bool:
         """Remove certificate from Linux - supports multiple distributions"""
         distro_id = self._get_linux_distro_id()
 
+        # Already root (e.g. in a container): remove in-process and skip sudo entirely
+        as_root = _running_as_root()
+
         # Try to get password if not provided
-        if password is None:
+        if password is None and not as_root:
             password = self._get_sudo_password()
             if password is None:
                 print(t("system.install.linux.password_required"))
                 return False
 
-        # Define removal methods for different distributions
-        remove_methods = []
-
-        if distro_id == "debian":
-            remove_methods.append(
-                {
-                    "cert_path": Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "Debian/Ubuntu",
-                }
-            )
-        elif distro_id == "fedora":
-            remove_methods.append(
-                {
-                    "cert_path": Path(f"/etc/pki/ca-trust/source/anchors/{ca_name}.crt"),
-                    "update_cmd": ["update-ca-trust", "extract"],
-                    "name": "Fedora/RHEL/CentOS",
-                }
-            )
-        elif distro_id == "arch":
-            remove_methods.append(
-                {
-                    "cert_path": Path(f"/etc/ca-certificates/trust-source/anchors/{ca_name}.crt"),
-                    "update_cmd": ["trust", "extract-compat"],
-                    "name": "Arch/Manjaro (trust)",
-                }
-            )
-            remove_methods.append(
-                {
-                    "cert_path": Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "Arch/Manjaro (ca-certificates)",
-                }
-            )
-        elif distro_id == "suse":
-            remove_methods.append(
-                {
-                    "cert_path": Path(f"/etc/pki/trust/anchors/{ca_name}.crt"),
-                    "update_cmd": ["update-ca-certificates"],
-                    "name": "openSUSE/SLES",
-                }
-            )
-        else:
-            # Unknown distribution - try all common paths
-            remove_methods.extend(
-                [
-                    {
-                        "cert_path": Path(f"/usr/local/share/ca-certificates/{ca_name}.crt"),
-                        "update_cmd": ["update-ca-certificates"],
-                        "name": "Debian/Ubuntu (fallback)",
-                    },
-                    {
-                        "cert_path": Path(f"/etc/pki/ca-trust/source/anchors/{ca_name}.crt"),
-                        "update_cmd": ["update-ca-trust", "extract"],
-                        "name": "Fedora/RHEL (fallback)",
-                    },
-                    {
-                        "cert_path": Path(
-                            f"/etc/ca-certificates/trust-source/anchors/{ca_name}.crt"
-                        ),
-                        "update_cmd": ["trust", "extract-compat"],
-                        "name": "Arch (fallback)",
-                    },
-                    {
-                        "cert_path": Path(f"/etc/pki/trust/anchors/{ca_name}.crt"),
-                        "update_cmd": ["update-ca-certificates"],
-                        "name": "openSUSE (fallback)",
-                    },
-                ]
-            )
-
-        # Try each removal method
-        for method in remove_methods:
-            cert_path = method["cert_path"]
-            update_cmd = method["update_cmd"]
-            method_name = method["name"]
+        # Try each removal method for this distribution
+        for cert_dir, update_cmd, method_name in _LINUX_METHODS.get(
+            distro_id, _LINUX_FALLBACK_METHODS
+        ):
+            cert_path = Path(cert_dir + "/" + ca_name + ".crt")
 
             if not cert_path.exists():
                 continue
 
             try:
                 # Remove certificate
-                success, error = self._run_sudo_command(["rm", str(cert_path)], password)
+                if as_root:
+                    try:
+                        os.remove(cert_path)
+                        success = True
+                    except OSError:
+                        success = False
+                else:
+                    success, error = self._run_sudo_command(["rm", str(cert_path)], password)
                 if not success:
                     continue
 
                 # Update CA certificates
-                success, error = self._run_sudo_command(update_cmd, password)
+                if as_root:
+                    success, error = self._update_trust_store_as_root(update_cmd)
+                else:
+                    success, error = self._run_sudo_command(list(update_cmd), password)
                 if not success:
                     print(t("system.remove.linux.update_failed", method=method_name, error=error))
                     continue
@@ -640,27 +696,39 @@ class SystemCertManager:
         try:
             # Use certutil to add certificate to LocalMachine\Root store
             subprocess.run(
-                ["certutil", "-addstore", "-f", "Root", ca_cert_path],
+                [_certutil(), "-addstore", "-f", "Root", ca_cert_path],
                 check=True,
                 capture_output=True,
-                shell=True,
             )
             return True
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr.decode() if e.stderr else str(e)
             print(t("system.install.windows.error", error=error_msg))
             return False
+        except OSError as e:
+            print(t("system.install.windows.error", error=str(e)))
+            return False
 
     def _remove_windows(self, ca_name: str) -> bool:
         """Remove certificate from Windows"""
         try:
             # Use certutil to remove certificate
             subprocess.run(
-                ["certutil", "-delstore", "Root", ca_name],
+                [_certutil(), "-delstore", "Root", ca_name],
                 check=True,
                 capture_output=True,
-                shell=True,
             )
             return True
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, OSError):
             return False
+
+
+_manager_singleton: Optional[SystemCertManager] = None
+
+
+def get_manager() -> SystemCertManager:
+    """Get a shared SystemCertManager, creating it on first use"""
+    global _manager_singleton
+    if _manager_singleton is None:
+        _manager_singleton = SystemCertManager()
+    return _manager_singleton
@@ -3,86 +3,117 @@ System tools and dependencies checker
 Checks if required system tools and console commands are available
 """
 
+import functools
+import json
+import os
 import shutil
 import subprocess
 import sys
 import platform
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Optional
 from .i18n import t
 
+# Seconds to wait for a tool's test command
+_CHECK_TIMEOUT = 2
+
+
+@functools.lru_cache(maxsize=256)
+def _which_cached(command_name: str) -> Optional[str]:
+    """shutil.which, memoized for the life of the process"""
+    return shutil.which(command_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_tools_table(system: str) -> Mapping[str, Dict]:
+    """Tools to check on a platform, built once per process and shared read-only"""
+    tools = {
+        "openssl": {
+            "commands": ["openssl"],
+            "test_command": ["openssl", "version"],
+            "probe": "exec",
+            "required": True,
+            "description": "OpenSSL - Required for certificate generation",
+        }
+    }
+
+    # Platform-specific optional tools
+    if system == "Linux":
+        tools.update(
+            {
+                "update-ca-certificates": {
+                    "commands": ["update-ca-certificates"],
+                    "test_command": ["update-ca-certificates", "--version"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "update-ca-certificates - For Debian/Ubuntu certificate management",
+                },
+                "update-ca-trust": {
+                    "commands": ["update-ca-trust"],
+                    "test_command": ["update-ca-trust", "extract", "--help"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "update-ca-trust - For Fedora/RHEL certificate management",
+                },
+                "trust": {
+                    "commands": ["trust"],
+                    "test_command": ["trust", "--version"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "trust - For Arch/Manjaro certificate management",
+                },
+                "sudo": {
+                    "commands": ["sudo"],
+                    "test_command": ["sudo", "--version"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "sudo - For system certificate installation (optional)",
+                },
+            }
+        )
+    elif system == "Darwin":  # macOS
+        tools.update(
+            {
+                "security": {
+                    "commands": ["security"],
+                    "test_command": ["security", "--version"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "security - For macOS certificate management",
+                },
+                "sudo": {
+                    "commands": ["sudo"],
+                    "test_command": ["sudo", "--version"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "sudo - For system certificate installation (optional)",
+                },
+            }
+        )
+    elif system == "Windows":
+        tools.update(
+            {
+                "certutil": {
+                    "commands": ["certutil"],
+                    "test_command": ["certutil", "-?"],
+                    "probe": "stat",
+                    "required": False,
+                    "description": "certutil - For Windows certificate management",
+                }
+            }
+        )
+
+    return MappingProxyType(tools)
+
 
 class SystemChecker:
     """Checks availability of required system tools"""
 
     def __init__(self):
         self.system = platform.system()
-        self.required_tools = {
-            "openssl": {
-                "commands": ["openssl"],
-                "test_command": ["openssl", "version"],
-                "required": True,
-                "description": "OpenSSL - Required for certificate generation",
-            }
-        }
-
-        # Platform-specific optional tools
-        if self.system == "Linux":
-            self.required_tools.update(
-                {
-                    "update-ca-certificates": {
-                        "commands": ["update-ca-certificates"],
-                        "test_command": ["update-ca-certificates", "--version"],
-                        "required": False,
-                        "description": "update-ca-certificates - For Debian/Ubuntu certificate management",
-                    },
-                    "update-ca-trust": {
-                        "commands": ["update-ca-trust"],
-                        "test_command": ["update-ca-trust", "extract", "--help"],
-                        "required": False,
-                        "description": "update-ca-trust - For Fedora/RHEL certificate management",
-                    },
-                    "trust": {
-                        "commands": ["trust"],
-                        "test_command": ["trust", "--version"],
-                        "required": False,
-                        "description": "trust - For Arch/Manjaro certificate management",
-                    },
-                    "sudo": {
-                        "commands": ["sudo"],
-                        "test_command": ["sudo", "--version"],
-                        "required": False,
-                        "description": "sudo - For system certificate installation (optional)",
-                    },
-                }
-            )
-        elif self.system == "Darwin":  # macOS
-            self.required_tools.update(
-                {
-                    "security": {
-                        "commands": ["security"],
-                        "test_command": ["security", "--version"],
-                        "required": False,
-                        "description": "security - For macOS certificate management",
-                    },
-                    "sudo": {
-                        "commands": ["sudo"],
-                        "test_command": ["sudo", "--version"],
-                        "required": False,
-                        "description": "sudo - For system certificate installation (optional)",
-                    },
-                }
-            )
-        elif self.system == "Windows":
-            self.required_tools.update(
-                {
-                    "certutil": {
-                        "commands": ["certutil"],
-                        "test_command": ["certutil", "-?"],
-                        "required": False,
-                        "description": "certutil - For Windows certificate management",
-                    }
-                }
-            )
+        self.required_tools = _build_tools_table(self.system)
 
     def check_command(self, command: List[str]) -> Tuple[bool, Optional[str]]:
         """
@@ -92,7 +123,15 @@ class SystemChecker:
             (is_available, error_message)
         """
         try:
-            subprocess.run(command, capture_output=True, text=True, timeout=5)
+            # Output is never read, so don't allocate pipes for it
+            subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=_CHECK_TIMEOUT,
+                close_fds=False,
+            )
             # Command exists if we can run it (even if it returns non-zero)
             return True, None
         except FileNotFoundError:
@@ -104,12 +143,21 @@ class SystemChecker:
 
     def find_command(self, command_name: str) -> Optional[str]:
         """Find the full path to a command"""
-        return shutil.which(command_name)
+        return _which_cached(command_name)
+
+    @classmethod
+    def invalidate_path_cache(cls):
+        """Forget cached command lookups, e.g. after PATH has changed"""
+        _which_cached.cache_clear()
 
-    def check_tool(self, tool_name: str) -> Dict:
+    def check_tool(self, tool_name: str, deep: bool = False) -> Dict:
         """
         Check if a tool is available
 
+        Args:
+            tool_name: Name of the tool in required_tools
+            deep: Also run the tool's test command instead of trusting the PATH lookup
+
         Returns:
             Dict with 'available', 'path', 'error' keys
         """
@@ -126,8 +174,16 @@ class SystemChecker:
         for cmd_name in tool_info["commands"]:
             path = self.find_command(cmd_name)
             if path:
-                # Test if command actually works
-                is_available, error = self.check_command(tool_info["test_command"])
+                # Only tools probed by "exec" need their test command run; for the
+                # rest an executable file on PATH is enough
+                if deep and tool_info.get("probe", "exec") == "exec":
+                    # Run the resolved absolute path so subprocess can use posix_spawn
+                    test_command = [path] + list(tool_info["test_command"][1:])
+                    is_available, error = self.check_command(test_command)
+                elif os.access(path, os.X_OK):
+                    is_available, error = True, None
+                else:
+                    is_available, error = False, f"Command not executable: {path}"
                 return {
                     "available": is_available,
                     "path": path,
@@ -144,12 +200,31 @@ class SystemChecker:
             "description": tool_info["description"],
         }
 
-    def check_all(self) -> Dict[str, Dict]:
-        """Check all required tools"""
-        results = {}
-        for tool_name in self.required_tools:
-            results[tool_name] = self.check_tool(tool_name)
-        return results
+    def check_all(self, deep: bool = False) -> Dict[str, Dict]:
+        """
+        Check all required tools
+
+        With deep=True, tools probed by running a command are checked
+        concurrently, since each check mostly waits on a subprocess.
+        """
+        exec_tools = []
+        if deep:
+            exec_tools = [
+                name for name, info in self.required_tools.items() if info.get("probe") != "stat"
+            ]
+
+        # A thread pool only pays off when more than one subprocess would run
+        spawned = {}
+        if len(exec_tools) > 1:
+            with ThreadPoolExecutor(max_workers=len(exec_tools)) as executor:
+                checks = executor.map(lambda name: self.check_tool(name, True), exec_tools)
+                spawned = dict(zip(exec_tools, checks))
+
+        # Keep the required_tools order in the result
+        return {
+            name: spawned[name] if name in spawned else self.check_tool(name, deep)
+            for name in self.required_tools
+        }
 
     def print_check_results(self, results: Optional[Dict[str, Dict]] = None) -> bool:
         """
@@ -162,96 +237,147 @@ class SystemChecker:
             results = self.check_all()
 
         all_required_available = True
+        # Collected and written at once rather than one print() per line
+        lines = []
 
-        print("=" * 60)
-        print(t("check.title"))
-        print("=" * 60)
-        print()
+        lines.append("=" * 60)
+        lines.append(t("check.title"))
+        lines.append("=" * 60)
+        lines.append("")
 
         # Check required tools first
         required_tools = {k: v for k, v in results.items() if v.get("required", False)}
         optional_tools = {k: v for k, v in results.items() if not v.get("required", False)}
 
         if required_tools:
-            print(t("check.required_tools"))
-            print("-" * 60)
+            lines.append(t("check.required_tools"))
+            lines.append("-" * 60)
             for tool_name, info in required_tools.items():
                 if info["available"]:
-                    print(
+                    lines.append(
                         t(
                             "check.tool_available",
                             tool_name=tool_name,
                             description=info["description"],
                         )
                     )
-                    print(t("check.tool_path", path=info["path"]))
+                    lines.append(t("check.tool_path", path=info["path"]))
                 else:
-                    print(
+                    lines.append(
                         t(
                             "check.tool_unavailable",
                             tool_name=tool_name,
                             description=info["description"],
                         )
                     )
-                    print(t("check.tool_error", error=info["error"]))
+                    lines.append(t("check.tool_error", error=info["error"]))
                     all_required_available = False
-            print()
+            lines.append("")
 
         if optional_tools:
-            print(t("check.optional_tools"))
-            print("-" * 60)
+            lines.append(t("check.optional_tools"))
+            lines.append("-" * 60)
             for tool_name, info in optional_tools.items():
                 if info["available"]:
-                    print(
+                    lines.append(
                         t(
                             "check.tool_available",
                             tool_name=tool_name,
                             description=info["description"],
                         )
                     )
-                    print(t("check.tool_path", path=info["path"]))
+                    lines.append(t("check.tool_path", path=info["path"]))
                 else:
-                    print(
+                    lines.append(
                         t(
                             "check.tool_warning",
                             tool_name=tool_name,
                             description=info["description"],
                         )
                     )
-                    print(t("check.tool_warning_msg", error=info["error"]))
-            print()
+                    lines.append(t("check.tool_warning_msg", error=info["error"]))
+            lines.append("")
 
         if all_required_available:
-            print(t("check.all_available"))
+            lines.append(t("check.all_available"))
         else:
-            print(t("check.some_missing"))
-            print()
-            print(t("check.install_hint"))
+            lines.append(t("check.some_missing"))
+            lines.append("")
+            lines.append(t("check.install_hint"))
             if self.system == "Linux":
-                print(f"\n{t('check.install_suggestions')}")
-                print(t("check.install.openssl"))
-                print(t("check.install.debian"))
-                print(t("check.install.fedora"))
-                print(t("check.install.arch"))
+                lines.append(f"\n{t('check.install_suggestions')}")
+                lines.append(t("check.install.openssl"))
+                lines.append(t("check.install.debian"))
+                lines.append(t("check.install.fedora"))
+                lines.append(t("check.install.arch"))
 
-        print("=" * 60)
-        print()
+        lines.append("=" * 60)
+        lines.append("")
 
+        sys.stdout.write("\n".join(lines) + "\n")
         return all_required_available
 
 
-def check_system_requirements() -> bool:
+def check_system_requirements(deep: bool = False) -> bool:
     """
     Convenience function to check system requirements
 
+    Args:
+        deep: Run each tool's test command instead of only looking it up on PATH
+
     Returns:
         True if all required tools are available
     """
     checker = SystemChecker()
-    results = checker.check_all()
+    results = checker.check_all(deep)
     return checker.print_check_results(results)
 
 
+def _check_cache_path() -> Path:
+    """Location of the cached system check result"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "certica" / "syscheck.json"
+
+
+def _check_cache_key() -> Optional[List]:
+    """Key identifying the current openssl binary and Python version"""
+    openssl = shutil.which("openssl")
+    if not openssl:
+        return None
+    try:
+        mtime_ns = os.stat(openssl).st_mtime_ns
+    except OSError:
+        return None
+    return [openssl, mtime_ns, list(sys.version_info[:2])]
+
+
+def is_system_check_cached() -> bool:
+    """Check whether a previous run passed the system check with the same openssl"""
+    key = _check_cache_key()
+    if key is None:
+        return False
+    try:
+        with open(_check_cache_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(data, dict) and data.get("ok") is True and data.get("key") == key
+
+
+def save_system_check():
+    """Remember a passed system check (best effort)"""
+    key = _check_cache_key()
+    if key is None:
+        return
+    path = _check_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"ok": True, "key": key}, f)
+    except OSError:
+        pass
+
+
 if __name__ == "__main__":
     # Allow running as standalone script for testing
     success = check_system_requirements()
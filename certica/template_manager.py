@@ -3,18 +3,29 @@ Template Manager - Handles template files for default values
 """
 
 import json
+import os
+import sys
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 
 
 class TemplateManager:
     """Manages template files for default certificate values"""
 
+    # Template directories already created by this process
+    _dirs_ensured: Set[Path] = set()
+
     def __init__(self, base_dir: str = "output"):
         self.base_dir = Path(base_dir).resolve()
         self.templates_dir = self.base_dir / "templates"
-        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        if self.templates_dir not in TemplateManager._dirs_ensured:
+            self.templates_dir.mkdir(parents=True, exist_ok=True)
+            TemplateManager._dirs_ensured.add(self.templates_dir)
         self.default_template = "default.json"
+        # template name -> (mtime_ns, size, parsed data)
+        self._template_cache: Dict[str, Tuple[int, int, Dict]] = {}
+        # (templates_dir mtime_ns, names) from the last list_templates() scan
+        self._list_cache: Optional[Tuple[int, List[str]]] = None
 
     def create_template(
         self,
@@ -38,8 +49,17 @@ class TemplateManager:
             "default_key_size": default_key_size,
         }
 
-        with open(template_path, "w", encoding="utf-8") as f:
+        try:
+            f = open(template_path, "w", encoding="utf-8")
+        except FileNotFoundError:
+            # The directory was removed after this process created it
+            self.templates_dir.mkdir(parents=True, exist_ok=True)
+            f = open(template_path, "w", encoding="utf-8")
+        with f:
             json.dump(template_data, f, indent=2, ensure_ascii=False)
+        # A same-size rewrite can keep its mtime on coarse-timestamp filesystems
+        self._template_cache.pop(template_name, None)
+        self._list_cache = None
 
         return str(template_path)
 
@@ -50,7 +70,9 @@ class TemplateManager:
 
         template_path = self.templates_dir / f"{template_name}.json"
 
-        if not template_path.exists():
+        try:
+            st = os.stat(template_path)
+        except FileNotFoundError:
             # Return default values if template doesn't exist
             return {
                 "organization": "Development",
@@ -61,19 +83,40 @@ class TemplateManager:
                 "default_key_size": 2048,
             }
 
+        cached = self._template_cache.get(template_name)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return dict(cached[2])
+
         with open(template_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            data = json.load(f)
+        self._template_cache[template_name] = (st.st_mtime_ns, st.st_size, data)
+        return dict(data)
 
     def list_templates(self) -> List[str]:
         """List all available templates"""
-        templates = []
-        for template_file in self.templates_dir.glob("*.json"):
-            templates.append(template_file.stem)
-        return templates
+        try:
+            mtime_ns = os.stat(self.templates_dir).st_mtime_ns
+            if self._list_cache is None or self._list_cache[0] != mtime_ns:
+                with os.scandir(self.templates_dir) as it:
+                    # Interned so rescans, choices and cache keys share one string
+                    names = [
+                        sys.intern(entry.name[:-5])
+                        for entry in it
+                        if entry.name.endswith(".json")
+                        and not entry.name.startswith(".")
+                        and entry.is_file()
+                    ]
+                self._list_cache = (mtime_ns, names)
+        except FileNotFoundError:
+            self._list_cache = None
+            return []
+        return list(self._list_cache[1])
 
     def delete_template(self, template_name: str) -> bool:
         """Delete a template file"""
         template_path = self.templates_dir / f"{template_name}.json"
+        self._template_cache.pop(template_name, None)
+        self._list_cache = None
         if template_path.exists():
             template_path.unlink()
             return True
@@ -2,39 +2,114 @@
 Interactive UI using questionary and rich libraries for terminal interface
 """
 
+import functools
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.table import Table
-from rich import box
-from typing import Dict
+from rich.text import Text
+from typing import Dict, List, Optional, Tuple
 import questionary
 from .i18n import t
 from .ca_manager import CAManager
 from .cert_manager import CertManager
+from .key_pool import KeyPool
 from .template_manager import TemplateManager
 from .system_cert import SystemCertManager
 
 
-def _format_path(path: str, base_dir: str = "output") -> str:
-    """Format path by removing base_dir prefix for display"""
+# Fixed menus as (translation key, value) pairs, turned into Choices on first use
+_MENUS = {
+    "main": (
+        ("ui.menu.exit", "0"),
+        ("ui.menu.create_ca", "1"),
+        ("ui.menu.sign_cert", "2"),
+        ("ui.menu.manage_cas", "3"),
+        ("ui.menu.manage_certs", "4"),
+        ("ui.menu.manage_templates", "5"),
+        ("ui.menu.install_cert", "6"),
+        ("ui.menu.remove_cert", "7"),
+    ),
+    "templates": (
+        ("ui.manage_templates.back", "0"),
+        ("ui.manage_templates.create", "1"),
+        ("ui.manage_templates.list", "2"),
+        ("ui.manage_templates.load", "3"),
+        ("ui.manage_templates.delete", "4"),
+    ),
+    "ca_actions": (
+        ("ui.manage_cas.action_view", "view"),
+        ("ui.manage_cas.action_delete", "delete"),
+        ("ui.manage_cas.action_back", "back"),
+    ),
+    "cert_actions": (
+        ("ui.manage_certs.action_view", "view"),
+        ("ui.manage_certs.action_delete", "delete"),
+        ("ui.manage_cas.action_back", "back"),
+    ),
+}
+
+# Label prefixes for CA and template rows
+_CA_PREFIX = "🔑 "
+_TPL_PREFIX = "📝 "
+
+
+# Subject and key fields prompted for by both CA creation and certificate signing, as
+# (parameter, label key, template key, default, type)
+_SUBJECT_FIELDS = (
+    ("organization", "ui.create_ca.organization", "organization", "Development", str),
+    ("country", "ui.create_ca.country", "country", "CN", str),
+    ("state", "ui.create_ca.state", "state", "Beijing", str),
+    ("city", "ui.create_ca.city", "city", "Beijing", str),
+    ("validity_days", "ui.create_ca.validity", "default_validity_days", 365, int),
+    ("key_size", "ui.create_ca.key_size", "default_key_size", 2048, int),
+)
+
+
+def _rounded_table(**kwargs):
+    """Create a rich Table with rounded borders (rich.table is imported on first use)"""
+    from rich import box
+    from rich.table import Table
+
+    return Table(box=box.ROUNDED, **kwargs)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_path(path: str, base_dir: str = "output", resolved_base: Optional[str] = None) -> str:
+    """
+    Format path by removing base_dir prefix for display (memoized across redraws)
+
+    resolved_base is base_dir already resolved to an absolute path; it saves
+    resolving base_dir again for every path.
+    """
     try:
         path_str = str(path)
+        if resolved_base and path_str.startswith(resolved_base + os.sep):
+            return path_str[len(resolved_base) + 1 :]
         # Remove base_dir prefix if present
         if path_str.startswith(base_dir + "/") or path_str.startswith(base_dir + "\\"):
             return path_str[len(base_dir) + 1 :]
-        # Try with resolved absolute paths
-        path_obj = Path(path).resolve()
-        base_path = Path(base_dir).resolve()
-        try:
-            if base_path in path_obj.parents or path_obj == base_path:
-                return str(path_obj.relative_to(base_path))
-        except ValueError:
-            pass
-        # If path contains base_dir as substring, try to extract relative part
-        path_parts = path_str.split(base_dir)
-        if len(path_parts) > 1:
-            remaining = path_parts[1].lstrip("/\\")
+        # Lexically normalized paths settle cases like "./output/..." without syscalls
+        norm = os.path.normpath(path_str)
+        base_norm = os.path.normpath(base_dir)
+        if norm == base_norm or norm.startswith(base_norm + os.sep):
+            return norm[len(base_norm) + 1 :] or norm
+        # Try with resolved absolute paths; for two relative paths the normalized
+        # comparison above has already answered the question
+        if os.path.isabs(path_str) or os.path.isabs(base_dir):
+            path_obj = Path(path).resolve()
+            base_path = Path(resolved_base) if resolved_base else Path(base_dir).resolve()
+            try:
+                if base_path in path_obj.parents or path_obj == base_path:
+                    return str(path_obj.relative_to(base_path))
+            except ValueError:
+                pass
+        # If path contains base_dir as substring, keep what follows its last occurrence
+        idx = path_str.rfind(base_dir) if base_dir else -1
+        if idx >= 0:
+            remaining = path_str[idx + len(base_dir) :].lstrip("/\\")
             return remaining if remaining else path_str
         return path_str
     except Exception:
@@ -47,27 +122,108 @@ class CAUITool:
 
     def __init__(self, base_dir: str = "output"):
         self.console = Console()
+        # For certificate dumps, whose text must not be turned into emoji; reuses the
+        # terminal detection already done for self.console
+        self._no_emoji_console = Console(
+            emoji=False,
+            color_system=self.console.color_system,
+            force_terminal=self.console.is_terminal,
+            legacy_windows=self.console.legacy_windows,
+        )
         self.base_dir = base_dir
-        self.ca_manager = CAManager(base_dir)
-        self.cert_manager = CertManager(base_dir)
+        # Resolved once; _format_path would otherwise resolve base_dir for every path
+        self._resolved_base = str(Path(base_dir).resolve())
+        # Generate keys for the default size while the user fills in prompts
+        key_pool = KeyPool()
+        self.ca_manager = CAManager(base_dir, key_pool=key_pool)
+        self.cert_manager = CertManager(base_dir, key_pool=key_pool)
         self.template_manager = TemplateManager(base_dir)
         self.system_cert_manager = SystemCertManager()
+        # Runs system trust store changes so the spinner keeps animating meanwhile
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
         self.template = None
+        # The caches below hold translated text for the life of the instance; the
+        # language is set before the UI is built and never changes while it runs
+        self._menu_cache: Dict[str, List[questionary.Choice]] = {}
+        # back_key -> (CA names, choices) for the CA selection menus
+        self._ca_choices_cache: Dict[
+            Optional[str], Tuple[Tuple[str, ...], List[questionary.Choice]]
+        ] = {}
+        # (template names, choices) for the template selection menus
+        self._template_choices_cache: Optional[Tuple[Tuple[str, ...], List[questionary.Choice]]] = (
+            None
+        )
+        # title -> header Panel shown by _clear_and_show_header
+        self._header_panels: Dict[str, Panel] = {}
+        self._stdin_is_tty = sys.stdin is not None and sys.stdin.isatty()
+        # Shown under every select prompt
+        self._select_instruction = t("ui.instruction.arrow_keys")
 
     def _format_path(self, path: str) -> str:
         """Format path for display"""
-        return _format_path(path, self.base_dir)
+        return _format_path(str(path), self.base_dir, self._resolved_base)
+
+    def _menu_choices(self, name: str) -> List[questionary.Choice]:
+        """Choices for one of the fixed menus, built once and reused on every redraw"""
+        choices = self._menu_cache.get(name)
+        if choices is None:
+            choices = [questionary.Choice(t(key), value=value) for key, value in _MENUS[name]]
+            self._menu_cache[name] = choices
+        return choices
+
+    def _ca_choices(
+        self, cas: List[Dict[str, str]], back_key: Optional[str] = None
+    ) -> List[questionary.Choice]:
+        """Choices for selecting a CA, reused while the list of CA names is unchanged"""
+        names = tuple(ca["name"] for ca in cas)
+        cached = self._ca_choices_cache.get(back_key)
+        if cached is not None and cached[0] == names:
+            return cached[1]
+        labels = map(_CA_PREFIX.__add__, names)
+        choices = list(map(questionary.Choice, labels, range(len(names))))
+        if back_key:
+            choices.append(questionary.Choice(t(back_key), value="back"))
+        self._ca_choices_cache[back_key] = (names, choices)
+        return choices
+
+    def _template_choices(self, templates: List[str]) -> List[questionary.Choice]:
+        """Choices for selecting a template, reused while the template names are unchanged"""
+        names = tuple(templates)
+        cached = self._template_choices_cache
+        if cached is not None and cached[0] == names:
+            return cached[1]
+        labels = map(_TPL_PREFIX.__add__, names)
+        choices = list(map(questionary.Choice, labels, range(len(names))))
+        self._template_choices_cache = (names, choices)
+        return choices
+
+    def _emit(self, *renderables):
+        """Print several renderables with a single console call"""
+        self.console.print(Group(*renderables))
+
+    def _print_cert_info(self, text: str, title: str):
+        """Print a certificate dump in a panel, taking its text literally"""
+        # Brackets in subjects are not markup, and emoji codes are not expanded
+        body = self._no_emoji_console.render_str(text, markup=False)
+        self._no_emoji_console.print(
+            Panel(body, title=Text(title, style="bold"), border_style="blue")
+        )
 
-    def _get_select_instruction(self) -> str:
-        """Get instruction text for select prompts"""
-        return t("ui.instruction.arrow_keys")
+    def _run_with_status(self, message, func, *args):
+        """Run a blocking call on the worker thread while a spinner shows message"""
+        future = self._io_pool.submit(func, *args)
+        with self.console.status(message):
+            return future.result()
 
     def _show_input_hint(self):
         """Show hint about Ctrl+C cancellation before text input"""
-        self.console.print(f"[dim]{t('ui.instruction.ctrl_c')}[/dim]\n")
+        self.console.print(Text(t("ui.instruction.ctrl_c") + "\n", style="dim"))
 
     def _safe_text_input(self, message: str, default: str = "", **kwargs):
         """Wrapper for questionary.text that handles KeyboardInterrupt"""
+        if not self._stdin_is_tty:
+            # Nobody can edit the prompt; take the default without starting prompt_toolkit
+            return default
         try:
             return questionary.text(message, default=default, **kwargs).ask()
         except KeyboardInterrupt:
@@ -90,13 +246,28 @@ class CAUITool:
             # Return None to indicate cancellation
             return None
 
-    def _clear_and_show_header(self, title: str):
-        """Clear screen and show header"""
-        self.console.clear()
-        self.console.print(
-            Panel(f"[bold green]{title}[/bold green]", border_style="green", expand=False)
-        )
-        self.console.print()
+    def _clear_and_show_header(self, title: str, *body):
+        """Clear screen and show header, followed by any body renderables in the same print"""
+        # Buffer the clear with the redraw so the terminal gets a single write and
+        # never shows the blank screen in between
+        header = self._header_panels.get(title)
+        if header is None:
+            header = Panel(Text(title, style="bold green"), border_style="green", expand=False)
+            self._header_panels[title] = header
+        with self.console:
+            self.console.clear()
+            self._emit(header, "", *body)
+
+    def _password_input(self, message: str, **kwargs):
+        """questionary.password, discarding keys typed before the prompt was shown"""
+        if self._stdin_is_tty and sys.platform != "win32":
+            import termios
+
+            try:
+                termios.tcflush(sys.stdin, termios.TCIFLUSH)
+            except (termios.error, OSError, ValueError):
+                pass
+        return questionary.password(message, **kwargs).ask()
 
     def _wait_for_continue(self, message: str = None):
         """Wait for user to continue"""
@@ -107,49 +278,32 @@ class CAUITool:
     def _show_result_panel(self, title: str, content: str, success: bool = True):
         """Show result in a panel"""
         style = "green" if success else "red"
-        self.console.print()
-        self.console.print(
+        self._emit(
+            "",
             Panel(
-                content,
-                title=f"[bold {style}]{title}[/bold {style}]",
+                Text(content),
+                title=Text(title, style=f"bold {style}"),
                 border_style=style,
                 expand=False,
-            )
+            ),
+            "",
         )
-        self.console.print()
 
     def run(self):
         """Main menu loop"""
         while True:
-            self.console.clear()
-            self.console.print(
-                Panel(
-                    f"[bold green]{t('ui.menu.title')}[/bold green]",
-                    border_style="green",
-                    expand=False,
-                )
-            )
-            self.console.print()
+            self._clear_and_show_header(t("ui.menu.title"))
 
             # 使用方向键选择菜单
             choice = self._safe_select(
                 t("ui.menu.select_operation"),
-                choices=[
-                    questionary.Choice(t("ui.menu.exit"), value="0"),
-                    questionary.Choice(t("ui.menu.create_ca"), value="1"),
-                    questionary.Choice(t("ui.menu.sign_cert"), value="2"),
-                    questionary.Choice(t("ui.menu.manage_cas"), value="3"),
-                    questionary.Choice(t("ui.menu.manage_certs"), value="4"),
-                    questionary.Choice(t("ui.menu.manage_templates"), value="5"),
-                    questionary.Choice(t("ui.menu.install_cert"), value="6"),
-                    questionary.Choice(t("ui.menu.remove_cert"), value="7"),
-                ],
+                choices=self._menu_choices("main"),
                 default="0",
-                instruction=self._get_select_instruction(),
+                instruction=self._select_instruction,
             )
 
             if not choice or choice == "0":
-                self.console.print(f"\n[green]{t('ui.goodbye')}[/green]")
+                self.console.print(Text("\n" + t("ui.goodbye"), style="green"))
                 break
             elif choice == "1":
                 self._create_root_ca()
@@ -166,6 +320,43 @@ class CAUITool:
             elif choice == "7":
                 self._remove_certificate()
 
+    def _prompt_subject_fields(self, **defaults) -> Optional[Dict]:
+        """
+        Prompt for the fields in _SUBJECT_FIELDS
+
+        Defaults come from the loaded template, then from keyword overrides, then from
+        the table. Returns None if the user cancelled or entered an invalid number.
+        """
+        raw = {}
+        for name, label_key, template_key, default, _ in _SUBJECT_FIELDS:
+            default = self.template.get(template_key, defaults.get(name, default))
+            value = self._safe_text_input(t(label_key), default=str(default))
+            if value is None:
+                return None
+            raw[name] = value
+
+        fields = {}
+        for name, label_key, _, default, convert in _SUBJECT_FIELDS:
+            value = raw[name]
+            if convert is str:
+                fields[name] = value
+                continue
+            try:
+                fields[name] = convert(value) if value else defaults.get(name, default)
+            except ValueError:
+                self._show_result_panel(
+                    t("ui.create_ca.error"),
+                    t(
+                        "ui.create_ca.error_invalid_field",
+                        field=t(label_key).rstrip(":： "),
+                        value=value,
+                    ),
+                    success=False,
+                )
+                self._wait_for_continue()
+                return None
+        return fields
+
     def _create_root_ca(self):
         """Create root CA certificate"""
         self._clear_and_show_header(t("ui.create_ca.title"))
@@ -180,73 +371,21 @@ class CAUITool:
         if not ca_name:
             return
 
-        organization = self._safe_text_input(
-            t("ui.create_ca.organization"),
-            default=self.template.get("organization", "Development CA"),
-        )
-        if organization is None:
-            return
-
-        country = self._safe_text_input(
-            t("ui.create_ca.country"), default=self.template.get("country", "CN")
-        )
-        if country is None:
-            return
-
-        state = self._safe_text_input(
-            t("ui.create_ca.state"), default=self.template.get("state", "Beijing")
-        )
-        if state is None:
-            return
-
-        city = self._safe_text_input(
-            t("ui.create_ca.city"), default=self.template.get("city", "Beijing")
-        )
-        if city is None:
-            return
-
-        validity_str = self._safe_text_input(
-            t("ui.create_ca.validity"),
-            default=str(self.template.get("default_validity_days", 3650)),
-        )
-        if validity_str is None:
-            return
-
-        key_size_str = self._safe_text_input(
-            t("ui.create_ca.key_size"), default=str(self.template.get("default_key_size", 2048))
-        )
-        if key_size_str is None:
+        fields = self._prompt_subject_fields(organization="Development CA", validity_days=3650)
+        if fields is None:
             return
 
         try:
-            validity = int(validity_str) if validity_str else 3650
-            key_size = int(key_size_str) if key_size_str else 2048
-        except ValueError:
-            self._show_result_panel(
-                t("ui.create_ca.error"), t("ui.create_ca.error_invalid"), success=False
-            )
-            self._wait_for_continue()
-            return
-
-        try:
-            self.console.print(f"\n[yellow]{t('ui.create_ca.creating')}[/yellow]")
-            result = self.ca_manager.create_root_ca(
-                ca_name=ca_name,
-                organization=organization,
-                country=country,
-                state=state,
-                city=city,
-                validity_days=validity,
-                key_size=key_size,
-            )
+            self.console.print(Text("\n" + t("ui.create_ca.creating"), style="yellow"))
+            result = self.ca_manager.create_root_ca(ca_name=ca_name, **fields)
 
             content = t(
                 "ui.create_ca.success_content",
                 ca_name=ca_name,
                 key_path=self._format_path(result["ca_key"]),
                 cert_path=self._format_path(result["ca_cert"]),
-                validity=validity,
-                key_size=key_size,
+                validity=fields["validity_days"],
+                key_size=fields["key_size"],
             )
 
             self._show_result_panel(t("ui.create_ca.success"), content, success=True)
@@ -276,19 +415,16 @@ class CAUITool:
             return
 
         # 使用方向键选择CA
-        ca_choices = [
-            questionary.Choice(f"🔑 {ca['name']}", value=str(i)) for i, ca in enumerate(cas)
-        ]
-        ca_index_str = self._safe_select(
+        ca_choices = self._ca_choices(cas)
+        ca_index = self._safe_select(
             t("ui.sign_cert.select_ca"),
             choices=ca_choices,
-            instruction=self._get_select_instruction(),
+            instruction=self._select_instruction,
         )
 
-        if ca_index_str is None:
+        if ca_index is None:
             return
 
-        ca_index = int(ca_index_str)
         if ca_index < 0 or ca_index >= len(cas):
             return
 
@@ -306,7 +442,7 @@ class CAUITool:
                 questionary.Choice(t("ui.sign_cert.cert_type_client"), value="client"),
             ],
             default="server",
-            instruction=self._get_select_instruction(),
+            instruction=self._select_instruction,
         )
 
         if cert_type is None:
@@ -333,54 +469,12 @@ class CAUITool:
             return
         ip_addresses = [ip.strip() for ip in ip_input.split(",") if ip.strip()]
 
-        organization = self._safe_text_input(
-            t("ui.create_ca.organization"), default=self.template.get("organization", "Development")
-        )
-        if organization is None:
-            return
-
-        country = self._safe_text_input(
-            t("ui.create_ca.country"), default=self.template.get("country", "CN")
-        )
-        if country is None:
-            return
-
-        state = self._safe_text_input(
-            t("ui.create_ca.state"), default=self.template.get("state", "Beijing")
-        )
-        if state is None:
-            return
-
-        city = self._safe_text_input(
-            t("ui.create_ca.city"), default=self.template.get("city", "Beijing")
-        )
-        if city is None:
-            return
-
-        validity_str = self._safe_text_input(
-            t("ui.create_ca.validity"), default=str(self.template.get("default_validity_days", 365))
-        )
-        if validity_str is None:
-            return
-
-        key_size_str = self._safe_text_input(
-            t("ui.create_ca.key_size"), default=str(self.template.get("default_key_size", 2048))
-        )
-        if key_size_str is None:
-            return
-
-        try:
-            validity = int(validity_str) if validity_str else 365
-            key_size = int(key_size_str) if key_size_str else 2048
-        except ValueError:
-            self._show_result_panel(
-                t("ui.create_ca.error"), t("ui.create_ca.error_invalid"), success=False
-            )
-            self._wait_for_continue()
+        fields = self._prompt_subject_fields()
+        if fields is None:
             return
 
         try:
-            self.console.print(f"\n[yellow]{t('ui.sign_cert.signing')}[/yellow]")
+            self.console.print(Text("\n" + t("ui.sign_cert.signing"), style="yellow"))
             result = self.cert_manager.sign_certificate(
                 ca_key=selected_ca["key"],
                 ca_cert=selected_ca["cert"],
@@ -390,12 +484,7 @@ class CAUITool:
                 common_name=common_name,
                 dns_names=dns_names,
                 ip_addresses=ip_addresses,
-                organization=organization,
-                country=country,
-                state=state,
-                city=city,
-                validity_days=validity,
-                key_size=key_size,
+                **fields,
             )
 
             dns_info = ", ".join(dns_names) if dns_names else "None"
@@ -415,7 +504,7 @@ class CAUITool:
                 cert_path=self._format_path(result["cert"]),
                 dns_info=dns_info,
                 ip_info=ip_info,
-                validity=validity,
+                validity=fields["validity_days"],
             )
 
             self._show_result_panel(t("ui.sign_cert.success"), content, success=True)
@@ -441,89 +530,74 @@ class CAUITool:
                 return
 
             # 显示说明
-            self.console.print(f"[dim]💡 {t('ui.manage_cas.hint')}[/dim]")
-            self.console.print()
+            self._emit(Text("💡 " + t("ui.manage_cas.hint"), style="dim"), "")
 
             # 使用方向键选择CA
-            ca_choices = [
-                questionary.Choice(f"🔑 {ca['name']}", value=str(i)) for i, ca in enumerate(cas)
-            ]
-            ca_choices.append(questionary.Choice(t("ui.manage_cas.back"), value="back"))
+            ca_choices = self._ca_choices(cas, "ui.manage_cas.back")
 
-            ca_index_str = self._safe_select(
+            ca_index = self._safe_select(
                 t("ui.manage_cas.select_ca"),
                 choices=ca_choices,
-                instruction=self._get_select_instruction(),
+                instruction=self._select_instruction,
             )
 
-            if ca_index_str is None or ca_index_str == "back":
+            if ca_index is None or ca_index == "back":
                 return
 
-            try:
-                ca_index = int(ca_index_str)
-                if ca_index < 0 or ca_index >= len(cas):
-                    continue
-
-                selected_ca = cas[ca_index]
-
-                # 选择操作
-                action = self._safe_select(
-                    t("ui.manage_cas.select_action", ca_name=selected_ca["name"]),
-                    choices=[
-                        questionary.Choice(t("ui.manage_cas.action_view"), value="view"),
-                        questionary.Choice(t("ui.manage_cas.action_delete"), value="delete"),
-                        questionary.Choice(t("ui.manage_cas.action_back"), value="back"),
-                    ],
-                    instruction=self._get_select_instruction(),
-                )
+            if ca_index < 0 or ca_index >= len(cas):
+                continue
 
-                if action is None or action == "back":
-                    continue
+            selected_ca = cas[ca_index]
 
-                if action == "view":
-                    self._show_ca_details(selected_ca)
-                elif action == "delete":
-                    self._delete_ca(selected_ca)
+            # 选择操作
+            action = self._safe_select(
+                t("ui.manage_cas.select_action", ca_name=selected_ca["name"]),
+                choices=self._menu_choices("ca_actions"),
+                instruction=self._select_instruction,
+            )
 
-            except ValueError:
+            if action is None or action == "back":
                 continue
 
+            if action == "view":
+                self._show_ca_details(selected_ca)
+            elif action == "delete":
+                self._delete_ca(selected_ca)
+
+    def _details_table(self, section: str, rows: Tuple[Tuple[str, str], ...]):
+        """Attribute/value table for a details screen; section is the translation key prefix"""
+        table = _rounded_table(show_header=False, show_edge=False)
+        table.add_column(t(f"{section}.attribute"), style="cyan", width=20)
+        table.add_column(t(f"{section}.value"), style="green")
+        for label, value in rows:
+            table.add_row(label, value)
+        return table
+
     def _show_ca_details(self, ca: Dict[str, str]):
         """Show detailed information about a CA certificate"""
-        self._clear_and_show_header(t("ui.manage_cas.details.title", ca_name=ca["name"]))
-
         info = self.ca_manager.get_ca_info(ca["cert"])
 
         # 显示基本信息
-        table = Table(box=box.ROUNDED, show_header=False, show_edge=False)
-        table.add_column(t("ui.manage_cas.details.attribute"), style="cyan", width=20)
-        table.add_column(t("ui.manage_cas.details.value"), style="green")
-
-        table.add_row(t("ui.manage_cas.details.ca_name"), f"🔑 {ca['name']}")
-        table.add_row(t("ui.manage_cas.details.key_path"), self._format_path(ca["key"]))
-        table.add_row(t("ui.manage_cas.details.cert_path"), self._format_path(ca["cert"]))
+        table = self._details_table(
+            "ui.manage_cas.details",
+            (
+                (t("ui.manage_cas.details.ca_name"), _CA_PREFIX + ca["name"]),
+                (t("ui.manage_cas.details.key_path"), self._format_path(ca["key"])),
+                (t("ui.manage_cas.details.cert_path"), self._format_path(ca["cert"])),
+            ),
+        )
 
-        self.console.print(table)
-        self.console.print()
+        self._clear_and_show_header(t("ui.manage_cas.details.title", ca_name=ca["name"]), table, "")
 
         # 显示证书详细信息
         cert_info_text = info.get("info", t("ui.manage_cas.details.cert_info_error"))
-        # 创建一个临时 Console 实例，禁用 emoji 渲染，避免证书信息中的字符被误识别为 emoji
-        no_emoji_console = Console(emoji=False)
-        no_emoji_console.print(
-            Panel(
-                cert_info_text,
-                title=f"[bold]{t('ui.manage_cas.details.cert_info')}[/bold]",
-                border_style="blue",
-            )
-        )
+        # 使用禁用 emoji 渲染的 Console，避免证书信息中的字符被误识别为 emoji
+        self._print_cert_info(cert_info_text, t("ui.manage_cas.details.cert_info"))
 
         self._wait_for_continue()
 
     def _delete_ca(self, ca: Dict[str, str]):
         """Delete a CA certificate"""
-        self._clear_and_show_header(t("ui.manage_cas.delete.title", ca_name=ca["name"]))
-
         # 检查是否有签发的证书
         certs = self.ca_manager.get_certs_by_ca(ca["name"])
         cert_count = len(certs)
@@ -535,10 +609,15 @@ class CAUITool:
         else:
             warning_msg = t("ui.manage_cas.delete.warning_no_certs", ca_name=ca["name"])
 
-        self.console.print(
-            Panel(warning_msg, border_style="red", title="[bold red]⚠️  Warning[/bold red]")
+        self._clear_and_show_header(
+            t("ui.manage_cas.delete.title", ca_name=ca["name"]),
+            Panel(
+                Text(warning_msg),
+                border_style="red",
+                title=Text("⚠️  Warning", style="bold red"),
+            ),
+            "",
         )
-        self.console.print()
 
         confirm = self._safe_confirm(
             t("ui.manage_cas.delete.confirm", ca_name=ca["name"]), default=False
@@ -554,6 +633,8 @@ class CAUITool:
             return
 
         if self.ca_manager.delete_ca(ca["name"]):
+            # The same paths may be reused by a CA created later
+            _format_path.cache_clear()
             self._show_result_panel(
                 t("ui.manage_cas.delete.success"),
                 t("ui.manage_cas.delete.success_msg", ca_name=ca["name"]),
@@ -583,168 +664,116 @@ class CAUITool:
                 return
 
             # 显示说明
-            self.console.print(f"[dim]💡 {t('ui.manage_certs.hint')}[/dim]")
-            self.console.print()
+            self._emit(Text("💡 " + t("ui.manage_certs.hint"), style="dim"), "")
 
             # 使用方向键选择CA
-            ca_choices = [
-                questionary.Choice(f"🔑 {ca['name']}", value=str(i)) for i, ca in enumerate(cas)
-            ]
-            ca_choices.append(questionary.Choice(t("ui.manage_certs.back_to_main"), value="back"))
+            ca_choices = self._ca_choices(cas, "ui.manage_certs.back_to_main")
 
-            ca_index_str = self._safe_select(
+            ca_index = self._safe_select(
                 t("ui.manage_certs.select_ca"),
                 choices=ca_choices,
-                instruction=self._get_select_instruction(),
+                instruction=self._select_instruction,
             )
 
-            if ca_index_str is None or ca_index_str == "back":
+            if ca_index is None or ca_index == "back":
                 return
 
-            try:
-                ca_index = int(ca_index_str)
-                if ca_index < 0 or ca_index >= len(cas):
-                    continue
+            if ca_index < 0 or ca_index >= len(cas):
+                continue
 
-                selected_ca = cas[ca_index]
+            selected_ca = cas[ca_index]
 
-                # Get certificates signed by this CA
-                certs = self.ca_manager.get_certs_by_ca(selected_ca["name"])
+            # Get certificates signed by this CA
+            certs = self.ca_manager.get_certs_by_ca(selected_ca["name"])
 
-                if not certs:
-                    self._show_result_panel(
-                        t("ui.manage_certs.no_certs"),
-                        t("ui.manage_certs.no_certs_msg", ca_name=selected_ca["name"]),
-                        success=False,
-                    )
-                    self._wait_for_continue()
-                    continue
-
-                # 选择要管理的证书
-                cert_choices = []
-                for cert in certs:
-                    # Try to determine certificate type
-                    cert_type = t("ui.manage_certs.cert_type_unknown")
-                    try:
-                        import subprocess
-
-                        result = subprocess.run(
-                            [
-                                "openssl",
-                                "x509",
-                                "-in",
-                                cert["cert"],
-                                "-noout",
-                                "-ext",
-                                "extendedKeyUsage",
-                            ],
-                            capture_output=True,
-                            text=True,
-                            check=True,
-                        )
-                        output = result.stdout.lower()
-                        if "serverauth" in output or "server authentication" in output:
-                            if "clientauth" in output or "client authentication" in output:
-                                cert_type = t("ui.manage_certs.cert_type_both")
-                            else:
-                                cert_type = t("ui.manage_certs.cert_type_server")
-                        elif "clientauth" in output or "client authentication" in output:
-                            cert_type = t("ui.manage_certs.cert_type_client")
-                    except Exception:
-                        pass
-
-                    cert_choices.append(
-                        questionary.Choice(
-                            f"📜 {cert['name']} ({cert_type})", value=str(certs.index(cert))
-                        )
-                    )
+            if not certs:
+                self._show_result_panel(
+                    t("ui.manage_certs.no_certs"),
+                    t("ui.manage_certs.no_certs_msg", ca_name=selected_ca["name"]),
+                    success=False,
+                )
+                self._wait_for_continue()
+                continue
 
-                cert_choices.append(questionary.Choice(t("ui.manage_certs.back"), value="back"))
+            # 选择要管理的证书
+            cert_choices = []
+            for i, cert in enumerate(certs):
+                # Parsed in-process and cached until the file changes
+                cert_type = self.cert_manager.get_certificate_type(cert["cert"])
+                cert_type = t(f"ui.manage_certs.cert_type_{cert_type or 'unknown'}")
 
-                cert_index_str = self._safe_select(
-                    t("ui.manage_certs.select_cert", ca_name=selected_ca["name"]),
-                    choices=cert_choices,
-                    instruction=self._get_select_instruction(),
-                )
+                cert_choices.append(questionary.Choice(f"📜 {cert['name']} ({cert_type})", value=i))
 
-                if cert_index_str is None or cert_index_str == "back":
-                    continue
+            cert_choices.append(questionary.Choice(t("ui.manage_certs.back"), value="back"))
 
-                cert_index = int(cert_index_str)
-                if cert_index < 0 or cert_index >= len(certs):
-                    continue
+            cert_index = self._safe_select(
+                t("ui.manage_certs.select_cert", ca_name=selected_ca["name"]),
+                choices=cert_choices,
+                instruction=self._select_instruction,
+            )
 
-                selected_cert = certs[cert_index]
+            if cert_index is None or cert_index == "back":
+                continue
 
-                # 选择操作
-                action = self._safe_select(
-                    t("ui.manage_certs.select_action", cert_name=selected_cert["name"]),
-                    choices=[
-                        questionary.Choice(t("ui.manage_certs.action_view"), value="view"),
-                        questionary.Choice(t("ui.manage_certs.action_delete"), value="delete"),
-                        questionary.Choice(t("ui.manage_cas.action_back"), value="back"),
-                    ],
-                    instruction=self._get_select_instruction(),
-                )
+            if cert_index < 0 or cert_index >= len(certs):
+                continue
 
-                if action is None or action == "back":
-                    continue
+            selected_cert = certs[cert_index]
 
-                if action == "view":
-                    self._show_cert_details(selected_cert, selected_ca["name"])
-                elif action == "delete":
-                    self._delete_certificate(selected_cert, selected_ca["name"])
+            # 选择操作
+            action = self._safe_select(
+                t("ui.manage_certs.select_action", cert_name=selected_cert["name"]),
+                choices=self._menu_choices("cert_actions"),
+                instruction=self._select_instruction,
+            )
 
-            except ValueError:
+            if action is None or action == "back":
                 continue
 
+            if action == "view":
+                self._show_cert_details(selected_cert, selected_ca["name"])
+            elif action == "delete":
+                self._delete_certificate(selected_cert, selected_ca["name"])
+
     def _show_cert_details(self, cert: Dict[str, str], ca_name: str):
         """Show detailed information about a certificate"""
-        self._clear_and_show_header(t("ui.manage_certs.details.title", cert_name=cert["name"]))
-
         info = self.cert_manager.get_certificate_info(cert["cert"])
 
         # 显示基本信息
-        table = Table(box=box.ROUNDED, show_header=False, show_edge=False)
-        table.add_column(t("ui.manage_certs.details.attribute"), style="cyan", width=20)
-        table.add_column(t("ui.manage_certs.details.value"), style="green")
-
-        table.add_row(t("ui.manage_certs.details.cert_name"), f"📜 {cert['name']}")
-        table.add_row(t("ui.manage_certs.details.ca_name"), f"🔑 {ca_name}")
-        table.add_row(t("ui.manage_certs.details.key_path"), self._format_path(cert["key"]))
-        table.add_row(t("ui.manage_certs.details.cert_path"), self._format_path(cert["cert"]))
+        table = self._details_table(
+            "ui.manage_certs.details",
+            (
+                (t("ui.manage_certs.details.cert_name"), f"📜 {cert['name']}"),
+                (t("ui.manage_certs.details.ca_name"), _CA_PREFIX + ca_name),
+                (t("ui.manage_certs.details.key_path"), self._format_path(cert["key"])),
+                (t("ui.manage_certs.details.cert_path"), self._format_path(cert["cert"])),
+            ),
+        )
 
-        self.console.print(table)
-        self.console.print()
+        self._clear_and_show_header(
+            t("ui.manage_certs.details.title", cert_name=cert["name"]), table, ""
+        )
 
         # 显示证书详细信息
         cert_info_text = info.get("info", t("ui.manage_certs.details.cert_info_error"))
-        # 创建一个临时 Console 实例，禁用 emoji 渲染，避免证书信息中的字符被误识别为 emoji
-        no_emoji_console = Console(emoji=False)
-        no_emoji_console.print(
-            Panel(
-                cert_info_text,
-                title=f"[bold]{t('ui.manage_certs.details.cert_info')}[/bold]",
-                border_style="blue",
-            )
-        )
+        # 使用禁用 emoji 渲染的 Console，避免证书信息中的字符被误识别为 emoji
+        self._print_cert_info(cert_info_text, t("ui.manage_certs.details.cert_info"))
 
         self._wait_for_continue()
 
     def _delete_certificate(self, cert: Dict[str, str], ca_name: str):
         """Delete a certificate"""
-        self._clear_and_show_header(t("ui.manage_certs.delete.title", cert_name=cert["name"]))
-
         warning_msg = t("ui.manage_certs.delete.warning", cert_name=cert["name"])
 
-        self.console.print(
+        self._clear_and_show_header(
+            t("ui.manage_certs.delete.title", cert_name=cert["name"]),
             Panel(
-                warning_msg,
+                Text(warning_msg),
                 border_style="red",
-                title=f"[bold red]{t('ui.manage_certs.delete.panel_title')}[/bold red]",
-            )
+                title=Text(t("ui.manage_certs.delete.panel_title"), style="bold red"),
+            ),
+            "",
         )
-        self.console.print()
 
         confirm = self._safe_confirm(
             t("ui.manage_certs.delete.confirm", cert_name=cert["name"]), default=False
@@ -760,6 +789,7 @@ class CAUITool:
             return
 
         if self.cert_manager.delete_certificate(ca_name, cert["name"]):
+            _format_path.cache_clear()
             self._show_result_panel(
                 t("ui.manage_certs.delete.success"),
                 t("ui.manage_certs.delete.success_msg", cert_name=cert["name"]),
@@ -782,15 +812,9 @@ class CAUITool:
             # 使用方向键选择
             choice = self._safe_select(
                 t("ui.manage_templates.select_operation"),
-                choices=[
-                    questionary.Choice(t("ui.manage_templates.back"), value="0"),
-                    questionary.Choice(t("ui.manage_templates.create"), value="1"),
-                    questionary.Choice(t("ui.manage_templates.list"), value="2"),
-                    questionary.Choice(t("ui.manage_templates.load"), value="3"),
-                    questionary.Choice(t("ui.manage_templates.delete"), value="4"),
-                ],
+                choices=self._menu_choices("templates"),
                 default="0",
-                instruction=self._get_select_instruction(),
+                instruction=self._select_instruction,
             )
 
             if not choice or choice == "0":
@@ -879,16 +903,17 @@ class CAUITool:
             self._wait_for_continue()
             return
 
-        # 显示模板列表
-        table = Table(box=box.ROUNDED, show_header=True, header_style="bold magenta")
-        table.add_column(t("ui.manage_templates.list.template_name"), style="green")
-
-        for template in templates:
-            table.add_row(f"📝 {template}")
+        # 显示模板列表 (one pre-joined Text; a single-column Table only adds per-row measuring)
+        listing = Panel(
+            Text("\n".join(map(_TPL_PREFIX.__add__, templates)), style="green"),
+            title=Text(t("ui.manage_templates.list.template_name"), style="bold magenta"),
+            title_align="left",
+            expand=False,
+        )
 
-        self.console.print(table)
-        self.console.print(
-            f"\n[dim]{t('ui.manage_templates.list.count', count=len(templates))}[/dim]"
+        self._emit(
+            listing,
+            Text("\n" + t("ui.manage_templates.list.count", count=len(templates)), style="dim"),
         )
         self._wait_for_continue()
 
@@ -907,42 +932,33 @@ class CAUITool:
             return
 
         # 使用方向键选择模板
-        template_choices = [
-            questionary.Choice(f"📝 {template}", value=str(i))
-            for i, template in enumerate(templates)
-        ]
-        index_str = self._safe_select(
+        template_choices = self._template_choices(templates)
+        index = self._safe_select(
             t("ui.manage_templates.load.select"),
             choices=template_choices,
-            instruction=self._get_select_instruction(),
+            instruction=self._select_instruction,
         )
 
-        if index_str is None:
+        if index is None:
             return
 
-        try:
-            index = int(index_str)
-            if 0 <= index < len(templates):
-                self.template = self.template_manager.load_template(templates[index])
-
-                content = t(
-                    "ui.manage_templates.load.success_content",
-                    template_name=templates[index],
-                    organization=self.template.get("organization", "N/A"),
-                    validity=self.template.get("default_validity_days", "N/A"),
-                    key_size=self.template.get("default_key_size", "N/A"),
-                )
+        if 0 <= index < len(templates):
+            self.template = self.template_manager.load_template(templates[index])
 
-                self._show_result_panel(t("ui.install_cert.success"), content, success=True)
-            else:
-                self._show_result_panel(
-                    t("ui.install_cert.error"),
-                    t("ui.manage_templates.load.error_invalid"),
-                    success=False,
-                )
-        except ValueError:
+            content = t(
+                "ui.manage_templates.load.success_content",
+                template_name=templates[index],
+                organization=self.template.get("organization", "N/A"),
+                validity=self.template.get("default_validity_days", "N/A"),
+                key_size=self.template.get("default_key_size", "N/A"),
+            )
+
+            self._show_result_panel(t("ui.install_cert.success"), content, success=True)
+        else:
             self._show_result_panel(
-                t("ui.install_cert.error"), t("ui.manage_templates.load.error_input"), success=False
+                t("ui.install_cert.error"),
+                t("ui.manage_templates.load.error_invalid"),
+                success=False,
             )
 
         self._wait_for_continue()
@@ -962,52 +978,43 @@ class CAUITool:
             return
 
         # 使用方向键选择模板
-        template_choices = [
-            questionary.Choice(f"📝 {template}", value=str(i))
-            for i, template in enumerate(templates)
-        ]
-        index_str = self._safe_select(
+        template_choices = self._template_choices(templates)
+        index = self._safe_select(
             t("ui.manage_templates.delete.select"),
             choices=template_choices,
-            instruction=self._get_select_instruction(),
+            instruction=self._select_instruction,
         )
 
-        if index_str is None:
+        if index is None:
             return
 
-        try:
-            index = int(index_str)
-            if 0 <= index < len(templates):
-                template_name = templates[index]
+        if 0 <= index < len(templates):
+            template_name = templates[index]
 
-                if self._safe_confirm(
-                    t("ui.manage_templates.delete.confirm", template_name=template_name),
-                    default=False,
-                ):
-                    if self.template_manager.delete_template(template_name):
-                        self._show_result_panel(
-                            t("ui.install_cert.success"),
-                            t(
-                                "ui.manage_templates.delete.success_msg",
-                                template_name=template_name,
-                            ),
-                            success=True,
-                        )
-                    else:
-                        self._show_result_panel(
-                            t("ui.install_cert.error"),
-                            t("ui.manage_templates.delete.error_failed"),
-                            success=False,
-                        )
-            else:
-                self._show_result_panel(
-                    t("ui.install_cert.error"),
-                    t("ui.manage_templates.load.error_invalid"),
-                    success=False,
-                )
-        except ValueError:
+            if self._safe_confirm(
+                t("ui.manage_templates.delete.confirm", template_name=template_name),
+                default=False,
+            ):
+                if self.template_manager.delete_template(template_name):
+                    self._show_result_panel(
+                        t("ui.install_cert.success"),
+                        t(
+                            "ui.manage_templates.delete.success_msg",
+                            template_name=template_name,
+                        ),
+                        success=True,
+                    )
+                else:
+                    self._show_result_panel(
+                        t("ui.install_cert.error"),
+                        t("ui.manage_templates.delete.error_failed"),
+                        success=False,
+                    )
+        else:
             self._show_result_panel(
-                t("ui.install_cert.error"), t("ui.manage_templates.load.error_input"), success=False
+                t("ui.install_cert.error"),
+                t("ui.manage_templates.load.error_invalid"),
+                success=False,
             )
 
         self._wait_for_continue()
@@ -1025,64 +1032,60 @@ class CAUITool:
             return
 
         # 使用方向键选择CA
-        ca_choices = [
-            questionary.Choice(f"🔑 {ca['name']}", value=str(i)) for i, ca in enumerate(cas)
-        ]
-        ca_index_str = self._safe_select(
+        ca_choices = self._ca_choices(cas)
+        ca_index = self._safe_select(
             t("ui.install_cert.select_ca"),
             choices=ca_choices,
-            instruction=self._get_select_instruction(),
+            instruction=self._select_instruction,
         )
 
-        if ca_index_str is None:
+        if ca_index is None:
             return
 
-        try:
-            ca_index = int(ca_index_str)
-            if 0 <= ca_index < len(cas):
-                selected_ca = cas[ca_index]
+        if 0 <= ca_index < len(cas):
+            selected_ca = cas[ca_index]
+
+            if self._safe_confirm(
+                t("ui.install_cert.confirm", ca_name=selected_ca["name"]),
+                default=False,
+            ):
+                # Get sudo password
+                password = self._password_input(
+                    t("ui.install_cert.password"),
+                    instruction=t("ui.install_cert.password_hint"),
+                )
 
-                if self._safe_confirm(
-                    t("ui.install_cert.confirm", ca_name=selected_ca["name"]),
-                    default=False,
+                # sudo would prompt on the terminal from under the spinner
+                if password is None or (not password and self.system_cert_manager.needs_password()):
+                    self._show_result_panel(
+                        t("ui.install_cert.cancelled"),
+                        t("ui.install_cert.cancelled_msg"),
+                        success=True,
+                    )
+                    self._wait_for_continue()
+                    return
+
+                if self._run_with_status(
+                    Text(t("ui.install_cert.installing"), style="yellow"),
+                    self.system_cert_manager.install_ca_cert,
+                    selected_ca["cert"],
+                    selected_ca["name"],
+                    password,
                 ):
-                    # Get sudo password
-                    password = questionary.password(
-                        t("ui.install_cert.password"),
-                        instruction=t("ui.install_cert.password_hint"),
-                    ).ask()
-
-                    if password is None:
-                        self._show_result_panel(
-                            t("ui.install_cert.cancelled"),
-                            t("ui.install_cert.cancelled_msg"),
-                            success=True,
-                        )
-                        self._wait_for_continue()
-                        return
-
-                    self.console.print(f"\n[yellow]{t('ui.install_cert.installing')}[/yellow]")
-                    if self.system_cert_manager.install_ca_cert(
-                        selected_ca["cert"], selected_ca["name"], password
-                    ):
-                        self._show_result_panel(
-                            t("ui.install_cert.success"),
-                            t("ui.install_cert.success_msg", ca_name=selected_ca["name"]),
-                            success=True,
-                        )
-                    else:
-                        self._show_result_panel(
-                            t("ui.install_cert.error"),
-                            t("ui.install_cert.error_msg"),
-                            success=False,
-                        )
-            else:
-                self._show_result_panel(
-                    t("ui.install_cert.error"), t("ui.install_cert.error_invalid"), success=False
-                )
-        except ValueError:
+                    self._show_result_panel(
+                        t("ui.install_cert.success"),
+                        t("ui.install_cert.success_msg", ca_name=selected_ca["name"]),
+                        success=True,
+                    )
+                else:
+                    self._show_result_panel(
+                        t("ui.install_cert.error"),
+                        t("ui.install_cert.error_msg"),
+                        success=False,
+                    )
+        else:
             self._show_result_panel(
-                t("ui.install_cert.error"), t("ui.install_cert.error_input"), success=False
+                t("ui.install_cert.error"), t("ui.install_cert.error_invalid"), success=False
             )
 
         self._wait_for_continue()
@@ -1098,19 +1101,24 @@ class CAUITool:
 
         if self._safe_confirm(t("ui.remove_cert.confirm", ca_name=ca_name), default=False):
             # Get sudo password
-            password = questionary.password(
+            password = self._password_input(
                 t("ui.remove_cert.password"), instruction=t("ui.install_cert.password_hint")
-            ).ask()
+            )
 
-            if password is None:
+            # sudo would prompt on the terminal from under the spinner
+            if password is None or (not password and self.system_cert_manager.needs_password()):
                 self._show_result_panel(
                     t("ui.install_cert.cancelled"), t("ui.remove_cert.cancelled_msg"), success=True
                 )
                 self._wait_for_continue()
                 return
 
-            self.console.print(f"\n[yellow]{t('ui.remove_cert.removing')}[/yellow]")
-            if self.system_cert_manager.remove_ca_cert(ca_name, password):
+            if self._run_with_status(
+                Text(t("ui.remove_cert.removing"), style="yellow"),
+                self.system_cert_manager.remove_ca_cert,
+                ca_name,
+                password,
+            ):
                 self._show_result_panel(
                     t("ui.install_cert.success"),
                     t("ui.remove_cert.success_msg", ca_name=ca_name),
@@ -8,6 +8,28 @@ import shutil
 from pathlib import Path
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_home(tmp_path, monkeypatch):
+    """Keep the cached system check out of the user's real cache directory"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def no_root_install(monkeypatch):
+    """Keep tests off the real trust store even when the suite runs as root"""
+    monkeypatch.setattr("certica.system_cert._running_as_root", lambda: False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_path_cache():
+    """Don't let command lookups patched in one test leak into the next"""
+    from certica.system_check import SystemChecker
+
+    SystemChecker.invalidate_path_cache()
+    yield
+    SystemChecker.invalidate_path_cache()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests"""
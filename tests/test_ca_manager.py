@@ -2,8 +2,11 @@
 Tests for CA Manager
 """
 
+import shutil
+
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 from certica.ca_manager import CAManager
 
 
@@ -118,3 +121,54 @@ def test_get_certs_by_ca(temp_dir, sample_ca_config):
     # Initially no certificates
     certs = manager.get_certs_by_ca(sample_ca_config["ca_name"])
     assert len(certs) == 0
+
+
+def test_list_cas_cache(temp_dir, sample_ca_config):
+    """Test that list_cas reuses its walk until the CA directory changes"""
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(**sample_ca_config)
+
+    first = manager.list_cas()
+    first[0]["name"] = "mutated"
+    assert manager.list_cas()[0]["name"] == sample_ca_config["ca_name"]
+
+    manager.delete_ca(sample_ca_config["ca_name"])
+    assert manager.list_cas() == []
+
+
+def test_list_cas_sees_ca_completed_after_scan(temp_dir, sample_ca_config):
+    """Test that a CA directory without its files yet is not cached as absent"""
+    manager = CAManager(base_dir=str(temp_dir))
+    other = CAManager(base_dir=str(temp_dir / "elsewhere"))
+    result = other.create_root_ca(**sample_ca_config)
+
+    ca_subdir = temp_dir / "ca" / sample_ca_config["ca_name"]
+    ca_subdir.mkdir()
+    assert manager.list_cas() == []
+
+    # Writing the files does not change the mtime of the ca directory itself
+    for path in (result["ca_key"], result["ca_cert"]):
+        shutil.copy(path, ca_subdir)
+    assert [ca["name"] for ca in manager.list_cas()] == [sample_ca_config["ca_name"]]
+
+
+def test_get_certs_by_ca_cache(temp_dir, sample_ca_config):
+    """Test that get_certs_by_ca reuses its walk until the CA's certs directory changes"""
+    from certica.cert_manager import CertManager
+
+    manager = CAManager(base_dir=str(temp_dir))
+    ca = manager.create_root_ca(**sample_ca_config)
+    ca_name = sample_ca_config["ca_name"]
+    cert_manager = CertManager(base_dir=str(temp_dir))
+    cert_manager.sign_certificate(
+        ca_key=ca["ca_key"], ca_cert=ca["ca_cert"], ca_name=ca_name, cert_name="web"
+    )
+
+    first = manager.get_certs_by_ca(ca_name)
+    first[0]["name"] = "mutated"
+    with patch("certica.ca_manager.os.scandir") as mock_scandir:
+        assert manager.get_certs_by_ca(ca_name)[0]["name"] == "web"
+    mock_scandir.assert_not_called()
+
+    cert_manager.delete_certificate(ca_name, "web")
+    assert manager.get_certs_by_ca(ca_name) == []
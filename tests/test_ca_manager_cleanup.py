@@ -3,7 +3,7 @@ Tests for CA Manager cleanup code in exception handlers
 """
 
 import pytest
-import subprocess
+from cryptography import x509
 from certica.ca_manager import CAManager
 
 
@@ -22,19 +22,12 @@ class TestCAManagerCleanup:
         # Create cert file to test cleanup
         cert_path.write_text("fake cert")
 
-        # Mock subprocess to fail after creating key
-        original_run = subprocess.run
-        call_count = [0]
+        # Fail when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            assert key_path.exists()
+            raise ValueError("Signing failed")
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                key_path.write_text("fake key")
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) fails
-                raise subprocess.CalledProcessError(1, cmd)
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(Exception):
             manager.create_root_ca(
@@ -3,6 +3,7 @@ Edge cases and boundary condition tests for CA Manager
 """
 
 import pytest
+from cryptography import x509
 from certica.ca_manager import CAManager
 
 
@@ -125,18 +126,11 @@ class TestCAManagerEdgeCases:
         manager = CAManager(base_dir=str(temp_dir))
         ca_subdir = manager.ca_dir / "test-ca"
 
-        # Mock subprocess to fail after key generation
-        original_run = __import__("subprocess").run
-        call_count = [0]
+        # Fail when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise ValueError("Signing failed")
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) fails
-                raise __import__("subprocess").CalledProcessError(1, cmd)
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(Exception):
             manager.create_root_ca(
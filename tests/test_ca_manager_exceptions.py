@@ -3,8 +3,8 @@ Exception handling tests for CA Manager
 """
 
 import pytest
-import subprocess
 from unittest.mock import patch
+from cryptography import x509
 from certica.ca_manager import CAManager
 
 
@@ -16,18 +16,11 @@ class TestCAManagerExceptions:
         manager = CAManager(base_dir=str(temp_dir))
         ca_subdir = manager.ca_dir / "test-ca"
 
-        # Mock subprocess to raise KeyboardInterrupt after key generation
-        original_run = subprocess.run
-        call_count = [0]
+        # Raise KeyboardInterrupt when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise KeyboardInterrupt()
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) raises KeyboardInterrupt
-                raise KeyboardInterrupt()
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(KeyboardInterrupt):
             manager.create_root_ca(
@@ -51,18 +44,11 @@ class TestCAManagerExceptions:
         manager = CAManager(base_dir=str(temp_dir))
         ca_subdir = manager.ca_dir / "test-ca"
 
-        # Mock subprocess to raise exception after key generation
-        original_run = subprocess.run
-        call_count = [0]
-
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) raises exception
-                raise Exception("Test exception")
+        # Raise a generic exception when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise Exception("Test exception")
 
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(Exception):
             manager.create_root_ca(
@@ -3,7 +3,7 @@ Test to cover line 134 in ca_manager.py (cert_path.unlink in exception handler)
 """
 
 import pytest
-import subprocess
+from cryptography import x509
 from certica.ca_manager import CAManager
 
 
@@ -19,19 +19,12 @@ def test_create_ca_exception_with_cert_file_exists(temp_dir, monkeypatch):
     # Pre-create cert file to ensure line 134 is executed
     cert_path.write_text("pre-existing cert")
 
-    # Mock subprocess to fail after key generation
-    original_run = subprocess.run
-    call_count = [0]
+    # Fail when signing, after the key has been written
+    def mock_sign(self, *args, **kwargs):
+        assert key_path.exists()
+        raise ValueError("Signing failed")
 
-    def mock_run(cmd, **kwargs):
-        call_count[0] += 1
-        if call_count[0] == 1:  # First call (genrsa) succeeds
-            key_path.write_text("generated key")
-            return original_run(cmd, **kwargs)
-        else:  # Second call (req) fails
-            raise subprocess.CalledProcessError(1, cmd)
-
-    monkeypatch.setattr("subprocess.run", mock_run)
+    monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
     with pytest.raises(Exception):
         manager.create_root_ca(
@@ -0,0 +1,64 @@
+"""
+Tests for the one-time check of the OpenSSL library linked into cryptography
+"""
+
+import warnings
+from unittest.mock import patch
+
+import pytest
+
+from certica.ca_manager import CAManager, _aesni_masked
+
+
+@pytest.fixture(autouse=True)
+def reset_caps_check(monkeypatch):
+    """Let every test run the check again"""
+    monkeypatch.setattr(CAManager, "_openssl_checked", False)
+    monkeypatch.delenv("OPENSSL_ia32cap", raising=False)
+
+
+def test_aesni_masked():
+    """Test OPENSSL_ia32cap parsing"""
+    assert _aesni_masked(None) is False
+    assert _aesni_masked("") is False
+    assert _aesni_masked("~0x200000000000000") is True
+    assert _aesni_masked("~0x200000000000000:~0x0") is True
+    assert _aesni_masked("~0x1") is False
+    assert _aesni_masked("0x0") is True
+    assert _aesni_masked("0x200000000000000") is False
+    assert _aesni_masked("garbage") is False
+
+
+def test_check_runs_once_without_subprocess(temp_dir):
+    """Test that the linked library is checked once and no openssl binary is run"""
+    with patch("certica.ca_manager._linked_openssl_build", return_value="OpenSSL 3.0.0") as build:
+        with patch("subprocess.run") as mock_run:
+            CAManager(base_dir=str(temp_dir))
+            CAManager(base_dir=str(temp_dir))
+
+    assert build.call_count == 1
+    mock_run.assert_not_called()
+
+
+def test_check_warns_on_no_asm(temp_dir):
+    """Test warning when the linked OpenSSL was built with no-asm"""
+    build = "OpenSSL 3.0.0\ncompiler: gcc -DOPENSSL_NO_ASM"
+    with patch("certica.ca_manager._linked_openssl_build", return_value=build):
+        with pytest.warns(RuntimeWarning, match="no-asm"):
+            CAManager(base_dir=str(temp_dir))
+
+
+def test_check_warns_on_masked_aesni(temp_dir, monkeypatch):
+    """Test warning when OPENSSL_ia32cap masks AES-NI"""
+    monkeypatch.setenv("OPENSSL_ia32cap", "~0x200000000000000")
+    with patch("certica.ca_manager._linked_openssl_build", return_value="OpenSSL 3.0.0"):
+        with pytest.warns(RuntimeWarning, match="AES-NI"):
+            CAManager(base_dir=str(temp_dir))
+
+
+def test_check_without_build_info_is_silent(temp_dir):
+    """Test that missing build information does not warn or raise"""
+    with patch("certica.ca_manager._linked_openssl_build", return_value=""):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            CAManager(base_dir=str(temp_dir))
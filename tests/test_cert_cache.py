@@ -0,0 +1,97 @@
+"""
+Tests for the parsed certificate cache
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from certica import cert_cache
+from certica.ca_manager import CAManager
+
+
+@pytest.fixture(autouse=True)
+def clear_cert_cache():
+    """Start every test with an empty cache"""
+    cert_cache.clear_cache()
+    yield
+    cert_cache.clear_cache()
+
+
+def test_get_cert_info(temp_dir, sample_ca_config):
+    """Test parsing a certificate"""
+    ca = CAManager(base_dir=str(temp_dir)).create_root_ca(**sample_ca_config)
+
+    info = cert_cache.get_cert_info(ca["ca_cert"])
+    assert "CN=Test Organization Root CA" in info.subject
+    assert info.subject == info.issuer
+    assert info.not_after is not None
+    assert "Certificate:" in info.text_dump
+
+
+def test_get_cert_info_is_cached(temp_dir, sample_ca_config):
+    """Test that repeated lookups do not parse the file again"""
+    ca = CAManager(base_dir=str(temp_dir)).create_root_ca(**sample_ca_config)
+
+    first = cert_cache.get_cert_info(ca["ca_cert"])
+    with patch("certica.cert_cache.x509.load_pem_x509_certificate") as mock_load:
+        second = cert_cache.get_cert_info(ca["ca_cert"])
+    mock_load.assert_not_called()
+    assert first is second
+
+
+def test_get_cert_info_invalidated_on_change(temp_dir, sample_ca_config):
+    """Test that a rewritten file is parsed again"""
+    manager = CAManager(base_dir=str(temp_dir))
+    first_ca = manager.create_root_ca(**sample_ca_config)
+    first = cert_cache.get_cert_info(first_ca["ca_cert"])
+
+    other = manager.create_root_ca(**{**sample_ca_config, "ca_name": "other-ca"})
+    data = open(other["ca_cert"], "rb").read()
+    with open(first_ca["ca_cert"], "wb") as f:
+        f.write(data)
+    st = os.stat(first_ca["ca_cert"])
+    os.utime(first_ca["ca_cert"], ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    second = cert_cache.get_cert_info(first_ca["ca_cert"])
+    assert second is not first
+    assert second.text_dump == cert_cache.get_cert_info(other["ca_cert"]).text_dump
+
+
+def test_get_cert_info_errors(temp_dir):
+    """Test that failures are raised and not cached"""
+    invalid = temp_dir / "invalid.pem"
+    invalid.write_text("not a certificate")
+
+    with pytest.raises(ValueError):
+        cert_cache.get_cert_info(str(invalid))
+    with pytest.raises(OSError):
+        cert_cache.get_cert_info(str(temp_dir / "missing.pem"))
+    assert cert_cache._parse_cert.cache_info().currsize == 0
+
+
+def test_text_dump_fields(temp_dir, sample_ca_config):
+    """Test the rendered certificate text"""
+    from certica.cert_manager import CertManager
+
+    ca = CAManager(base_dir=str(temp_dir)).create_root_ca(**sample_ca_config)
+    cert = CertManager(base_dir=str(temp_dir)).sign_certificate(
+        ca_key=ca["ca_key"],
+        ca_cert=ca["ca_cert"],
+        ca_name=sample_ca_config["ca_name"],
+        cert_name="web",
+        dns_names=["web.example.com"],
+        ip_addresses=["10.0.0.1"],
+    )
+
+    ca_text = cert_cache.get_cert_info(ca["ca_cert"]).text_dump
+    assert "X509v3 Basic Constraints: critical\n                CA:TRUE" in ca_text
+    assert "Certificate Sign, CRL Sign" in ca_text
+
+    text = cert_cache.get_cert_info(cert["cert"]).text_dump
+    assert "Signature Algorithm: sha256WithRSAEncryption" in text
+    assert "Subject: C = CN, ST = Beijing, L = Beijing, CN = web.example.com" in text
+    assert "Public-Key: (2048 bit)" in text
+    assert "DNS:web.example.com, IP Address:10.0.0.1" in text
+    assert "TLS Web Server Authentication, TLS Web Client Authentication" in text
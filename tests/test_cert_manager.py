@@ -2,6 +2,7 @@
 Tests for Certificate Manager
 """
 
+import pytest
 from pathlib import Path
 from certica.ca_manager import CAManager
 from certica.cert_manager import CertManager
@@ -150,6 +151,27 @@ def test_get_certificate_info(temp_dir, sample_ca_config, sample_cert_config):
     assert len(info["info"]) > 0
 
 
+def test_get_certificate_type(temp_dir, sample_ca_config):
+    """Test reading the certificate type from its extended key usage"""
+    ca_result = CAManager(base_dir=str(temp_dir)).create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    def sign(name, cert_type):
+        return cert_manager.sign_certificate(
+            ca_key=ca_result["ca_key"],
+            ca_cert=ca_result["ca_cert"],
+            ca_name=sample_ca_config["ca_name"],
+            cert_name=name,
+            cert_type=cert_type,
+        )["cert"]
+
+    # Server certificates are also usable for client authentication
+    assert cert_manager.get_certificate_type(sign("web", "server")) == "both"
+    assert cert_manager.get_certificate_type(sign("user", "client")) == "client"
+    assert cert_manager.get_certificate_type(ca_result["ca_cert"]) is None
+    assert cert_manager.get_certificate_type(str(temp_dir / "missing.pem")) is None
+
+
 def test_delete_certificate(temp_dir, sample_ca_config, sample_cert_config):
     """Test deleting a certificate"""
     # Create CA and certificate
@@ -186,3 +208,206 @@ def test_delete_certificate(temp_dir, sample_ca_config, sample_cert_config):
     # Verify it's gone
     assert not Path(cert_result["cert"]).exists()
     assert not Path(cert_result["key"]).exists()
+
+
+def test_sign_certificates_batch(temp_dir, sample_ca_config):
+    """Test signing several certificates in worker processes"""
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    specs = [
+        {"cert_name": "web", "dns_names": ["web.example.com"]},
+        {"cert_name": "api", "ip_addresses": ["10.0.0.1"]},
+        {"cert_name": "client", "cert_type": "client"},
+    ]
+    results = cert_manager.sign_certificates_batch(
+        ca_key=ca_result["ca_key"],
+        ca_cert=ca_result["ca_cert"],
+        ca_name=sample_ca_config["ca_name"],
+        specs=specs,
+        max_workers=2,
+    )
+
+    assert [r["cert_name"] for r in results] == ["web", "api", "client"]
+    assert results[2]["type"] == "client"
+    for result in results:
+        assert Path(result["key"]).exists()
+        assert Path(result["cert"]).exists()
+
+    with pytest.raises(ValueError):
+        cert_manager.sign_certificates_batch(
+            ca_key=ca_result["ca_key"],
+            ca_cert=ca_result["ca_cert"],
+            ca_name=sample_ca_config["ca_name"],
+            specs=[{"cert_name": "dup"}, {"cert_name": "dup"}],
+        )
+
+
+def test_sign_certificates_batch_validates_first(temp_dir, sample_ca_config):
+    """Test that a bad spec is rejected before any certificate is written"""
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    bad_specs = [
+        [{"cert_name": "ok"}, {"cert_name": "bad", "ip_addresses": ["not-an-ip"]}],
+        [{"cert_name": "ok"}, {"cert_name": "../escape"}],
+        [{"cert_name": "ok"}, {"cert_name": "typo", "dns_name": ["x"]}],
+    ]
+    for specs in bad_specs:
+        with pytest.raises(ValueError):
+            cert_manager.sign_certificates_batch(
+                ca_key=ca_result["ca_key"],
+                ca_cert=ca_result["ca_cert"],
+                ca_name=sample_ca_config["ca_name"],
+                specs=specs,
+                max_workers=2,
+            )
+    assert cert_manager.list_certificates() == []
+
+    broken_key = temp_dir / "broken.key.pem"
+    broken_key.write_text("not a key")
+    with pytest.raises(ValueError, match="Cannot load CA"):
+        cert_manager.sign_certificates_batch(
+            ca_key=str(broken_key),
+            ca_cert=ca_result["ca_cert"],
+            ca_name=sample_ca_config["ca_name"],
+            specs=[{"cert_name": "one"}, {"cert_name": "two"}],
+            max_workers=2,
+        )
+
+
+def test_sign_certificates_batch_reports_failures(temp_dir, sample_ca_config, monkeypatch):
+    """Test that a certificate failing during signing does not stop the rest"""
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    sign_certificate = cert_manager.sign_certificate
+
+    def flaky_sign(**kwargs):
+        if kwargs["cert_name"] == "second":
+            raise RuntimeError("disk full")
+        return sign_certificate(**kwargs)
+
+    monkeypatch.setattr(cert_manager, "sign_certificate", flaky_sign)
+    results = cert_manager.sign_certificates_batch(
+        ca_key=ca_result["ca_key"],
+        ca_cert=ca_result["ca_cert"],
+        ca_name=sample_ca_config["ca_name"],
+        specs=[{"cert_name": "first"}, {"cert_name": "second"}, {"cert_name": "third"}],
+        max_workers=1,
+    )
+
+    assert results[1] == {"cert_name": "second", "error": "disk full"}
+    assert Path(results[0]["cert"]).exists()
+    assert Path(results[2]["cert"]).exists()
+
+
+def test_sign_certificate_random_serial(temp_dir, sample_ca_config):
+    """Test that serials are random and no OpenSSL .srl file is written"""
+    from cryptography import x509
+
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    serials = set()
+    for name in ("one", "two"):
+        result = cert_manager.sign_certificate(
+            ca_key=ca_result["ca_key"],
+            ca_cert=ca_result["ca_cert"],
+            ca_name=sample_ca_config["ca_name"],
+            cert_name=name,
+        )
+        cert = x509.load_pem_x509_certificate(Path(result["cert"]).read_bytes())
+        assert 0 < cert.serial_number < 2**159
+        serials.add(cert.serial_number)
+
+    assert len(serials) == 2
+    assert not list(temp_dir.rglob("*.srl"))
+
+
+def test_sign_certificate_many_sans(temp_dir, sample_ca_config):
+    """Test a certificate with a large SAN list keeps every entry in order"""
+    from cryptography import x509
+
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    dns_names = [f"host{i}.example.com" for i in range(50)]
+    ip_addresses = [f"10.0.0.{i}" for i in range(1, 11)]
+    result = cert_manager.sign_certificate(
+        ca_key=ca_result["ca_key"],
+        ca_cert=ca_result["ca_cert"],
+        ca_name=sample_ca_config["ca_name"],
+        cert_name="fleet",
+        dns_names=dns_names,
+        ip_addresses=ip_addresses,
+    )
+
+    cert = x509.load_pem_x509_certificate(Path(result["cert"]).read_bytes())
+    san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    assert san.get_values_for_type(x509.DNSName) == dns_names
+    assert [str(ip) for ip in san.get_values_for_type(x509.IPAddress)] == ip_addresses
+
+
+@pytest.mark.parametrize(
+    "ca_alg,cert_alg",
+    [
+        ("ecdsa-p256", "ecdsa-p256"),
+        ("ecdsa-p256", "rsa"),
+        ("ed25519", "ed25519"),
+        ("rsa", "ed25519"),
+    ],
+)
+def test_sign_certificate_key_algorithms(temp_dir, ca_alg, cert_alg):
+    """Test CAs and certificates with non-RSA keys"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    key_types = {
+        "rsa": rsa.RSAPublicKey,
+        "ecdsa-p256": ec.EllipticCurvePublicKey,
+        "ed25519": ed25519.Ed25519PublicKey,
+    }
+
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(ca_name="alg-ca", key_algorithm=ca_alg)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+    result = cert_manager.sign_certificate(
+        ca_key=ca_result["ca_key"],
+        ca_cert=ca_result["ca_cert"],
+        ca_name="alg-ca",
+        cert_name="alg-cert",
+        dns_names=["alg.example.com"],
+        key_algorithm=cert_alg,
+    )
+
+    ca_cert = x509.load_pem_x509_certificate(Path(ca_result["ca_cert"]).read_bytes())
+    cert = x509.load_pem_x509_certificate(Path(result["cert"]).read_bytes())
+    assert isinstance(ca_cert.public_key(), key_types[ca_alg])
+    assert isinstance(cert.public_key(), key_types[cert_alg])
+    cert.verify_directly_issued_by(ca_cert)
+
+    key_usage = cert.extensions.get_extension_for_class(x509.KeyUsage).value
+    assert key_usage.key_encipherment is (cert_alg == "rsa")
+
+
+def test_sign_certificate_unknown_algorithm(temp_dir, sample_ca_config):
+    """Test that an unknown key algorithm is rejected before any file is written"""
+    ca_manager = CAManager(base_dir=str(temp_dir))
+    ca_result = ca_manager.create_root_ca(**sample_ca_config)
+    cert_manager = CertManager(base_dir=str(temp_dir))
+
+    with pytest.raises(ValueError):
+        cert_manager.sign_certificate(
+            ca_key=ca_result["ca_key"],
+            ca_cert=ca_result["ca_cert"],
+            ca_name=sample_ca_config["ca_name"],
+            cert_name="bad",
+            key_algorithm="dsa",
+        )
+    assert not (cert_manager.certs_dir / sample_ca_config["ca_name"]).exists()
@@ -3,7 +3,7 @@ Tests for Cert Manager cleanup code in exception handlers
 """
 
 import pytest
-import subprocess
+from cryptography import x509
 from certica.cert_manager import CertManager
 from certica.ca_manager import CAManager
 
@@ -23,25 +23,16 @@ class TestCertManagerCleanup:
 
         key_path = cert_output_dir / "key.pem"
         cert_path = cert_output_dir / "cert.pem"
-        csr_path = cert_output_dir / "csr.pem"
 
-        # Create cert and csr files to test cleanup
+        # Create cert file to test cleanup
         cert_path.write_text("fake cert")
-        csr_path.write_text("fake csr")
 
-        # Mock subprocess to fail after creating key
-        original_run = subprocess.run
-        call_count = [0]
+        # Fail when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            assert key_path.exists()
+            raise ValueError("Signing failed")
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                key_path.write_text("fake key")
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) fails
-                raise subprocess.CalledProcessError(1, cmd)
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(Exception):
             cert_manager.sign_certificate(
@@ -62,4 +53,3 @@ class TestCertManagerCleanup:
         # Verify all files are cleaned up
         assert not key_path.exists()
         assert not cert_path.exists()
-        assert not csr_path.exists()
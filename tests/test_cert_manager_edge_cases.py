@@ -3,6 +3,7 @@ Edge cases and boundary condition tests for Cert Manager
 """
 
 import pytest
+from cryptography import x509
 from pathlib import Path
 from certica.cert_manager import CertManager
 from certica.ca_manager import CAManager
@@ -270,18 +271,11 @@ class TestCertManagerEdgeCases:
 
         ca_result = ca_manager.create_root_ca(**sample_ca_config)
 
-        # Mock subprocess to fail after key generation
-        original_run = __import__("subprocess").run
-        call_count = [0]
+        # Fail when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise ValueError("Signing failed")
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) fails
-                raise __import__("subprocess").CalledProcessError(1, cmd)
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         cert_output_dir = cert_manager.certs_dir / ca_result["ca_name"] / "test-cert"
         key_path = cert_output_dir / "key.pem"
@@ -3,8 +3,8 @@ Exception handling tests for Cert Manager
 """
 
 import pytest
-import subprocess
 from unittest.mock import patch
+from cryptography import x509
 from certica.cert_manager import CertManager
 from certica.ca_manager import CAManager
 
@@ -22,20 +22,12 @@ class TestCertManagerExceptions:
         cert_output_dir = cert_manager.certs_dir / ca_result["ca_name"] / "test-cert"
         key_path = cert_output_dir / "key.pem"
         cert_path = cert_output_dir / "cert.pem"
-        csr_path = cert_output_dir / "csr.pem"
 
-        # Mock subprocess to raise KeyboardInterrupt after key generation
-        original_run = subprocess.run
-        call_count = [0]
+        # Raise KeyboardInterrupt when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise KeyboardInterrupt()
 
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) raises KeyboardInterrupt
-                raise KeyboardInterrupt()
-
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(KeyboardInterrupt):
             cert_manager.sign_certificate(
@@ -56,7 +48,6 @@ class TestCertManagerExceptions:
         # Verify cleanup
         assert not key_path.exists()
         assert not cert_path.exists()
-        assert not csr_path.exists()
 
     def test_sign_cert_exception_cleanup(self, temp_dir, sample_ca_config, monkeypatch):
         """Test that generic exception during cert signing cleans up files"""
@@ -68,18 +59,11 @@ class TestCertManagerExceptions:
         cert_output_dir = cert_manager.certs_dir / ca_result["ca_name"] / "test-cert"
         key_path = cert_output_dir / "key.pem"
 
-        # Mock subprocess to raise exception after key generation
-        original_run = subprocess.run
-        call_count = [0]
-
-        def mock_run(cmd, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:  # First call (genrsa) succeeds
-                return original_run(cmd, **kwargs)
-            else:  # Second call (req) raises exception
-                raise Exception("Test exception")
+        # Raise a generic exception when signing, after the key has been written
+        def mock_sign(self, *args, **kwargs):
+            raise Exception("Test exception")
 
-        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr(x509.CertificateBuilder, "sign", mock_sign)
 
         with pytest.raises(Exception):
             cert_manager.sign_certificate(
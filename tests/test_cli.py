@@ -4,9 +4,10 @@ Tests for CLI commands
 
 import pytest
 from click.testing import CliRunner
-from certica.cli import cli
+
 from certica.ca_manager import CAManager
 from certica.cert_manager import CertManager
+from certica.cli import cli
 
 
 @pytest.fixture
@@ -162,3 +163,169 @@ def test_cli_check_only(cli_runner):
     # Exit code depends on system (0=success, 1=failed, 2=click error)
     # Should not crash
     assert result.exit_code in [0, 1, 2]
+
+
+def test_cli_sign_batch_file(cli_runner, temp_dir):
+    """Test sign command with --batch-file"""
+    import json
+
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(ca_name="testca")
+
+    batch_file = temp_dir / "batch.json"
+    batch_file.write_text(
+        json.dumps([{"cert_name": "one"}, {"cert_name": "two", "cert_type": "client"}])
+    )
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--base-dir",
+            str(temp_dir),
+            "--skip-check",
+            "sign",
+            "--ca",
+            "testca",
+            "--batch-file",
+            str(batch_file),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "Signed 2 certificates" in result.output
+    cert_manager = CertManager(base_dir=str(temp_dir))
+    assert {c["name"] for c in cert_manager.list_certificates()} == {"one", "two"}
+
+
+def test_cli_sign_batch_file_key_size_implies_rsa(cli_runner, temp_dir):
+    """Test that a batch entry's own key_size selects RSA when no algorithm is given"""
+    import json
+    from pathlib import Path
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(ca_name="testca")
+
+    batch_file = temp_dir / "batch.json"
+    batch_file.write_text(
+        json.dumps([{"cert_name": "sized", "key_size": 3072}, {"cert_name": "plain"}])
+    )
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--base-dir",
+            str(temp_dir),
+            "--skip-check",
+            "sign",
+            "--ca",
+            "testca",
+            "--batch-file",
+            str(batch_file),
+        ],
+    )
+    assert result.exit_code == 0
+
+    certs = {c["name"]: c for c in CertManager(base_dir=str(temp_dir)).list_certificates()}
+    sized = x509.load_pem_x509_certificate(Path(certs["sized"]["cert"]).read_bytes())
+    plain = x509.load_pem_x509_certificate(Path(certs["plain"]["cert"]).read_bytes())
+    assert isinstance(sized.public_key(), rsa.RSAPublicKey)
+    assert sized.public_key().key_size == 3072
+    assert isinstance(plain.public_key(), ec.EllipticCurvePublicKey)
+
+
+def test_cli_sign_batch_file_invalid_entry(cli_runner, temp_dir):
+    """Test that --batch-file signs nothing and fails when an entry is invalid"""
+    import json
+
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(ca_name="testca")
+
+    batch_file = temp_dir / "batch.json"
+    batch_file.write_text(
+        json.dumps([{"cert_name": "one"}, {"cert_name": "two", "ip_addresses": ["not-an-ip"]}])
+    )
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--base-dir",
+            str(temp_dir),
+            "--skip-check",
+            "sign",
+            "--ca",
+            "testca",
+            "--batch-file",
+            str(batch_file),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "not-an-ip" in result.output
+    assert CertManager(base_dir=str(temp_dir)).list_certificates() == []
+
+
+def test_cli_sign_requires_name_or_batch_file(cli_runner, temp_dir):
+    """Test sign command without --name or --batch-file"""
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(ca_name="testca")
+
+    result = cli_runner.invoke(
+        cli, ["--base-dir", str(temp_dir), "--skip-check", "sign", "--ca", "testca"]
+    )
+
+    assert "--name or --batch-file is required" in result.output
+
+
+def test_cli_create_ca_default_alg(cli_runner, temp_dir):
+    """Test that create-ca defaults to ECDSA P-256 and honours --alg and --key-size"""
+    from pathlib import Path
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    for name, args, key_type in [
+        ("ecca", [], ec.EllipticCurvePublicKey),
+        ("rsaca", ["--alg", "rsa"], rsa.RSAPublicKey),
+        ("sizedca", ["--key-size", "3072"], rsa.RSAPublicKey),
+    ]:
+        result = cli_runner.invoke(
+            cli,
+            ["--base-dir", str(temp_dir), "--skip-check", "create-ca", "--name", name] + args,
+        )
+        assert result.exit_code == 0
+
+        ca = CAManager(base_dir=str(temp_dir)).get_ca(name)
+        cert = x509.load_pem_x509_certificate(Path(ca["cert"]).read_bytes())
+        assert isinstance(cert.public_key(), key_type)
+        if name == "sizedca":
+            assert cert.public_key().key_size == 3072
+
+
+def test_cli_sign_key_size_with_other_alg_warns(cli_runner, temp_dir):
+    """Test that --key-size with a non-RSA --alg is reported as ignored"""
+    manager = CAManager(base_dir=str(temp_dir))
+    manager.create_root_ca(ca_name="testca", key_algorithm="ecdsa-p256")
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--base-dir",
+            str(temp_dir),
+            "--skip-check",
+            "sign",
+            "--ca",
+            "testca",
+            "--name",
+            "web",
+            "--alg",
+            "ecdsa-p256",
+            "--key-size",
+            "4096",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "--key-size only applies to RSA keys" in result.output
@@ -30,3 +30,10 @@ class TestCLICheckOnly:
             result = cli_runner.invoke(cli, ["--check-only"])
             # Should exit with error code
             assert result.exit_code in [1, 2]
+
+    def test_cli_check_only_runs_deep_check(self, cli_runner):
+        """Test --check-only runs each tool's test command"""
+        with patch("certica.cli.check_system_requirements", return_value=True) as mock_check:
+            result = cli_runner.invoke(cli, ["--check-only", "list-cas"])
+            assert result.exit_code == 0
+            mock_check.assert_called_once_with(deep=True)
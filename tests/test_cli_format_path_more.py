@@ -2,6 +2,8 @@
 More tests for _format_path to cover remaining lines
 """
 
+from pathlib import Path
+
 from certica.cli import _format_path
 
 
@@ -28,3 +30,18 @@ class TestFormatPathMore:
         result = _format_path("output", "output")
         # When remaining is empty, should return original path
         assert result == "output" or isinstance(result, str)
+
+    def test_format_path_resolved_base_fast_path(self, tmp_path):
+        """Test stripping a pre-resolved base without resolving the path"""
+        from unittest.mock import patch
+
+        path = str(tmp_path / "ca" / "myca" / "myca.cert.pem")
+        with patch("certica.cli.Path.resolve") as mock_resolve:
+            result = _format_path(path, "output", str(tmp_path))
+        mock_resolve.assert_not_called()
+        assert result == str(Path("ca") / "myca" / "myca.cert.pem")
+
+    def test_format_path_substring_uses_last_occurrence(self):
+        """Test the substring fallback keeps the part after the last base_dir occurrence"""
+        result = _format_path("/srv/output/site/output/ca/x.pem", "output")
+        assert result == "ca/x.pem"
@@ -83,11 +83,9 @@ class TestI18nEdgeCases:
         # Should return the key as-is on exception
         assert result == "key.with.{invalid"
 
-    def test_translation_fallback_when_current_lang_not_loaded(self):
-        """Test translation fallback when current language translations not loaded"""
-        # Set language but don't load translations
+    def test_translation_loads_current_lang_on_demand(self):
+        """Test that translations not yet loaded are read on first lookup"""
         set_language("en")
-        # Clear translations to simulate not loaded
         from certica.i18n import _translations
 
         original = _translations.copy()
@@ -95,13 +93,28 @@ class TestI18nEdgeCases:
 
         try:
             result = t("ui.menu.title")
-            # Should return the key since no translations loaded
-            assert result == "ui.menu.title"
+            assert result == "🔒 CERTICA — CERTs In a Click, Always."
+            assert "en" in _translations
         finally:
             # Restore translations
             _translations.update(original)
             set_language("en")
 
+    def test_set_language_defers_loading(self):
+        """Test that set_language does not read locale files"""
+        from certica.i18n import _translations
+
+        original = _translations.copy()
+        _translations.clear()
+
+        try:
+            with patch("certica.i18n._load_translations") as mock_load:
+                assert set_language("zh")
+                mock_load.assert_not_called()
+        finally:
+            _translations.update(original)
+            set_language("en")
+
     def test_translation_fallback_to_english(self):
         """Test that translation falls back to English when current language missing"""
         set_language("fr")
@@ -70,3 +70,40 @@ class TestI18nMore:
         result = t("key.{invalid", placeholder="value")
         # Should return key as-is on exception
         assert result == "key.{invalid"
+
+    def test_load_translations_flattens_nested_keys(self, tmp_path):
+        """Test that nested locale JSON is flattened into dotted keys"""
+        (tmp_path / "locales").mkdir()
+        (tmp_path / "locales" / "nested.json").write_text(
+            '{"ui": {"menu": {"title": "Title"}}, "flat.key": "Flat"}'
+        )
+
+        with patch("certica.i18n.Path") as mock_path:
+            mock_file_path = MagicMock()
+            mock_file_path.parent = tmp_path
+            mock_path.return_value = mock_file_path
+
+            result = _load_translations("nested")
+
+        assert result == {"ui.menu.title": "Title", "flat.key": "Flat"}
+
+    def test_resolved_translation_cached_until_language_change(self):
+        """Test that resolved templates are memoized per language"""
+        from certica.i18n import _resolve_cache
+
+        set_language("en")
+        assert t("lang.unsupported", lang="xx")
+        assert ("en", "lang.unsupported") in _resolve_cache
+
+        set_language("zh")
+        assert ("en", "lang.unsupported") not in _resolve_cache
+        set_language("en")
+
+    def test_needs_format(self):
+        """Test detection of templates that need str.format"""
+        from certica.i18n import _needs_format
+
+        assert _needs_format("Plain text") is False
+        assert _needs_format("Hello {name}") is True
+        assert _needs_format("Literal {{braces}}") is True
+        assert _needs_format("Broken {") is True
@@ -0,0 +1,63 @@
+"""
+Tests for the background RSA key pool
+"""
+
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from certica.ca_manager import CAManager
+from certica.cert_manager import CertManager
+from certica.key_pool import KeyPool
+
+
+def _wait_for_key(pool, timeout=30):
+    """Wait until the pool has at least one key ready"""
+    deadline = time.monotonic() + timeout
+    while pool._queue.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_key_pool_get():
+    """Test taking pooled and non-pooled key sizes"""
+    pool = KeyPool(size=1, key_size=1024)
+    _wait_for_key(pool)
+
+    key = pool.get(1024)
+    assert key.key_size == 1024
+
+    # Different size is generated inline
+    other = pool.get(2048)
+    assert other.key_size == 2048
+
+
+def test_managers_use_key_pool(temp_dir, monkeypatch):
+    """Test that both managers take their keys from the pool"""
+    pool = KeyPool(size=1, key_size=1024)
+    pooled = [rsa.generate_private_key(public_exponent=65537, key_size=1024) for _ in range(2)]
+    handed_out = []
+
+    def fake_get(key_size):
+        assert key_size == 1024
+        handed_out.append(pooled[len(handed_out)])
+        return handed_out[-1]
+
+    monkeypatch.setattr(pool, "get", fake_get)
+    ca_manager = CAManager(base_dir=str(temp_dir), key_pool=pool)
+    cert_manager = CertManager(base_dir=str(temp_dir), key_pool=pool)
+
+    ca = ca_manager.create_root_ca(ca_name="pool-ca", key_size=1024)
+    result = cert_manager.sign_certificate(
+        ca_key=ca["ca_key"],
+        ca_cert=ca["ca_cert"],
+        ca_name="pool-ca",
+        cert_name="pool-cert",
+        key_size=1024,
+    )
+
+    assert handed_out == pooled
+    for key_path, expected in ((ca["ca_key"], pooled[0]), (result["key"], pooled[1])):
+        written = serialization.load_pem_private_key(Path(key_path).read_bytes(), password=None)
+        assert written.public_key().public_numbers() == expected.public_key().public_numbers()
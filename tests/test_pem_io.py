@@ -0,0 +1,96 @@
+"""
+Tests for PEM file output helpers
+"""
+
+import os
+import stat
+
+import pytest
+
+from certica.pem_io import write_pem
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions only")
+def test_write_pem_sets_exact_mode(temp_dir):
+    """Test that the mode is applied regardless of umask"""
+    old_umask = os.umask(0o077)
+    try:
+        cert_path = temp_dir / "cert.pem"
+        write_pem(cert_path, b"cert", 0o644)
+    finally:
+        os.umask(old_umask)
+
+    assert cert_path.read_bytes() == b"cert"
+    assert stat.S_IMODE(os.stat(cert_path).st_mode) == 0o644
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions only")
+def test_write_pem_overwrites_existing(temp_dir):
+    """Test overwriting a longer, world-readable file"""
+    key_path = temp_dir / "key.pem"
+    key_path.write_bytes(b"old contents that are longer")
+    os.chmod(key_path, 0o644)
+
+    write_pem(key_path, b"new", 0o600)
+
+    assert key_path.read_bytes() == b"new"
+    assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600
+    assert os.listdir(temp_dir) == ["key.pem"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions only")
+def test_write_pem_never_exposes_key_bytes(temp_dir, monkeypatch):
+    """Test that key bytes are only written to a file that is already owner-only"""
+    key_path = temp_dir / "key.pem"
+    key_path.write_bytes(b"old")
+    os.chmod(key_path, 0o644)
+
+    real_write = os.write
+    modes = []
+
+    def checking_write(fd, data):
+        modes.append(stat.S_IMODE(os.fstat(fd).st_mode))
+        return real_write(fd, data)
+
+    monkeypatch.setattr(os, "write", checking_write)
+    write_pem(key_path, b"secret", 0o600)
+
+    assert modes and all(mode == 0o600 for mode in modes)
+    assert key_path.read_bytes() == b"secret"
+
+
+def test_write_pem_failure_keeps_existing_file(temp_dir, monkeypatch):
+    """Test that a failed write leaves the old file and no temporary file behind"""
+    key_path = temp_dir / "key.pem"
+    key_path.write_bytes(b"old")
+
+    def failing_write(fd, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "write", failing_write)
+    with pytest.raises(OSError):
+        write_pem(key_path, b"new", 0o600)
+
+    assert key_path.read_bytes() == b"old"
+    assert os.listdir(temp_dir) == ["key.pem"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions only")
+def test_manager_outputs_have_final_modes(temp_dir):
+    """Test that generated keys and certificates get 0600/0644 under any umask"""
+    from certica.ca_manager import CAManager
+    from certica.cert_manager import CertManager
+
+    old_umask = os.umask(0)
+    try:
+        ca = CAManager(base_dir=str(temp_dir)).create_root_ca(ca_name="modes")
+        cert = CertManager(base_dir=str(temp_dir)).sign_certificate(
+            ca_key=ca["ca_key"], ca_cert=ca["ca_cert"], ca_name="modes", cert_name="leaf"
+        )
+    finally:
+        os.umask(old_umask)
+
+    for key_path in (ca["ca_key"], cert["key"]):
+        assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600
+    for cert_path in (ca["ca_cert"], cert["cert"]):
+        assert stat.S_IMODE(os.stat(cert_path).st_mode) == 0o644
@@ -3,8 +3,14 @@ Basic tests for System Cert Manager
 """
 
 import platform
+import pytest
 from unittest.mock import patch, mock_open
-from certica.system_cert import SystemCertManager
+from certica.system_cert import (
+    SystemCertManager,
+    _distro_family,
+    _read_os_release,
+    get_manager,
+)
 
 
 class TestSystemCertManagerBasic:
@@ -44,6 +50,7 @@ class TestSystemCertManagerBasic:
     def test_detect_linux_distro_with_os_release(self, mock_exists):
         """Test _detect_linux_distro when /etc/os-release exists"""
         mock_exists.return_value = True
+        _read_os_release.cache_clear()
 
         # Mock open to return file-like object with os-release content
         mock_file_content = mock_open(read_data="ID=ubuntu\nID_LIKE=debian\n")
@@ -52,16 +59,19 @@ class TestSystemCertManagerBasic:
             if manager.system == "Linux":
                 distro_info = manager._detect_linux_distro()
                 assert distro_info is not None or distro_info is None
+        _read_os_release.cache_clear()
 
     @patch("os.path.exists")
     def test_detect_linux_distro_without_os_release(self, mock_exists):
         """Test _detect_linux_distro when /etc/os-release doesn't exist"""
         mock_exists.return_value = False
+        _read_os_release.cache_clear()
 
         manager = SystemCertManager()
         if manager.system == "Linux":
             distro_info = manager._detect_linux_distro()
-            assert distro_info is None or isinstance(distro_info, dict)
+            assert distro_info is None
+        _read_os_release.cache_clear()
 
     def test_get_linux_distro_id_debian(self):
         """Test _get_linux_distro_id for Debian-based systems"""
@@ -133,3 +143,71 @@ class TestSystemCertManagerBasic:
         manager.sudo_password = "cached"
         password = manager._get_sudo_password()
         assert password == "cached"
+
+    @patch("os.path.exists", return_value=True)
+    def test_os_release_parsed_once(self, mock_exists):
+        """Test /etc/os-release is read once and shared between instances"""
+        _read_os_release.cache_clear()
+        mock_file = mock_open(read_data='ID=ubuntu\nID_LIKE="debian"\n')
+        try:
+            with patch("builtins.open", mock_file):
+                first = _read_os_release()
+                second = _read_os_release()
+            assert first is second
+            assert first["ID_LIKE"] == "debian"
+            assert mock_file.call_count == 1
+            with pytest.raises(TypeError):
+                first["ID"] = "fedora"
+        finally:
+            _read_os_release.cache_clear()
+
+    @patch("os.path.exists", return_value=True)
+    def test_os_release_quoting(self, mock_exists):
+        """Test os-release quoting, escapes and comments are handled"""
+        _read_os_release.cache_clear()
+        data = (
+            "# comment line\n"
+            'PRETTY_NAME="Example \\"Linux\\" 1.0"\n'
+            "NAME='Example Linux'\n"
+            "ID=example\n"
+            'ID_LIKE="rhel fedora"\n'
+            "\n"
+            "VARIANT_ID=\n"
+        )
+        try:
+            with patch("builtins.open", mock_open(read_data=data)):
+                info = _read_os_release()
+        finally:
+            _read_os_release.cache_clear()
+
+        assert info["PRETTY_NAME"] == 'Example "Linux" 1.0'
+        assert info["NAME"] == "Example Linux"
+        assert info["ID"] == "example"
+        assert info["ID_LIKE"] == "rhel fedora"
+        assert info["VARIANT_ID"] == ""
+        assert len(info) == 5
+
+    @pytest.mark.parametrize(
+        "distro_id,id_like,expected",
+        [
+            ("ubuntu", "debian", "debian"),
+            ("linuxmint", "ubuntu debian", "debian"),
+            ("rocky", "rhel centos fedora", "fedora"),
+            ("ol", "fedora", "fedora"),
+            ("manjaro", "arch", "arch"),
+            ("opensuse-leap", "suse opensuse", "suse"),
+            ("alpine", "", "alpine"),
+            ("", "", None),
+        ],
+    )
+    def test_distro_family(self, distro_id, id_like, expected):
+        """Test mapping of os-release ID/ID_LIKE to distribution families"""
+        assert _distro_family(distro_id, id_like) == expected
+
+    def test_get_manager_returns_shared_instance(self, monkeypatch):
+        """Test get_manager creates one SystemCertManager and reuses it"""
+        monkeypatch.setattr("certica.system_cert._manager_singleton", None)
+
+        first = get_manager()
+        assert isinstance(first, SystemCertManager)
+        assert get_manager() is first
@@ -3,33 +3,107 @@ Tests for System Cert Manager methods
 """
 
 import subprocess
+from pathlib import Path
 from unittest.mock import patch, MagicMock
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from certica.ca_manager import CAManager
 from certica.system_cert import SystemCertManager
 
 
 class TestSystemCertManagerMethods:
     """Test SystemCertManager methods"""
 
-    @patch("subprocess.Popen")
-    def test_run_sudo_command_with_password_success(self, mock_popen):
+    @patch("subprocess.run")
+    def test_run_sudo_command_with_password_success(self, mock_run):
         """Test _run_sudo_command with password and success"""
-        mock_process = MagicMock()
-        mock_process.communicate.return_value = ("stdout", "")
-        mock_process.returncode = 0
-        mock_popen.return_value = mock_process
+        mock_run.return_value = MagicMock(returncode=0, stderr="")
 
         manager = SystemCertManager()
         success, error = manager._run_sudo_command(["test", "command"], "password")
         assert success is True
         assert error == ""
 
-    @patch("subprocess.Popen")
-    def test_run_sudo_command_with_password_failure(self, mock_popen):
+        prime, command = mock_run.call_args_list
+        assert prime.args[0] == ["sudo", "-S", "-v"]
+        assert prime.kwargs["input"] == "password\n"
+        assert command.args[0] == ["sudo", "-n", "test", "command"]
+        assert command.kwargs["stdout"] is subprocess.DEVNULL
+
+    @patch("subprocess.run")
+    def test_run_sudo_command_reuses_cached_credentials(self, mock_run):
+        """Test _run_sudo_command only sends the password once"""
+        mock_run.return_value = MagicMock(returncode=0, stderr="")
+
+        manager = SystemCertManager()
+        assert manager._run_sudo_command(["first"], "password") == (True, "")
+        assert manager._run_sudo_command(["second"], "password") == (True, "")
+
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        assert commands == [
+            ["sudo", "-S", "-v"],
+            ["sudo", "-n", "first"],
+            ["sudo", "-n", "second"],
+        ]
+
+    @patch("subprocess.run")
+    def test_run_sudo_command_reauthenticates_when_cache_expired(self, mock_run):
+        """Test _run_sudo_command falls back to sudo -S when cached credentials expire"""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stderr=""),
+            MagicMock(returncode=1, stderr="sudo: 需要密码"),
+            MagicMock(returncode=1),
+            MagicMock(returncode=0, stderr=""),
+        ]
+
+        manager = SystemCertManager()
+        assert manager._run_sudo_command(["cmd"], "password") == (True, "")
+
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        assert commands == [
+            ["sudo", "-S", "-v"],
+            ["sudo", "-n", "cmd"],
+            ["sudo", "-n", "true"],
+            ["sudo", "-S", "cmd"],
+        ]
+        assert mock_run.call_args_list[-1].kwargs["input"] == "password\n"
+        assert manager._sudo_primed is False
+
+    @patch("subprocess.run")
+    def test_run_sudo_command_failure_with_cached_credentials(self, mock_run):
+        """Test _run_sudo_command reports a failing command without sending the password again"""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stderr=""),
+            MagicMock(returncode=1, stderr="cp: cannot stat 'x'"),
+            MagicMock(returncode=0),
+        ]
+
+        manager = SystemCertManager()
+        assert manager._run_sudo_command(["cp", "x", "y"], "password") == (
+            False,
+            "cp: cannot stat 'x'",
+        )
+        assert mock_run.call_count == 3
+
+    @patch("subprocess.run")
+    def test_run_sudo_command_wrong_password(self, mock_run):
+        """Test _run_sudo_command stops after sudo rejects the password"""
+        mock_run.return_value = MagicMock(returncode=1, stderr="sudo: 1 incorrect password attempt")
+
+        manager = SystemCertManager()
+        success, error = manager._run_sudo_command(["cmd"], "wrong")
+        assert success is False
+        assert "incorrect password" in error
+        assert [call.args[0] for call in mock_run.call_args_list] == [["sudo", "-S", "-v"]]
+
+        # The rejected password is not sent again by later commands
+        assert manager._run_sudo_command(["other"], "wrong") == (False, error)
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_run_sudo_command_with_password_failure(self, mock_run):
         """Test _run_sudo_command with password and failure"""
-        mock_process = MagicMock()
-        mock_process.communicate.return_value = ("", "error message")
-        mock_process.returncode = 1
-        mock_popen.return_value = mock_process
+        mock_run.return_value = MagicMock(returncode=1, stderr="error message")
 
         manager = SystemCertManager()
         success, error = manager._run_sudo_command(["test", "command"], "password")
@@ -56,33 +130,278 @@ class TestSystemCertManagerMethods:
         assert success is False
         assert len(error) > 0
 
+    @patch("certica.system_cert._running_as_root", return_value=False)
     @patch("subprocess.run")
-    def test_get_certificate_fingerprint_success(self, mock_run):
-        """Test _get_certificate_fingerprint with success"""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="SHA256 Fingerprint=AA:BB:CC:DD:EE:FF:00:11:22:33:44:55:66:77:88:99:AA:BB:CC:DD:EE:FF:00:11:22:33:44:55:66:77:88:99",
-        )
+    def test_needs_password(self, mock_run, mock_root):
+        """Test needs_password asks sudo -n whether a password would be required"""
+        manager = SystemCertManager()
+        manager.system = "Linux"
+
+        mock_run.return_value = MagicMock(returncode=1)
+        assert manager.needs_password() is True
+        assert mock_run.call_args.args[0] == ["sudo", "-n", "true"]
+
+        mock_run.return_value = MagicMock(returncode=0)
+        assert manager.needs_password() is False
+
+        mock_run.side_effect = FileNotFoundError("sudo")
+        assert manager.needs_password() is True
+
+        manager.system = "Windows"
+        assert manager.needs_password() is False
+
+    def test_get_certificate_fingerprint_success(self, tmp_path):
+        """Test _get_certificate_fingerprint with a real certificate"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="fp_ca")
 
         manager = SystemCertManager()
-        fingerprint = manager._get_certificate_fingerprint("/path/to/cert.pem")
-        assert fingerprint is not None
-        assert "AA:BB" in fingerprint or len(fingerprint) > 0
+        fingerprint = manager._get_certificate_fingerprint(result["ca_cert"])
 
-    @patch("subprocess.run")
-    def test_get_certificate_fingerprint_failure(self, mock_run):
-        """Test _get_certificate_fingerprint with failure"""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "openssl")
+        with open(result["ca_cert"], "rb") as f:
+            cert = x509.load_pem_x509_certificate(f.read())
+        assert fingerprint == cert.fingerprint(hashes.SHA256()).hex().upper()
+        assert len(fingerprint) == 64
 
+    def test_get_certificate_fingerprint_missing_file(self, tmp_path):
+        """Test _get_certificate_fingerprint when the file does not exist"""
         manager = SystemCertManager()
-        fingerprint = manager._get_certificate_fingerprint("/path/to/cert.pem")
+        fingerprint = manager._get_certificate_fingerprint(str(tmp_path / "missing.pem"))
         assert fingerprint is None
 
-    @patch("subprocess.run")
-    def test_get_certificate_fingerprint_no_match(self, mock_run):
-        """Test _get_certificate_fingerprint when no fingerprint in output"""
-        mock_run.return_value = MagicMock(returncode=0, stdout="No fingerprint here")
+    def test_get_certificate_fingerprint_invalid_pem(self, tmp_path):
+        """Test _get_certificate_fingerprint when the file is not a certificate"""
+        cert_path = tmp_path / "invalid.pem"
+        cert_path.write_text("No certificate here")
 
         manager = SystemCertManager()
-        fingerprint = manager._get_certificate_fingerprint("/path/to/cert.pem")
+        fingerprint = manager._get_certificate_fingerprint(str(cert_path))
         assert fingerprint is None
+
+    @patch("subprocess.run")
+    def test_verify_installation_without_subprocess(self, mock_run, tmp_path):
+        """Test _verify_installation parses certificates in-process"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="verify_ca")
+        installed = tmp_path / "installed.crt"
+        installed.write_bytes(Path(result["ca_cert"]).read_bytes())
+
+        manager = SystemCertManager()
+        assert manager._verify_installation(result["ca_cert"], str(installed), "verify_ca")
+        mock_run.assert_not_called()
+
+    def test_verify_installation_identical_copy_skips_source_parse(self, tmp_path):
+        """Test _verify_installation does not re-parse a byte-identical source"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="copy_ca")
+        installed = tmp_path / "installed.crt"
+        installed.write_bytes(Path(result["ca_cert"]).read_bytes())
+
+        manager = SystemCertManager()
+        with patch.object(manager, "_get_certificate_fingerprint") as mock_fp:
+            assert manager._verify_installation(result["ca_cert"], str(installed), "copy_ca")
+            mock_fp.assert_not_called()
+
+    def test_verify_installation_copy_verified_reports_skip(self, tmp_path, capsys):
+        """Test _verify_installation does not claim a match it did not check"""
+        from certica.i18n import t
+
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="copied_ca")
+        installed = tmp_path / "installed.crt"
+        installed.write_bytes(Path(result["ca_cert"]).read_bytes())
+
+        manager = SystemCertManager()
+        with patch("certica.system_cert.filecmp.cmp") as mock_cmp:
+            assert manager._verify_installation(
+                result["ca_cert"], str(installed), "copied_ca", copy_verified=True
+            )
+            mock_cmp.assert_not_called()
+
+        output = capsys.readouterr().out
+        fingerprint = manager._get_certificate_fingerprint(str(installed))
+        assert t("system.verify.fingerprint_copied", fp=fingerprint[:16]) in output
+        assert t("system.verify.fingerprint_match", fp=fingerprint[:16]) not in output
+
+    def test_verify_installation_fingerprint_mismatch(self, tmp_path):
+        """Test _verify_installation fails when a different certificate is installed"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        source = ca_manager.create_root_ca(ca_name="source_ca")
+        other = ca_manager.create_root_ca(ca_name="other_ca")
+
+        manager = SystemCertManager()
+        assert not manager._verify_installation(source["ca_cert"], other["ca_cert"], "source_ca")
+
+    def test_dir_status(self, tmp_path):
+        """Test _dir_status distinguishes existing, creatable and missing directories"""
+        from certica.system_cert import _DIR_EXISTS, _DIR_MISSING, _DIR_PARENT_ONLY, _dir_status
+
+        assert _dir_status(str(tmp_path)) == _DIR_EXISTS
+        assert _dir_status(str(tmp_path / "anchors")) == _DIR_PARENT_ONLY
+        assert _dir_status(str(tmp_path / "missing" / "anchors")) == _DIR_MISSING
+
+    @patch("certica.system_cert._dir_status")
+    def test_install_linux_skips_missing_dirs_and_creates_parent_only(self, mock_status):
+        """Test _install_linux skips missing locations and mkdirs creatable ones"""
+        from certica.system_cert import _DIR_MISSING, _DIR_PARENT_ONLY
+
+        mock_status.side_effect = [_DIR_MISSING, _DIR_PARENT_ONLY]
+        manager = SystemCertManager()
+
+        with patch.object(manager, "_get_linux_distro_id", return_value=None):
+            with patch.object(manager, "_run_sudo_command", return_value=(True, "")) as mock_sudo:
+                with patch.object(manager, "_verify_installation", return_value=True):
+                    assert manager._install_linux("/tmp/ca.pem", "test-ca", "password")
+
+        assert mock_status.call_count == 2
+        commands = [call.args[0] for call in mock_sudo.call_args_list]
+        assert len(commands) == 2
+        assert commands[0][:2] == ["sh", "-c"]
+        assert commands[0][2].startswith("mkdir -p /etc/pki/ca-trust/source/anchors ")
+        assert "update-ca-trust extract" in commands[1][2]
+
+    def test_install_linux_scripts(self, tmp_path):
+        """Test the coalesced install scripts copy the certificate and roll back on failure"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="script_ca")
+        anchors = tmp_path / "trust" / "anchors"
+        failing_anchors = tmp_path / "trust" / "failing"
+        (tmp_path / "trust").mkdir()
+
+        def run_without_sudo(command, password=None):
+            completed = subprocess.run(command, capture_output=True, text=True)
+            return completed.returncode == 0, completed.stderr.strip()
+
+        manager = SystemCertManager()
+        methods = (
+            (str(failing_anchors), ("false",), "failing"),
+            (str(anchors), ("true",), "working"),
+        )
+        with patch("certica.system_cert._LINUX_FALLBACK_METHODS", methods):
+            with patch.object(manager, "_get_linux_distro_id", return_value=None):
+                with patch.object(manager, "_run_sudo_command", side_effect=run_without_sudo):
+                    with patch.object(manager, "_verify_installation", return_value=True):
+                        assert manager._install_linux(result["ca_cert"], "script ca", "pw")
+
+        assert failing_anchors.is_dir()
+        assert not (failing_anchors / "script ca.crt").exists()
+        installed = anchors / "script ca.crt"
+        assert installed.read_bytes() == Path(result["ca_cert"]).read_bytes()
+        assert installed.stat().st_mode & 0o777 == 0o644
+        assert anchors.stat().st_mode & 0o777 == 0o755
+
+    def test_verify_removal_checks_all_fallback_locations(self):
+        """Test _verify_removal checks every fallback location for unknown distros"""
+        manager = SystemCertManager()
+
+        with patch.object(manager, "_get_linux_distro_id", return_value=None):
+            with patch("os.path.exists", return_value=False) as mock_exists:
+                assert manager._verify_removal("test-ca")
+
+        checked = [call.args[0] for call in mock_exists.call_args_list]
+        assert checked == [
+            "/usr/local/share/ca-certificates/test-ca.crt",
+            "/etc/pki/ca-trust/source/anchors/test-ca.crt",
+            "/etc/ca-certificates/trust-source/anchors/test-ca.crt",
+            "/etc/pki/trust/anchors/test-ca.crt",
+        ]
+
+    def test_verify_removal_reports_leftover_file(self):
+        """Test _verify_removal fails when the certificate is still present"""
+        manager = SystemCertManager()
+        leftover = "/etc/pki/ca-trust/source/anchors/test-ca.crt"
+
+        with patch.object(manager, "_get_linux_distro_id", return_value="fedora"):
+            with patch("os.path.exists", side_effect=lambda p: p == leftover):
+                assert not manager._verify_removal("test-ca")
+
+    def test_install_linux_as_root_skips_sudo(self, tmp_path, monkeypatch):
+        """Test _install_linux copies in-process and only runs the update when root"""
+        monkeypatch.setattr("certica.system_cert._running_as_root", lambda: True)
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="root_ca")
+        anchors = tmp_path / "anchors"
+
+        manager = SystemCertManager()
+        methods = ((str(anchors), ("true",), "root"),)
+        with patch("certica.system_cert._LINUX_FALLBACK_METHODS", methods):
+            with patch.object(manager, "_get_linux_distro_id", return_value=None):
+                with patch.object(manager, "_get_sudo_password") as mock_password:
+                    with patch.object(manager, "_run_sudo_command") as mock_sudo:
+                        assert manager._install_linux(result["ca_cert"], "root_ca")
+
+        mock_password.assert_not_called()
+        mock_sudo.assert_not_called()
+        installed = anchors / "root_ca.crt"
+        assert installed.read_bytes() == Path(result["ca_cert"]).read_bytes()
+        assert installed.stat().st_mode & 0o777 == 0o644
+
+    def test_remove_linux_as_root_skips_sudo(self, tmp_path, monkeypatch):
+        """Test _remove_linux deletes in-process and only runs the update when root"""
+        monkeypatch.setattr("certica.system_cert._running_as_root", lambda: True)
+        anchors = tmp_path / "anchors"
+        anchors.mkdir()
+        installed = anchors / "root_ca.crt"
+        installed.write_text("cert")
+
+        manager = SystemCertManager()
+        methods = ((str(anchors), ("true",), "root"),)
+        with patch("certica.system_cert._LINUX_FALLBACK_METHODS", methods):
+            with patch.object(manager, "_get_linux_distro_id", return_value=None):
+                with patch.object(manager, "_get_sudo_password") as mock_password:
+                    with patch.object(manager, "_run_sudo_command") as mock_sudo:
+                        assert manager._remove_linux("root_ca")
+
+        mock_password.assert_not_called()
+        mock_sudo.assert_not_called()
+        assert not installed.exists()
+
+    def test_update_trust_store_as_root_failure_removes_file(self, tmp_path):
+        """Test a failed trust store update as root removes the copied certificate"""
+        target = tmp_path / "ca.crt"
+        target.write_text("cert")
+
+        manager = SystemCertManager()
+        success, error = manager._update_trust_store_as_root(("false",), str(target))
+        assert success is False
+        assert error
+        assert not target.exists()
+
+    def test_verify_installation_copy_verified_skips_comparison(self, tmp_path):
+        """Test _verify_installation trusts a just-completed copy"""
+        ca_manager = CAManager(base_dir=str(tmp_path))
+        result = ca_manager.create_root_ca(ca_name="copied_ca")
+
+        manager = SystemCertManager()
+        with patch("filecmp.cmp") as mock_cmp:
+            with patch.object(manager, "_get_certificate_fingerprint") as mock_fp:
+                assert manager._verify_installation(
+                    result["ca_cert"], result["ca_cert"], "copied_ca", copy_verified=True
+                )
+        mock_cmp.assert_not_called()
+        mock_fp.assert_not_called()
+
+    @patch("subprocess.run")
+    def test_windows_certutil_runs_without_shell(self, mock_run):
+        """Test certutil is run directly rather than through cmd.exe"""
+        mock_run.return_value = MagicMock(returncode=0)
+
+        manager = SystemCertManager()
+        assert manager._install_windows("C:\\\\My Certs\\\\ca.pem", "test-ca")
+        assert manager._remove_windows("test-ca")
+
+        for call in mock_run.call_args_list:
+            assert "shell" not in call.kwargs
+        assert mock_run.call_args_list[0].args[0][1:] == [
+            "-addstore",
+            "-f",
+            "Root",
+            "C:\\\\My Certs\\\\ca.pem",
+        ]
+
+    @patch("subprocess.run", side_effect=FileNotFoundError("certutil"))
+    def test_windows_certutil_missing(self, mock_run):
+        """Test a missing certutil is reported as a failure"""
+        manager = SystemCertManager()
+        assert manager._install_windows("ca.pem", "test-ca") is False
+        assert manager._remove_windows("test-ca") is False
@@ -2,8 +2,14 @@
 Edge cases and additional tests for System Check module
 """
 
+import shutil
 import subprocess
+import sys
 from unittest.mock import patch
+
+import pytest
+
+from certica.i18n import t
 from certica.system_check import SystemChecker, check_system_requirements
 
 
@@ -21,6 +27,20 @@ class TestSystemCheckEdgeCases:
             assert available is False
             assert "timeout" in error.lower()
 
+    def test_check_command_discards_output(self):
+        """Test check_command does not pipe the tool's output back"""
+        checker = SystemChecker()
+
+        with patch("subprocess.run") as mock_run:
+            assert checker.check_command(["openssl", "version"]) == (True, None)
+
+        kwargs = mock_run.call_args.kwargs
+        assert kwargs["stdin"] is subprocess.DEVNULL
+        assert kwargs["stdout"] is subprocess.DEVNULL
+        assert kwargs["stderr"] is subprocess.DEVNULL
+        assert "capture_output" not in kwargs
+        assert kwargs["timeout"] <= 2
+
     def test_check_command_file_not_found(self):
         """Test check_command with FileNotFoundError"""
         checker = SystemChecker()
@@ -172,6 +192,226 @@ class TestSystemCheckEdgeCases:
 
         with patch.object(checker, "find_command", return_value="/usr/bin/openssl"):
             with patch.object(checker, "check_command", return_value=(False, "Test failed")):
-                result = checker.check_tool("openssl")
+                result = checker.check_tool("openssl", deep=True)
                 assert result["available"] is False
                 assert "Test failed" in result["error"]
+
+    def test_check_tool_default_skips_test_command(self):
+        """Test check_tool trusts the PATH lookup unless deep is requested"""
+        checker = SystemChecker()
+
+        with patch.object(checker, "find_command", return_value="/usr/bin/openssl"):
+            with patch.object(checker, "check_command") as mock_check:
+                result = checker.check_tool("openssl")
+                assert result["available"] is True
+                assert result["path"] == "/usr/bin/openssl"
+                mock_check.assert_not_called()
+
+
+class TestSystemCheckCache:
+    """Test the cached system check result"""
+
+    def test_save_and_load(self):
+        """Test that a saved result is found for the same openssl"""
+        from certica.system_check import is_system_check_cached, save_system_check
+
+        with patch("certica.system_check.shutil.which", return_value=sys.executable):
+            assert is_system_check_cached() is False
+            save_system_check()
+            assert is_system_check_cached() is True
+
+        # A different binary does not match
+        with patch("certica.system_check.shutil.which", return_value=shutil.__file__):
+            assert is_system_check_cached() is False
+
+    def test_no_openssl_never_cached(self):
+        """Test that nothing is cached without openssl"""
+        from certica.system_check import is_system_check_cached, save_system_check
+
+        with patch("certica.system_check.shutil.which", return_value=None):
+            save_system_check()
+            assert is_system_check_cached() is False
+
+    def test_cli_skips_check_on_cache_hit(self, temp_dir):
+        """Test that the CLI only runs the full check once"""
+        from click.testing import CliRunner
+
+        from certica.cli import cli
+
+        runner = CliRunner()
+        with patch("certica.system_check.shutil.which", return_value=sys.executable):
+            with patch("certica.cli.check_system_requirements", return_value=True) as mock_check:
+                runner.invoke(cli, ["--base-dir", str(temp_dir), "list-cas"])
+                runner.invoke(cli, ["--base-dir", str(temp_dir), "list-cas"])
+
+        assert mock_check.call_count == 1
+
+
+class TestSystemCheckConcurrency:
+    """Tests for concurrent tool checks"""
+
+    def test_check_all_runs_checks_concurrently(self):
+        """Test that check_all overlaps the individual tool checks"""
+        import threading
+
+        checker = SystemChecker()
+        checker.required_tools = {
+            name: {"commands": [name], "test_command": [name], "required": False, "description": ""}
+            for name in ("a", "b", "c")
+        }
+        barrier = threading.Barrier(3, timeout=5)
+
+        def check_tool(tool_name):
+            # Only passes if all three checks are running at the same time
+            barrier.wait()
+            return {"available": True, "path": tool_name}
+
+        with patch.object(checker, "check_tool", side_effect=lambda name, deep: check_tool(name)):
+            results = checker.check_all(deep=True)
+
+        assert list(results) == ["a", "b", "c"]
+        assert results["b"]["path"] == "b"
+
+
+class TestFindCommandCache:
+    """Tests for memoized command lookups"""
+
+    def test_find_command_cached_across_instances(self):
+        """Test that PATH is only searched once per command"""
+        SystemChecker.invalidate_path_cache()
+        try:
+            with patch("shutil.which", return_value="/usr/bin/tool") as mock_which:
+                assert SystemChecker().find_command("tool") == "/usr/bin/tool"
+                assert SystemChecker().find_command("tool") == "/usr/bin/tool"
+            assert mock_which.call_count == 1
+        finally:
+            SystemChecker.invalidate_path_cache()
+
+    def test_invalidate_path_cache(self):
+        """Test that invalidating the cache searches PATH again"""
+        SystemChecker.invalidate_path_cache()
+        try:
+            with patch("shutil.which", side_effect=[None, "/usr/bin/tool"]):
+                checker = SystemChecker()
+                assert checker.find_command("tool") is None
+                SystemChecker.invalidate_path_cache()
+                assert checker.find_command("tool") == "/usr/bin/tool"
+        finally:
+            SystemChecker.invalidate_path_cache()
+
+
+class TestToolProbes:
+    """Tests for per-tool probe modes"""
+
+    def test_stat_probe_never_runs_test_command(self):
+        """Test optional tools are checked without spawning them, even when deep"""
+        checker = SystemChecker()
+        checker.required_tools = {
+            "sudo": {
+                "commands": ["sudo"],
+                "test_command": ["sudo", "--version"],
+                "probe": "stat",
+                "required": False,
+                "description": "sudo",
+            }
+        }
+
+        with patch.object(checker, "find_command", return_value=sys.executable):
+            with patch.object(checker, "check_command") as mock_check:
+                result = checker.check_tool("sudo", deep=True)
+
+        assert result["available"] is True
+        mock_check.assert_not_called()
+
+    def test_stat_probe_not_executable(self, tmp_path):
+        """Test a file on PATH without execute permission is reported unavailable"""
+        tool = tmp_path / "tool"
+        tool.write_text("")
+        tool.chmod(0o644)
+        checker = SystemChecker()
+
+        with patch.object(checker, "find_command", return_value=str(tool)):
+            with patch("os.access", return_value=False):
+                result = checker.check_tool("openssl")
+
+        assert result["available"] is False
+        assert "not executable" in result["error"]
+
+    def test_openssl_is_exec_probed(self):
+        """Test openssl keeps its version probe for deep checks"""
+        assert SystemChecker().required_tools["openssl"]["probe"] == "exec"
+
+    def test_tools_table_shared_and_read_only(self):
+        """Test the platform tools table is built once and cannot be mutated"""
+        first = SystemChecker()
+        second = SystemChecker()
+        assert first.required_tools is second.required_tools
+        with pytest.raises(TypeError):
+            first.required_tools["extra"] = {}
+
+    def test_check_all_deep_without_thread_pool_for_single_exec_tool(self):
+        """Test no thread pool is started when only one tool spawns a command"""
+        checker = SystemChecker()
+
+        with patch("certica.system_check.ThreadPoolExecutor") as mock_pool:
+            with patch.object(checker, "check_command", return_value=(True, None)):
+                results = checker.check_all(deep=True)
+
+        mock_pool.assert_not_called()
+        assert list(results) == list(checker.required_tools)
+
+    def test_print_check_results_single_write(self):
+        """Test the report is emitted with one write"""
+        import io
+
+        checker = SystemChecker()
+        results = {
+            "openssl": {
+                "available": True,
+                "path": "/usr/bin/openssl",
+                "required": True,
+                "description": "OpenSSL",
+            },
+            "sudo": {
+                "available": False,
+                "path": None,
+                "error": "Command not found: sudo",
+                "required": False,
+                "description": "sudo",
+            },
+        }
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with patch.object(stdout, "write", wraps=stdout.write) as mock_write:
+                assert checker.print_check_results(results) is True
+        assert mock_write.call_count == 1
+        assert "/usr/bin/openssl" in stdout.getvalue()
+        assert "Command not found: sudo" in stdout.getvalue()
+
+    def test_print_check_results_uses_result_required_flag(self, capsys):
+        """Test tools are split into required and optional by each result's own flag"""
+        checker = SystemChecker()
+        results = {
+            name: {
+                "available": True,
+                "path": f"/usr/bin/{name}",
+                "required": name != "openssl",
+                "description": name,
+            }
+            for name in checker.required_tools
+        }
+
+        assert checker.print_check_results(results) is True
+        output = capsys.readouterr().out
+        # openssl is marked optional by the result, so it is listed after the header
+        assert output.index(t("check.optional_tools")) < output.index("/usr/bin/openssl")
+
+    def test_deep_probe_runs_resolved_path(self):
+        """Test the test command is run via the absolute path found on PATH"""
+        checker = SystemChecker()
+
+        with patch.object(checker, "find_command", return_value="/opt/ssl/bin/openssl"):
+            with patch.object(checker, "check_command", return_value=(True, None)) as mock_check:
+                checker.check_tool("openssl", deep=True)
+
+        mock_check.assert_called_once_with(["/opt/ssl/bin/openssl", "version"])
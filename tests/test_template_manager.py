@@ -3,6 +3,7 @@ Tests for Template Manager
 """
 
 import json
+import os
 from pathlib import Path
 from certica.template_manager import TemplateManager
 
@@ -99,3 +100,96 @@ def test_delete_template(temp_dir):
     assert not Path(path).exists()
     templates = manager.list_templates()
     assert template_name not in templates
+
+
+def test_load_template_cache(temp_dir):
+    """Test that templates are parsed once until the file changes"""
+    from unittest.mock import patch
+
+    manager = TemplateManager(base_dir=str(temp_dir))
+    path = manager.create_template("cached", organization="First")
+
+    first = manager.load_template("cached")
+    first["organization"] = "mutated"
+    with patch("certica.template_manager.json.load") as mock_load:
+        assert manager.load_template("cached")["organization"] == "First"
+    mock_load.assert_not_called()
+
+    manager.create_template("cached", organization="Second Org")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert manager.load_template("cached")["organization"] == "Second Org"
+
+
+def test_create_template_invalidates_cache(temp_dir):
+    """Test that rewriting a template is seen even if mtime and size are unchanged"""
+    manager = TemplateManager(base_dir=str(temp_dir))
+    path = manager.create_template("same", organization="AAAA")
+    st = os.stat(path)
+    assert manager.load_template("same")["organization"] == "AAAA"
+
+    manager.create_template("same", organization="BBBB")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert manager.load_template("same")["organization"] == "BBBB"
+
+
+def test_list_templates_ignores_other_entries(temp_dir):
+    """Test that only regular .json files are listed as templates"""
+    manager = TemplateManager(base_dir=str(temp_dir))
+    manager.create_template("real")
+    (manager.templates_dir / "notes.txt").write_text("not a template")
+    (manager.templates_dir / "dir.json").mkdir()
+    (manager.templates_dir / ".hidden.json").write_text("{}")
+
+    assert manager.list_templates() == ["real"]
+
+
+def test_list_templates_cache(temp_dir):
+    """Test that list_templates reuses its scan until the templates directory changes"""
+    from unittest.mock import patch
+
+    manager = TemplateManager(base_dir=str(temp_dir))
+    manager.create_template("first")
+    assert manager.list_templates() == ["first"]
+
+    with patch("certica.template_manager.os.scandir") as mock_scandir:
+        listed = manager.list_templates()
+    mock_scandir.assert_not_called()
+    listed.append("mutated")
+    assert manager.list_templates() == ["first"]
+
+    manager.delete_template("first")
+    assert manager.list_templates() == []
+
+
+def test_create_and_delete_refresh_list_cache(temp_dir):
+    """Test that this manager's own changes show up in the next listing"""
+    manager = TemplateManager(base_dir=str(temp_dir))
+    manager.create_template("first")
+    assert manager.list_templates() == ["first"]
+
+    manager.create_template("second")
+    assert sorted(manager.list_templates()) == ["first", "second"]
+    manager.delete_template("first")
+    assert manager.list_templates() == ["second"]
+
+
+def test_templates_dir_created_once_per_process(temp_dir):
+    """Test that the templates directory is only mkdir'ed by the first manager"""
+    from unittest.mock import patch
+
+    TemplateManager(base_dir=str(temp_dir))
+    with patch.object(Path, "mkdir") as mock_mkdir:
+        TemplateManager(base_dir=str(temp_dir))
+    mock_mkdir.assert_not_called()
+
+
+def test_create_template_recreates_removed_dir(temp_dir):
+    """Test that create_template recreates a templates directory removed at runtime"""
+    import shutil
+
+    manager = TemplateManager(base_dir=str(temp_dir))
+    shutil.rmtree(manager.templates_dir)
+
+    manager.create_template("restored", organization="Back")
+    assert manager.load_template("restored")["organization"] == "Back"